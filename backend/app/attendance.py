@@ -0,0 +1,83 @@
+# app/attendance.py
+# Davomat bitmaplari: slot × kun (har slotga 32 bit)
+#
+# Bitmap butun son sifatida ishlanadi: slot i, kun d -> bit 32 * i + (d - 1).
+# Hisobotlar butun bitmapning bit_count() i bilan hisoblanadi — har bir
+# belgi uchun alohida qator yoki sikl yo'q.
+
+from app import models
+
+SLOT_BITS = 32
+
+
+def to_int(data: bytes) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def to_bytes(value: int, slot_count: int) -> bytes:
+    return value.to_bytes(slot_count * SLOT_BITS // 8, "little")
+
+
+def day_mask(slot_count: int, day: int) -> int:
+    """Barcha slotlarda shu kun biti"""
+    unit = 1 << (day - 1)
+    mask = 0
+    for i in range(slot_count):
+        mask |= unit << (SLOT_BITS * i)
+    return mask
+
+
+def slot_bits(value: int, slot: int) -> int:
+    return (value >> (SLOT_BITS * slot)) & ((1 << SLOT_BITS) - 1)
+
+
+def days_of(mask: int) -> list:
+    return [d + 1 for d in range(SLOT_BITS) if mask >> d & 1]
+
+
+def mark_lesson(row: models.AttendanceMonth, day: int, roster: list, present: set) -> None:
+    """
+    Bitta dars uchun butun guruhni belgilaydi: roster — shu kundagi guruh
+    tarkibi, present — qatnashganlar. Rosterda bo'lmagan slotlar uchun shu kun tozalanadi.
+    """
+    slots = list(row.slots or [])
+    for student_id in roster:
+        if student_id not in slots:
+            slots.append(student_id)
+
+    expected = to_int(row.expected)
+    attended = to_int(row.present)
+
+    clear = ~day_mask(len(slots), day)
+    expected &= clear
+    attended &= clear
+
+    unit = 1 << (day - 1)
+    roster_set = set(roster)
+    for i, student_id in enumerate(slots):
+        if student_id in roster_set:
+            expected |= unit << (SLOT_BITS * i)
+            if student_id in present:
+                attended |= unit << (SLOT_BITS * i)
+
+    row.slots = slots
+    row.lessons = (row.lessons or 0) | unit
+    row.expected = to_bytes(expected, len(slots))
+    row.present = to_bytes(attended, len(slots))
+
+
+def clear_lesson(row: models.AttendanceMonth, day: int) -> None:
+    slots = row.slots or []
+    clear = ~day_mask(len(slots), day)
+    row.lessons = (row.lessons or 0) & ~(1 << (day - 1))
+    row.expected = to_bytes(to_int(row.expected) & clear, len(slots))
+    row.present = to_bytes(to_int(row.present) & clear, len(slots))
+
+
+def totals(row: models.AttendanceMonth) -> tuple:
+    """(qatnashgan belgilar soni, kutilgan belgilar soni)"""
+    return to_int(row.present).bit_count(), to_int(row.expected).bit_count()
+
+
+def rate(attended: int, expected: int):
+    return round(attended / expected, 4) if expected else None
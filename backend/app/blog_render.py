@@ -0,0 +1,132 @@
+# app/blog_render.py
+# Blog matnini yozish vaqtida HTML ga aylantirish (ko'rishda qayta ishlanmaydi)
+#
+# content HTML bo'lsa — ruxsat etilgan teg/atributlar ro'yxati bo'yicha
+# tozalanadi (qolganlari tashlanadi, matni escape qilinadi); oddiy matn
+# bo'lsa — escape qilinib <p>/<br> ga bo'linadi. Alohida qatordagi YouTube
+# havolalari iframe'ga almashtiriladi (iframe faqat shu yerda paydo bo'ladi).
+
+import html
+import re
+import unicodedata
+from html.parser import HTMLParser
+from typing import Optional
+
+_YOUTUBE_ID = re.compile(r"(?:youtu\.be/|v/|embed/|watch\?v=|&v=)([\w-]{11})")
+_YOUTUBE_LINE = re.compile(
+    r"^\s*(?:<p>\s*)?(https?://(?:www\.)?(?:youtube\.com|youtu\.be)/\S+?)(?:\s*</p>)?\s*$",
+    re.MULTILINE,
+)
+_HTML_TAG = re.compile(r"<(p|div|br|h[1-6]|ul|ol|li|img|a|strong|em|blockquote|iframe)\b", re.IGNORECASE)
+
+EMBED = (
+    '<div class="video-embed"><iframe src="https://www.youtube.com/embed/{id}" '
+    'title="YouTube video" frameborder="0" allowfullscreen></iframe></div>'
+)
+
+
+def youtube_id(url: Optional[str]) -> Optional[str]:
+    match = _YOUTUBE_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+def _embed(match: re.Match) -> str:
+    video = youtube_id(match.group(1))
+    return EMBED.format(id=video) if video else match.group(0)
+
+
+# =====================================
+# HTML tozalash (allowlist)
+# =====================================
+ALLOWED_TAGS = {
+    "p", "div", "span", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
+    "ul", "ol", "li", "strong", "b", "em", "i", "u", "s", "blockquote",
+    "code", "pre", "a", "img", "table", "thead", "tbody", "tr", "th", "td",
+}
+VOID_TAGS = {"br", "hr", "img"}
+ALLOWED_ATTRS = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "th": {"colspan", "rowspan"},
+    "td": {"colspan", "rowspan"},
+}
+URL_ATTRS = {"href", "src"}
+_SAFE_URL = re.compile(r"^(?:https?:|mailto:|/|#)", re.IGNORECASE)
+# Ichidagi matni ham chiqarilmaydigan teglar
+DROP_CONTENT = {"script", "style", "iframe", "object", "embed", "template", "noscript"}
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.open = []      # yopilmagan ruxsat etilgan teglar
+        self.dropping = 0   # DROP_CONTENT ichidamiz
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        for name, value in attrs:
+            if name not in ALLOWED_ATTRS.get(tag, ()) or value is None:
+                continue
+            if name in URL_ATTRS and not _SAFE_URL.match(value.strip()):
+                continue
+            kept.append(f' {name}="{html.escape(value, quote=True)}"')
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open and self.open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f"</{current}>")
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+    def result(self) -> str:
+        self.close()
+        return "".join(self.out) + "".join(f"</{tag}>" for tag in reversed(self.open))
+
+
+def sanitize(content: str) -> str:
+    """Ruxsat etilmagan teg, atribut (on*, style) va javascript: havolalarni olib tashlaydi."""
+    parser = _Sanitizer()
+    parser.feed(content or "")
+    return parser.result()
+
+
+def render(content: str) -> str:
+    if _HTML_TAG.search(content or ""):
+        body = sanitize(content)
+    else:
+        paragraphs = re.split(r"\n\s*\n", (content or "").strip())
+        body = "\n".join(
+            "<p>%s</p>" % html.escape(p.strip()).replace("\n", "<br>")
+            for p in paragraphs if p.strip()
+        )
+    return _YOUTUBE_LINE.sub(_embed, body)
+
+
+def slugify(title: str) -> str:
+    """"Python: boshlang'ich kurs" -> "python-boshlangich-kurs" """
+    ascii_title = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode()
+    ascii_title = re.sub(r"['`ʻʼ‘’]", "", ascii_title)
+    return re.sub(r"[^a-z0-9]+", "-", ascii_title.lower()).strip("-") or "post"
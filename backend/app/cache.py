@@ -0,0 +1,103 @@
+# app/cache.py
+# Worker xotirasidagi oddiy TTL kesh + ORM commitlari orqali invalidatsiya
+#
+# Invalidatsiya faqat shu worker ichida ishlaydi; boshqa workerlardagi
+# eskirgan yozuvlar TTL tugagach yangilanadi.
+#
+# Poyga: so'rov bazadan o'qib bo'lguncha boshqa so'rov commit qilib keshni
+# o'chirsa, birinchisi eski natijani qayta yozib qo'ymasligi kerak. Shuning
+# uchun o'qishdan OLDIN token() olinadi va set(..., token=) faqat kalit
+# (yoki butun kesh) shu orada invalidatsiya qilinmagan bo'lsa yozadi.
+
+import threading
+import time
+
+from sqlalchemy import event, inspect
+
+from app.database import SessionLocal
+from app import models
+
+
+class TTLCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = {}
+        self._generation = 0      # clear() da oshadi
+        self._key_generation = {}  # invalidate() da oshadi
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def token(self, key):
+        """Bazadan o'qishdan oldin olinadi va set() ga beriladi."""
+        with self._lock:
+            return self._generation, self._key_generation.get(key, 0)
+
+    def set(self, key, value, token=None) -> None:
+        with self._lock:
+            if token is not None and token != (self._generation, self._key_generation.get(key, 0)):
+                return  # o'qish davomida invalidatsiya bo'lgan — eski natija
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._key_generation[key] = self._key_generation.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._key_generation.clear()
+            self._generation += 1
+
+
+# /students/{id}/overview — kalit: student_id
+student_overview = TTLCache(ttl=300)
+
+
+# =====================================
+# Invalidatsiya (ORM yozuvlari)
+# =====================================
+# Shu modellar o'zgarsa — faqat tegishli o'quvchi(lar)ning keshi o'chadi
+_STUDENT_SCOPED = (models.Payment, models.GroupStudent, models.Enrollment)
+# Nomlar/narxlar ko'p o'quvchiga ta'sir qiladi — butun kesh tozalanadi
+_GLOBAL = (models.Group, models.Course, models.Teacher)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    student_ids = session.info.setdefault("cache_student_ids", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.Student):
+            student_ids.add(obj.id)
+        elif isinstance(obj, _STUDENT_SCOPED):
+            student_ids.add(obj.student_id)
+            # student_id o'zgargan bo'lsa — eski o'quvchining keshi ham
+            student_ids.update(inspect(obj).attrs.student_id.history.deleted)
+        elif isinstance(obj, _GLOBAL):
+            session.info["cache_clear_all"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_changes(session):
+    student_ids = session.info.pop("cache_student_ids", set())
+    if session.info.pop("cache_clear_all", False):
+        student_overview.clear()
+    else:
+        student_overview.invalidate(student_ids)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("cache_student_ids", None)
+    session.info.pop("cache_clear_all", None)
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
@@ -28,6 +28,14 @@ engine = create_engine(
     future=True            # SQLAlchemy 2.0 style
 )
 
+# SQLite FK'larni (ON DELETE CASCADE) faqat shu pragma bilan bajaradi
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # =====================================
 # Session Configuration
 # =====================================
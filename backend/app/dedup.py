@@ -0,0 +1,356 @@
+# app/dedup.py
+# Takroriy arizalar va o'quvchilarni aniqlash (telefon + ism trigrammalari)
+#
+# Indeks har bir worker xotirasida saqlanadi va startupda (yoki birinchi
+# murojaatda) bazadan to'liq quriladi. ORM orqali yozilgan Student/Application
+# o'zgarishlari commitdan keyin indeksga qo'shiladi; boshqa workerlar va Core
+# so'rovlar yozganlari har REFRESH_INTERVAL da inkremental yangilanadi —
+# faqat updated_at >= oxirgi watermark qatorlar va tombstone'lar o'qiladi.
+#
+# Mavjud takrorlarni klasterlash:  python -m app.dedup
+
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models
+from app.query_utils import sync_watermark
+
+logger = logging.getLogger(__name__)
+
+NAME_THRESHOLD = 0.8      # ism o'xshashligi (trigram Jaccard)
+PHONE_MAX_DIFF = 1        # ism o'xshash bo'lsa, telefonlarda ruxsat etilgan farq (raqam)
+REFRESH_INTERVAL = 30     # sekund; boshqa workerlar yozganini inkremental olish
+
+_APOSTROPHES = re.compile(r"[\'`ʻʼ‘’]")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+# =====================================
+# Normalizatsiya
+# =====================================
+def normalize_phone(phone: Optional[str]) -> str:
+    """'+998 (90) 123-45-67' va '901234567' -> '901234567'"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-9:] if len(digits) >= 9 else digits
+
+
+def normalize_name(full_name: Optional[str]) -> str:
+    """Kichik harf, apostrof/diakritikasiz, so'zlar tartiblangan: 'Valiyev Ali' == 'ali valiyev'"""
+    text = unicodedata.normalize("NFKD", full_name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = _NON_WORD.sub(" ", _APOSTROPHES.sub("", text.lower()))
+    return " ".join(sorted(text.split()))
+
+
+def trigrams(name_key: str) -> set:
+    padded = f"  {name_key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _phone_diff(a: str, b: str) -> int:
+    if len(a) != len(b):
+        return max(len(a), len(b))
+    return sum(1 for x, y in zip(a, b) if x != y)
+
+
+# =====================================
+# Indeks
+# =====================================
+class DuplicateIndex:
+    """
+    Kalit: ("application" | "student", id).
+    Telefon bo'yicha aniq moslik — dict, ism bo'yicha — trigram posting list'lar.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._entries = {}
+        self._by_phone = defaultdict(set)
+        self._by_gram = defaultdict(set)
+        self.synced_until = None    # shu vaqtgacha o'zgargan qatorlar indeksda (None — qurilmagan)
+        self.refreshed_at = None    # time.monotonic(); None — keyingi murojaatda yangilash
+
+    def add(self, kind: str, row_id: int, full_name: str, phone: str) -> None:
+        key = (kind, row_id)
+        with self._lock:
+            self.remove(kind, row_id)
+            phone_key = normalize_phone(phone)
+            grams = trigrams(normalize_name(full_name))
+            self._entries[key] = (phone_key, grams)
+            if phone_key:
+                self._by_phone[phone_key].add(key)
+            for gram in grams:
+                self._by_gram[gram].add(key)
+
+    def remove(self, kind: str, row_id: int) -> None:
+        key = (kind, row_id)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if not entry:
+                return
+            phone_key, grams = entry
+            if phone_key:
+                self._by_phone[phone_key].discard(key)
+                if not self._by_phone[phone_key]:
+                    del self._by_phone[phone_key]
+            for gram in grams:
+                self._by_gram[gram].discard(key)
+                if not self._by_gram[gram]:
+                    del self._by_gram[gram]
+
+    def find(self, full_name: str, phone: str, exclude: Optional[tuple] = None) -> list:
+        """Ehtimoliy takrorlar: [(kind, id, score)], score bo'yicha kamayish tartibida."""
+        phone_key = normalize_phone(phone)
+        grams = trigrams(normalize_name(full_name))
+
+        with self._lock:
+            matches = {key: 1.0 for key in self._by_phone.get(phone_key, ())} if phone_key else {}
+
+            # Ism bo'yicha moslik telefonlar ham yaqin bo'lganda sanaladi —
+            # telefonsiz ariza faqat telefon bo'yicha emas, umuman solishtirilmaydi
+            if phone_key and grams:
+                for key in self._name_candidates(grams):
+                    if key in matches:
+                        continue
+                    other_phone, other_grams = self._entries[key]
+                    if not other_phone or _phone_diff(phone_key, other_phone) > PHONE_MAX_DIFF:
+                        continue
+                    common = len(grams & other_grams)
+                    score = common / (len(grams) + len(other_grams) - common)
+                    if score >= NAME_THRESHOLD:
+                        matches[key] = round(score, 3)
+
+        matches.pop(exclude, None)
+        return sorted(
+            ((kind, row_id, score) for (kind, row_id), score in matches.items()),
+            key=lambda m: (-m[2], m[0], m[1])
+        )
+
+    def _name_candidates(self, grams: set) -> set:
+        """
+        Prefix filtr: Jaccard >= NAME_THRESHOLD uchun nomzod so'rovning kamida
+        ceil(NAME_THRESHOLD * n) trigrammasiga ega bo'lishi kerak, demak eng
+        kam uchraydigan n - t + 1 trigrammadan biriga albatta ega. Faqat
+        shularning posting list'lari o'qiladi — keng tarqalgan trigrammalar
+        (familiya qo'shimchalari, bo'shliqlar) skanerlanmaydi.
+        """
+        required = math.ceil(NAME_THRESHOLD * len(grams))
+        rarest = sorted(grams, key=lambda gram: len(self._by_gram.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:len(grams) - required + 1]:
+            candidates.update(self._by_gram.get(gram, ()))
+        return candidates
+
+    def invalidate(self) -> None:
+        """Keyingi murojaatda inkremental yangilash (masalan, Core bulk so'rovdan keyin)."""
+        self.refreshed_at = None
+
+    def rebuild(self, db: Session) -> None:
+        """To'liq qurish: startupda yoki indeks hali bo'lmaganda."""
+        synced_until = sync_watermark()
+        apps = db.query(
+            models.Application.id, models.Application.full_name, models.Application.phone
+        ).all()
+        students = db.query(
+            models.Student.id, models.Student.full_name, models.Student.phone
+        ).all()
+
+        with self._lock:
+            self._entries.clear()
+            self._by_phone.clear()
+            self._by_gram.clear()
+            for row in apps:
+                self.add("application", row.id, row.full_name, row.phone)
+            for row in students:
+                self.add("student", row.id, row.full_name, row.phone)
+            self.synced_until = synced_until
+            self.refreshed_at = time.monotonic()
+
+    def refresh(self, db: Session) -> None:
+        """synced_until dan keyin o'zgargan / o'chirilgan qatorlarni qo'llaydi (updated_at indeksi)."""
+        since = self.synced_until
+        synced_until = sync_watermark()
+
+        apps = db.query(
+            models.Application.id, models.Application.full_name, models.Application.phone
+        ).filter(models.Application.updated_at >= since).all()
+        students = db.query(
+            models.Student.id, models.Student.full_name, models.Student.phone, models.Student.deleted_at
+        ).filter(models.Student.updated_at >= since).execution_options(include_deleted=True).all()
+        removed = db.execute(
+            select(models.Tombstone.entity, models.Tombstone.row_id).where(
+                models.Tombstone.entity.in_(("applications", "students")),
+                models.Tombstone.deleted_at >= since,
+            )
+        ).all()
+
+        with self._lock:
+            for row in apps:
+                self.add("application", row.id, row.full_name, row.phone)
+            for row in students:
+                if row.deleted_at is None:
+                    self.add("student", row.id, row.full_name, row.phone)
+                else:
+                    self.remove("student", row.id)
+            for entity, row_id in removed:
+                self.remove("application" if entity == "applications" else "student", row_id)
+            self.synced_until = synced_until
+            self.refreshed_at = time.monotonic()
+
+
+index = DuplicateIndex()
+
+
+def get_index(db: Session) -> DuplicateIndex:
+    if index.synced_until is None:
+        with index._refresh_lock:
+            if index.synced_until is None:
+                index.rebuild(db)
+    elif index.refreshed_at is None or time.monotonic() - index.refreshed_at > REFRESH_INTERVAL:
+        # Boshqa thread yangilayotgan bo'lsa — kutmasdan mavjud indeks bilan davom etamiz
+        if index._refresh_lock.acquire(blocking=False):
+            try:
+                index.refresh(db)
+            finally:
+                index._refresh_lock.release()
+    return index
+
+
+def warm_up() -> None:
+    """Startupda fon threadida to'liq qurish — birinchi ariza so'rovi kutmasin."""
+    def build():
+        db = SessionLocal()
+        try:
+            get_index(db)
+        except Exception:
+            logger.exception("duplicate index warm-up failed")
+        finally:
+            db.close()
+
+    threading.Thread(target=build, name="dedup-warm-up", daemon=True).start()
+
+
+def flag_application(db: Session, db_app: models.Application) -> None:
+    """Yangi arizani eng o'xshash ariza/o'quvchi bilan belgilaydi (commit qilmaydi)."""
+    exclude = ("application", db_app.id) if db_app.id else None
+    matches = get_index(db).find(db_app.full_name, db_app.phone, exclude=exclude)
+
+    db_app.duplicate_of_application_id = next(
+        (row_id for kind, row_id, _ in matches if kind == "application"), None
+    )
+    db_app.duplicate_of_student_id = next(
+        (row_id for kind, row_id, _ in matches if kind == "student"), None
+    )
+
+
+# =====================================
+# Klasterlash (batch)
+# =====================================
+def cluster_duplicates(db: Session) -> list:
+    """Union-find: har bir yozuvni o'xshashlari bilan birlashtiradi. Faqat >= 2 a'zoli klasterlar."""
+    idx = get_index(db)
+    parent = {}
+
+    def root(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    names = {}
+    for row in db.query(models.Application.id, models.Application.full_name, models.Application.phone):
+        names[("application", row.id)] = (row.full_name, row.phone)
+    for row in db.query(models.Student.id, models.Student.full_name, models.Student.phone):
+        names[("student", row.id)] = (row.full_name, row.phone)
+
+    for key, (full_name, phone) in names.items():
+        for kind, row_id, _ in idx.find(full_name, phone, exclude=key):
+            if (kind, row_id) in names:
+                parent[root(key)] = root((kind, row_id))
+
+    clusters = defaultdict(list)
+    for key in parent:
+        kind, row_id = key
+        full_name, phone = names[key]
+        clusters[root(key)].append({
+            "kind": kind, "id": row_id, "full_name": full_name, "phone": phone
+        })
+
+    return [
+        sorted(members, key=lambda m: (m["kind"], m["id"]))
+        for members in clusters.values() if len(members) > 1
+    ]
+
+
+def backfill_flags(db: Session) -> int:
+    """Mavjud arizalarni qayta belgilaydi. O'zgargan arizalar sonini qaytaradi."""
+    get_index(db)
+    changed = 0
+    for db_app in db.query(models.Application).yield_per(500):
+        before = (db_app.duplicate_of_application_id, db_app.duplicate_of_student_id)
+        flag_application(db, db_app)
+        if before != (db_app.duplicate_of_application_id, db_app.duplicate_of_student_id):
+            changed += 1
+    db.commit()
+    return changed
+
+
+# =====================================
+# Indeksni ORM yozuvlari bilan sinxron saqlash
+# =====================================
+_KINDS = {models.Application: "application", models.Student: "student"}
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault("dedup_pending", [])
+    for obj in list(session.new) + list(session.dirty):
+        kind = _KINDS.get(type(obj))
+        if kind and getattr(obj, "deleted_at", None) is not None:
+            pending.append(("remove", kind, obj.id, None, None))   # soft delete
+        elif kind:
+            pending.append(("add", kind, obj.id, obj.full_name, obj.phone))
+    for obj in session.deleted:
+        kind = _KINDS.get(type(obj))
+        if kind:
+            pending.append(("remove", kind, obj.id, None, None))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_changes(session):
+    pending = session.info.pop("dedup_pending", [])
+    if index.synced_until is None:
+        return
+    for action, kind, row_id, full_name, phone in pending:
+        if action == "add":
+            index.add(kind, row_id, full_name, phone)
+        else:
+            index.remove(kind, row_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("dedup_pending", None)
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        clusters = cluster_duplicates(db)
+        for members in clusters:
+            print(" | ".join(f"{m['kind']}#{m['id']} {m['full_name']} {m['phone']}" for m in members))
+        print(f"{len(clusters)} ta klaster, {backfill_flags(db)} ta ariza qayta belgilandi")
+    finally:
+        db.close()
@@ -0,0 +1,248 @@
+# app/events.py
+# O'zgarishlar oqimi (change feed): insert / update / delete eventlari
+#
+# Eventlar ORM flush paytida yig'iladi va faqat commitdan keyin tarqatiladi
+# (rollback bo'lsa — tashlab yuboriladi). Core bulk so'rovlar ORM
+# eventlaridan o'tmaydi — routelar emit() ni o'zlari chaqiradi.
+#
+# Bir nechta worker bo'lsa EVENTS_NOTIFY=1 (faqat Postgres): eventlar
+# pg_notify orqali yuboriladi va har bir worker LISTEN qilib o'z
+# mijozlariga tarqatadi. seq raqamlari har bir worker uchun alohida.
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event, inspect, text, select as sa_select
+
+from app.database import SessionLocal, engine
+from app import models
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "webcrm_changes"
+BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "1000"))
+USE_NOTIFY = os.getenv("EVENTS_NOTIFY", "0") == "1" and engine.dialect.name == "postgresql"
+NOTIFY_MAX_BYTES = 7900     # pg_notify payload chegarasi ~8000 bayt
+
+# Oqimga chiqadigan modellar (topic = jadval nomi)
+TRACKED = (models.Application, models.VacancyApplication, models.Payment, models.GroupStudent)
+TOPICS = {model.__tablename__ for model in TRACKED}
+
+# Ota qator soft delete qilinsa bolalari alohida belgilanmaydi (ular
+# models.LIVE_PARENTS orqali yashiriladi) — har bir bola topic'iga bitta
+# "delete" eventi: id=None, data={FK ustuni: [ota id'lar]}; mijoz shu
+# qiymatli qatorlarni o'chiradi.
+PARENT_SCOPES = {
+    models.Student: (("payments", "student_id"), ("group_students", "student_id")),
+    models.Course: (("payments", "course_id"),),
+    models.Group: (("group_students", "group_id"),),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return str(value)
+
+
+def _row(obj) -> dict:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+# =====================================
+# Broadcaster (worker ichida)
+# =====================================
+class Broadcaster:
+    """
+    Obunachilar — asyncio navbatlari; publish() istalgan threaddan chaqiriladi.
+    Oxirgi BUFFER_SIZE event Last-Event-ID bilan qayta ulanish uchun saqlanadi.
+    """
+
+    def __init__(self, buffer_size: int):
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = set()
+
+    def publish(self, payload: dict) -> None:
+        with self._lock:
+            item = dict(payload, seq=next(self._seq))
+            self._buffer.append(item)
+            subscribers = list(self._subscribers)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # event loop yopilgan — obunachi ketgan
+                self.unsubscribe((loop, queue))
+
+    def subscribe(self, after_seq: int = 0):
+        """(token, o'tkazib yuborilgan eventlar) — after_seq dan keyingilar bufferdan."""
+        token = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.add(token)
+            missed = [item for item in self._buffer if item["seq"] > after_seq] if after_seq else []
+        return token, missed
+
+    def unsubscribe(self, token) -> None:
+        with self._lock:
+            self._subscribers.discard(token)
+
+
+broadcaster = Broadcaster(BUFFER_SIZE)
+
+
+def _deliver(payloads: list) -> None:
+    if not payloads:
+        return
+    if not USE_NOTIFY:
+        for payload in payloads:
+            broadcaster.publish(payload)
+        return
+
+    with engine.begin() as conn:
+        for payload in payloads:
+            message = json.dumps(payload, default=_json_default)
+            if len(message.encode()) > NOTIFY_MAX_BYTES:
+                message = json.dumps(dict(payload, data=None), default=_json_default)
+            conn.execute(text("SELECT pg_notify(:channel, :message)"),
+                         {"channel": CHANNEL, "message": message})
+
+
+def _payload(topic: str, op: str, row_id, data: dict, changed=None) -> dict:
+    payload = {
+        "topic": topic,
+        "op": op,
+        "id": row_id,
+        "data": json.loads(json.dumps(data, default=_json_default)) if data is not None else None,
+        "ts": time.time(),
+    }
+    if changed is not None:
+        payload["changed"] = changed
+    return payload
+
+
+def emit(session, topic: str, op: str, rows: list) -> None:
+    """
+    Core bulk so'rovlar uchun: eventlar session commitidan keyin tarqatiladi.
+    rows — dict'lar ro'yxati ("id" bo'lsa, event id si sifatida olinadi).
+    """
+    pending = session.info.setdefault("feed_events", [])
+    for data in rows:
+        pending.append(_payload(topic, op, data.get("id"), data))
+
+
+def emit_parent_deleted(session, model, ids: list) -> None:
+    """Soft delete qilingan ota qatorlar uchun bola topic'lariga scope eventlari."""
+    ids = sorted(set(ids))
+    if not ids:
+        return
+    pending = session.info.setdefault("feed_events", [])
+    for topic, column in PARENT_SCOPES.get(model, ()):
+        pending.append(_payload(topic, "delete", None, {column: ids}))
+
+    # Kurs / o'qituvchi -> guruhlar yashirinadi -> ularning a'zoliklari
+    column = {models.Course: "course_id", models.Teacher: "teacher_id"}.get(model)
+    if column:
+        groups = models.Group.__table__
+        group_ids = session.connection().execute(
+            sa_select(groups.c.id).where(groups.c[column].in_(ids))
+        ).scalars().all()
+        if group_ids:
+            pending.append(_payload("group_students", "delete", None, {"group_id": group_ids}))
+
+
+# =====================================
+# ORM commit hooklari
+# =====================================
+def _soft_deleted(state) -> bool:
+    """deleted_at NULL -> qiymat: mijoz uchun bu "delete"."""
+    if "deleted_at" not in state.attrs:
+        return False
+    history = state.attrs.deleted_at.history
+    return bool(history.added) and history.added[0] is not None and not any(history.deleted)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault("feed_events", [])
+    for obj in session.new:
+        if isinstance(obj, TRACKED):
+            pending.append(_payload(obj.__tablename__, "insert", obj.id, _row(obj)))
+    for obj in session.dirty:
+        if isinstance(obj, models.SoftDeleteMixin) and _soft_deleted(inspect(obj)):
+            emit_parent_deleted(session, type(obj), [obj.id])
+        if isinstance(obj, TRACKED) and session.is_modified(obj, include_collections=False):
+            state = inspect(obj)
+            changed = [
+                attr.key for attr in state.mapper.column_attrs
+                if state.attrs[attr.key].history.has_changes()
+            ]
+            if _soft_deleted(state):
+                pending.append(_payload(obj.__tablename__, "delete", obj.id, _row(obj)))
+            else:
+                pending.append(_payload(obj.__tablename__, "update", obj.id, _row(obj), changed))
+    for obj in session.deleted:
+        if isinstance(obj, TRACKED):
+            pending.append(_payload(obj.__tablename__, "delete", obj.id, _row(obj)))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_changes(session):
+    pending = session.info.pop("feed_events", None)
+    if not pending:
+        return
+    try:
+        _deliver(pending)
+    except Exception:
+        # Oqim — qo'shimcha xizmat; commit qilingan yozuvga ta'sir qilmasin
+        logger.exception("change feed delivery failed")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("feed_events", None)
+
+
+# =====================================
+# Postgres LISTEN (EVENTS_NOTIFY=1)
+# =====================================
+def _listen_forever() -> None:
+    while True:
+        try:
+            raw = engine.raw_connection()
+            try:
+                dbapi_conn = raw.driver_connection
+                dbapi_conn.autocommit = True
+                cursor = dbapi_conn.cursor()
+                cursor.execute(f"LISTEN {CHANNEL}")
+                while True:
+                    if select.select([dbapi_conn], [], [], 30) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        notify = dbapi_conn.notifies.pop(0)
+                        broadcaster.publish(json.loads(notify.payload))
+            finally:
+                raw.invalidate()
+        except Exception:
+            logger.exception("change feed listener failed, reconnecting")
+            time.sleep(5)
+
+
+def start_listener() -> None:
+    """Startupda chaqiriladi; EVENTS_NOTIFY o'chiq bo'lsa hech narsa qilmaydi."""
+    if USE_NOTIFY:
+        threading.Thread(target=_listen_forever, name="change-feed-listener", daemon=True).start()
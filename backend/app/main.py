@@ -17,6 +17,15 @@ from app.routes.blogs import router as blogs_router
 from app.routes.applications import router as applications_router
 from app.routes import group_students
 from app.routes import vacancy_applications
+from app.routes.batch import router as batch_router
+from app.routes.attendance import router as attendance_router
+from app.routes.rooms import router as rooms_router
+from app.routes.schedules import router as schedules_router
+from app.routes.payroll import router as payroll_router
+from app.routes.public import router as public_router
+from app.routes.events import router as events_router
+from app.routes.sync import router as sync_router
+from app import events, dedup
 
 app = FastAPI(
     middleware=[
@@ -33,6 +42,8 @@ app = FastAPI(
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    events.start_listener()
+    dedup.warm_up()
 
 app.include_router(courses_router)
 app.include_router(students_router)
@@ -45,6 +56,14 @@ app.include_router(applications_router)
 app.include_router(group_students.router)
 app.include_router(vacancy_applications.router)
 app.include_router(payments_router)
+app.include_router(batch_router)
+app.include_router(attendance_router)
+app.include_router(rooms_router)
+app.include_router(schedules_router)
+app.include_router(payroll_router)
+app.include_router(public_router)
+app.include_router(events_router)
+app.include_router(sync_router)
 
 @app.get("/")
 def root():
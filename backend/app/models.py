@@ -1,10 +1,16 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, ForeignKey,
-    DateTime, UniqueConstraint
+    Column, Integer, BigInteger, Numeric, String, Text, ForeignKey,
+    DateTime, Time, UniqueConstraint, Index, JSON, LargeBinary, text, event,
+    exists, or_,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, backref, with_loader_criteria
 from datetime import datetime
-from app.database import Base
+from app.database import Base, SessionLocal
+
+
+# Postgres'da JSONB (GIN index bilan), boshqa bazalarda oddiy JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 
 # ================================
@@ -15,10 +21,27 @@ class TimestampMixin:
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+# ================================
+# Soft delete mixin
+# ================================
+# deleted_at to'ldirilgan qatorlar barcha ORM so'rovlaridan avtomatik
+# chiqarib tashlanadi (pastdagi do_orm_execute). Ko'rish kerak bo'lsa:
+#   db.query(...).execution_options(include_deleted=True)
+# Bog'liq qatorlar (guruh, a'zolik, yozilish, to'lov) o'chirish paytida
+# belgilanmaydi — ota qator o'lik bo'lsa ular ham shu filtrda yashiriladi
+# (LIVE_PARENTS, pastda); o'chirish so'rovi bitta UPDATE bo'lib qoladi.
+# Jismoniy o'chirish — app/purge.py (bolalarni ON DELETE CASCADE oladi).
+class SoftDeleteMixin:
+    deleted_at = Column(DateTime, nullable=True)
+
+    def soft_delete(self):
+        self.deleted_at = datetime.utcnow()
+
+
 # ================================
 # Course
 # ================================
-class Course(Base, TimestampMixin):
+class Course(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "courses"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -28,60 +51,126 @@ class Course(Base, TimestampMixin):
     audience = Column(String, nullable=False)
     description = Column(Text)
 
-    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete")
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete", passive_deletes=True)
 
 
 # ================================
 # Student
 # ================================
-class Student(Base, TimestampMixin):
+class Student(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "students"
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String, nullable=False)
-    phone = Column(String, unique=True, nullable=False)
-    email = Column(String, unique=True)
+    phone = Column(String, nullable=False)      # noyob — faqat tirik qatorlar orasida (pastda)
+    email = Column(String)
     school = Column(String, nullable=False)
     grade = Column(String, nullable=False)
     address = Column(String)
 
-    enrollments = relationship("Enrollment", back_populates="student", cascade="all, delete")
-    groups = relationship("GroupStudent", back_populates="student", cascade="all, delete")
+    enrollments = relationship("Enrollment", back_populates="student", cascade="all, delete", passive_deletes=True)
+    groups = relationship("GroupStudent", back_populates="student", cascade="all, delete", passive_deletes=True)
 
 
 # ================================
 # Teacher
 # ================================
-class Teacher(Base, TimestampMixin):
+class Teacher(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "teachers"
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String, nullable=False)
     specialty = Column(String, nullable=False)
     experience = Column(String, nullable=False)
-    phone = Column(String, unique=True, nullable=False)
+    phone = Column(String, nullable=False)      # noyob — faqat tirik qatorlar orasida (pastda)
     image = Column(String)
-    tags = Column(String)
     quote = Column(Text)
 
-    groups = relationship("Group", back_populates="teacher", cascade="all, delete")
+    groups = relationship("Group", back_populates="teacher", cascade="all, delete", passive_deletes=True)
+    # lazy="selectin": ro'yxatlarda teglar bitta qo'shimcha so'rov bilan yuklanadi
+    tag_list = relationship("Tag", secondary="teacher_tags", order_by="Tag.slug", lazy="selectin")
+
+    @property
+    def tags(self):
+        """API uchun eski format: "React, Frontend" (yozish — app/tags.py orqali)."""
+        return ", ".join(tag.name for tag in self.tag_list) or None
+
+
+# ================================
+# Tag (o'qituvchi teglari)
+# ================================
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)                 # ko'rinadigan nom: "React"
+    slug = Column(String, unique=True, nullable=False)    # qidiruv kaliti: "react"
+
+
+class TeacherTag(Base):
+    __tablename__ = "teacher_tags"
+
+    teacher_id = Column(Integer, ForeignKey("teachers.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        # ?tag= filtri: tag -> o'qituvchilar
+        Index("ix_teacher_tags_tag_teacher", "tag_id", "teacher_id"),
+    )
 
 
 # ================================
 # Group
 # ================================
-class Group(Base, TimestampMixin):
+class Group(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "groups"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    teacher_id = Column(Integer, ForeignKey("teachers.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_groups_teacher", "teacher_id"),   # jadval kesishuvi, rollups
+    )
 
     course = relationship("Course")
     teacher = relationship("Teacher", back_populates="groups")
-    students = relationship("GroupStudent", back_populates="group", cascade="all, delete")
+    students = relationship("GroupStudent", back_populates="group", cascade="all, delete", passive_deletes=True)
+
+
+# ================================
+# Room (xona)
+# ================================
+class Room(Base, TimestampMixin):
+    __tablename__ = "rooms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    capacity = Column(Integer, nullable=True)
+
+
+# ================================
+# Group schedule (haftalik dars jadvali)
+# ================================
+class GroupSchedule(Base, TimestampMixin):
+    __tablename__ = "group_schedules"
+
+    id = Column(Integer, primary_key=True)
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="SET NULL"), nullable=True)
+    weekday = Column(Integer, nullable=False)        # 0 = dushanba ... 6 = yakshanba
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
+    __table_args__ = (
+        Index("ix_group_schedules_group_weekday", "group_id", "weekday"),
+        Index("ix_group_schedules_room_weekday", "room_id", "weekday"),
+    )
+
+    group = relationship("Group")
+    room = relationship("Room")
 
 
 # ================================
@@ -91,8 +180,8 @@ class GroupStudent(Base, TimestampMixin):
     __tablename__ = "group_students"
 
     id = Column(Integer, primary_key=True)
-    group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
 
     __table_args__ = (
         UniqueConstraint("group_id", "student_id", name="unique_group_student"),
@@ -109,8 +198,8 @@ class Enrollment(Base, TimestampMixin):
     __tablename__ = "enrollments"
 
     id = Column(Integer, primary_key=True)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     status = Column(String, default="active")
 
     __table_args__ = (
@@ -136,7 +225,7 @@ class User(Base, TimestampMixin):
 # ================================
 # Vacancy
 # ================================
-class Vacancy(Base, TimestampMixin):
+class Vacancy(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "vacancies"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -145,15 +234,22 @@ class Vacancy(Base, TimestampMixin):
     salary = Column(String, nullable=False)
     location = Column(String, nullable=False)
     description = Column(Text)
-    requirements = Column(Text)        # JSON string sifatida saqlanadi
+    requirements = Column(JSONType, default=list)   # ["...", "..."]
     status = Column(String, default="active")
     date = Column(String, nullable=True)  # ✅ QO'SHILDI
 
+    __table_args__ = (
+        Index("ix_vacancies_requirements_gin", "requirements",
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # Job board filtrlari: ?status=&type=&location=
+        Index("ix_vacancies_status_type_location", "status", "type", "location"),
+    )
+
     
 # ================================
 # Blog
 # ================================
-class Blog(Base, TimestampMixin):
+class Blog(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "blogs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -162,8 +258,16 @@ class Blog(Base, TimestampMixin):
     youtube_link = Column(String)
     short_text = Column(String, nullable=False)
     content = Column(Text, nullable=False)
+    content_html = Column(Text)                     # yozishda tayyorlanadi (app/blog_render.py)
+    youtube_id = Column(String)
+    slug = Column(String, unique=True)
     status = Column(String, default="draft")
 
+    __table_args__ = (
+        # ?status=published ro'yxatlari (yangi birinchi)
+        Index("ix_blogs_status_created", "status", "created_at"),
+    )
+
 # ================================
 # models.py ga qo'shish (oxiriga)
 # ================================
@@ -182,7 +286,26 @@ class Application(Base, TimestampMixin):
     comment = Column(Text)
     status = Column(String, default="pending")  # pending | approved | rejected
 
-# JSON o'rniga String ishlatish
+    # app/dedup.py belgilaydi: ehtimoliy takror ariza / mavjud o'quvchi
+    duplicate_of_application_id = Column(
+        Integer, ForeignKey("applications.id", ondelete="SET NULL"), nullable=True
+    )
+    duplicate_of_student_id = Column(
+        Integer, ForeignKey("students.id", ondelete="SET NULL"), nullable=True
+    )
+
+    __table_args__ = (
+        # Inbox: status/kurs filtrlari + created_at bo'yicha keyset
+        Index("ix_applications_status_created", "status", "created_at", "id"),
+        Index("ix_applications_course_status", "course_id", "status"),
+        # Qabul davrida eng ko'p ochiladigan tab — faqat pending qatorlar
+        Index(
+            "ix_applications_pending_created", "created_at", "id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
 class VacancyApplication(Base, TimestampMixin):
     __tablename__ = "vacancy_applications"
 
@@ -190,13 +313,20 @@ class VacancyApplication(Base, TimestampMixin):
     full_name = Column(String, nullable=False)
     phone = Column(String, nullable=False)
     education = Column(String, nullable=False)
-    # String sifatida saqlash (JSON.stringify qilish kerak)
-    certificates = Column(Text, default="[]")  # JSON string sifatida
-    certificate_level = Column(String, nullable=True)
-    vacancy_id = Column(Integer, ForeignKey("vacancies.id", ondelete="SET NULL"), nullable=False)
+    certificates = Column(JSONType, default=list)   # ["IELTS", "CEFR"]
+    certificate_level = Column(String, nullable=True, index=True)
+    vacancy_id = Column(Integer, ForeignKey("vacancies.id", ondelete="SET NULL"), nullable=True)
     status = Column(String, default="pending")
     notes = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # HR inbox: status/vakansiya filtrlari + created_at bo'yicha keyset
+        Index("ix_vacancy_applications_status_created", "status", "created_at", "id"),
+        Index("ix_vacancy_applications_vacancy_status", "vacancy_id", "status"),
+        Index("ix_vacancy_applications_certificates_gin", "certificates",
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
     vacancy = relationship("Vacancy", backref="applications")
 
 # ================================
@@ -215,5 +345,242 @@ class Payment(Base, TimestampMixin):
     status = Column(String, default="pending")      # pending | paid
     note = Column(Text, nullable=True)
 
-    student = relationship("Student", backref="payments")
-    course = relationship("Course", backref="payments")
\ No newline at end of file
+    __table_args__ = (
+        # Guruh to'lov jadvali: kurs + o'quvchilar + oy oralig'i
+        Index("ix_payments_course_student_month", "course_id", "student_id", "month"),
+    )
+
+    student = relationship("Student", backref=backref("payments", passive_deletes=True))
+    course = relationship("Course", backref=backref("payments", passive_deletes=True))
+
+
+# ================================
+# Teacher stats (rollup, app/rollups.py yangilaydi)
+# ================================
+class TeacherStats(Base):
+    __tablename__ = "teacher_stats"
+
+    teacher_id = Column(Integer, ForeignKey("teachers.id", ondelete="CASCADE"), primary_key=True)
+    groups_count = Column(Integer, nullable=False, default=0)
+    students_count = Column(Integer, nullable=False, default=0)    # distinct o'quvchilar
+    payments_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(BigInteger, nullable=False, default=0)        # to'langan (status = paid)
+    pending = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+
+# ================================
+# Payroll (o'qituvchi oyligi, app/payroll.py)
+# ================================
+class PayrollRule(Base, TimestampMixin):
+    __tablename__ = "payroll_rules"
+
+    id = Column(Integer, primary_key=True)
+    teacher_id = Column(Integer, ForeignKey("teachers.id", ondelete="CASCADE"), unique=True, nullable=False)
+    percent = Column(Numeric(5, 2), nullable=False)          # yig'ilgan to'lovlardan foiz
+    fixed_amount = Column(Integer, nullable=False, default=0)  # oylik qat'iy qism
+
+    teacher = relationship("Teacher")
+
+
+# Hisoblangan run o'zgarmaydi; qayta hisoblashda natija farq qilsa — yangi revision
+class PayrollRun(Base):
+    __tablename__ = "payroll_runs"
+
+    id = Column(Integer, primary_key=True)
+    month = Column(String, nullable=False)              # "2026-02"
+    revision = Column(Integer, nullable=False)
+    checksum = Column(String(64), nullable=False)       # elementlar sha256
+    teachers_count = Column(Integer, nullable=False)
+    total_collected = Column(BigInteger, nullable=False)
+    total_payout = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("month", "revision", name="unique_payroll_run_revision"),
+    )
+
+    items = relationship(
+        "PayrollItem", back_populates="run", order_by="PayrollItem.teacher_id",
+        cascade="all, delete", passive_deletes=True,
+    )
+
+
+class PayrollItem(Base):
+    __tablename__ = "payroll_items"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("payroll_runs.id", ondelete="CASCADE"), nullable=False)
+    teacher_id = Column(Integer, ForeignKey("teachers.id", ondelete="SET NULL"), nullable=True)
+    payments_count = Column(Integer, nullable=False)
+    collected = Column(BigInteger, nullable=False)
+    percent = Column(Numeric(5, 2), nullable=False)
+    fixed_amount = Column(Integer, nullable=False)
+    payout = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ix_payroll_items_run", "run_id"),
+        Index("ix_payroll_items_teacher", "teacher_id"),
+    )
+
+    run = relationship("PayrollRun", back_populates="items")
+
+
+# ================================
+# Attendance (guruh × oy uchun bitta qator)
+# ================================
+# Har bir o'quvchi "slot"ga ega (slots ro'yxatidagi o'rni). Har bir slot uchun
+# 32 bit: bit (kun - 1) — shu kuni dars. Bitmaplar little-endian bytes:
+#   expected — dars paytida o'quvchi guruhda bo'lgan
+#   present  — o'quvchi darsda qatnashgan
+# Batafsil: app/attendance.py
+class AttendanceMonth(Base, TimestampMixin):
+    __tablename__ = "attendance_months"
+
+    id = Column(Integer, primary_key=True)
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    month = Column(String, nullable=False)              # "2026-02"
+    slots = Column(JSONType, nullable=False, default=list)   # [student_id, ...]
+    lessons = Column(Integer, nullable=False, default=0)     # dars kunlari (bitmask)
+    expected = Column(LargeBinary, nullable=False, default=b"")
+    present = Column(LargeBinary, nullable=False, default=b"")
+
+    __table_args__ = (
+        UniqueConstraint("group_id", "month", name="unique_attendance_group_month"),
+        Index("ix_attendance_months_month", "month"),
+    )
+
+    group = relationship("Group")
+
+
+# ================================
+# Tombstones (delta sync: jismoniy o'chirilgan qatorlar)
+# ================================
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)          # jadval nomi: "payments"
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+        Index("ix_tombstones_entity_deleted_at", "entity", "deleted_at"),
+    )
+
+
+# ================================
+# Outbox (app/outbox.py worker bajaradi)
+# ================================
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String, nullable=False)            # "application.activated"
+    payload = Column(JSONType, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="pending")   # pending | done | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Worker: status = pending AND available_at <= now ORDER BY id
+        Index("ix_outbox_events_status_available", "status", "available_at", "id"),
+    )
+
+
+# ================================
+# Delta sync: ?updated_since= uchun updated_at indekslari
+# ================================
+SYNC_MODELS = (
+    Course, Student, Teacher, Group, GroupStudent, Enrollment, Payment,
+    Application, VacancyApplication, Vacancy, Blog,
+)
+
+for _model in SYNC_MODELS:
+    Index(f"ix_{_model.__tablename__}_updated_at", _model.updated_at, _model.id)
+
+
+# ================================
+# Soft delete: partial indexlar va global filtr
+# ================================
+SOFT_DELETE_MODELS = (Student, Teacher, Course, Group, Blog, Vacancy)
+
+# O'z deleted_at'i bo'lmagan (yoki bo'lsa ham) qator ota qatorlaridan biri
+# o'chirilgan bo'lsa ko'rinmaydi: model -> ((FK ustuni, ota model), ...).
+# A'zolik, yozilish va to'lovning o'z DELETE route'lari jismoniy o'chiradi
+# (bitta qator, tombstone — app/sync.py).
+LIVE_PARENTS = {
+    Group: (("course_id", Course), ("teacher_id", Teacher)),
+    GroupStudent: (("group_id", Group), ("student_id", Student)),
+    Enrollment: (("student_id", Student), ("course_id", Course)),
+    Payment: (("student_id", Student), ("course_id", Course)),
+}
+
+
+def _parent_dead(parent, fk_column):
+    """EXISTS: fk_column ko'rsatgan ota qator (yoki uning otasi) o'chirilgan."""
+    table = parent.__table__.alias()   # Core jadval — ORM filtri qo'shilmaydi
+    dead = table.c.deleted_at.isnot(None)
+    for column, grandparent in LIVE_PARENTS.get(parent, ()):
+        dead = or_(dead, _parent_dead(grandparent, table.c[column]))
+    return exists().where(table.c.id == fk_column, dead)
+
+
+def live_parents_clause(model):
+    return ~or_(*(_parent_dead(parent, getattr(model, column)) for column, parent in LIVE_PARENTS[model]))
+
+# Noyob ustunlar faqat tirik qatorlar orasida: o'chirilgan o'quvchining
+# telefoni bilan yangi o'quvchi yaratish mumkin
+# (ON CONFLICT uchun: index_where=Student.deleted_at.is_(None))
+LIVE_UNIQUE = ((Student, "phone"), (Student, "email"), (Teacher, "phone"))
+
+for _model, _column in LIVE_UNIQUE:
+    Index(
+        f"uq_{_model.__tablename__}_{_column}_live", getattr(_model, _column),
+        unique=True,
+        postgresql_where=_model.deleted_at.is_(None),
+        sqlite_where=_model.deleted_at.is_(None),
+    )
+
+for _model in SOFT_DELETE_MODELS:
+    _table = _model.__tablename__
+    # Tirik qatorlar (barcha oddiy so'rovlar)
+    Index(
+        f"ix_{_table}_live", _model.id,
+        postgresql_where=_model.deleted_at.is_(None),
+        sqlite_where=_model.deleted_at.is_(None),
+    )
+    # Purge job: o'chirilganlar, eng eskisidan
+    Index(
+        f"ix_{_table}_deleted_at", _model.deleted_at,
+        postgresql_where=_model.deleted_at.isnot(None),
+        sqlite_where=_model.deleted_at.isnot(None),
+    )
+
+
+_LIVE_PARENT_CRITERIA = [
+    with_loader_criteria(model, live_parents_clause(model), include_aliases=True)
+    for model in LIVE_PARENTS
+]
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _exclude_soft_deleted(execute_state):
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+            ),
+            *_LIVE_PARENT_CRITERIA,
+        )
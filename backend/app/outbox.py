@@ -0,0 +1,203 @@
+# app/outbox.py
+# Transactional outbox: so'rovning qo'shimcha ishlari (side effects)
+#
+# Route o'z qatori bilan BIRGA (bitta commitda) outbox_events ga yozadi
+# — enqueue(). Worker jarayoni navbatni BATCH_SIZE tadan oladi va
+# handlerlarni bajaradi; xato bo'lsa eksponensial kutish bilan qayta
+# urinadi, MAX_ATTEMPTS dan keyin "failed". Yetkazish at-least-once:
+# handlerlar idempotent bo'lishi shart. Postgres'da bir nechta worker
+# FOR UPDATE SKIP LOCKED bilan bir-biriga xalaqit bermaydi.
+#   python -m app.outbox              # navbat bo'shaguncha
+#   python -m app.outbox --loop 2     # doimiy, har 2 sekundda
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "5"))
+RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+
+HANDLERS: dict = {}
+
+
+def handler(topic: str):
+    """@handler("payment.paid") — topic uchun bajaruvchi (db, payload)."""
+    def register(func: Callable) -> Callable:
+        HANDLERS[topic] = func
+        return func
+    return register
+
+
+def enqueue(db: Session, topic: str, payload: dict) -> None:
+    """Commit qilmaydi — event route'ning o'z tranzaksiyasi bilan yoziladi."""
+    if topic not in HANDLERS:
+        raise ValueError(f"Unknown outbox topic: {topic}")
+    db.add(models.OutboxEvent(topic=topic, payload=payload))
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+# =====================================
+# Worker
+# =====================================
+def process_batch(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Bitta batch: qatorlar FOR UPDATE SKIP LOCKED bilan olinadi (commitgacha
+    boshqa workerlar ko'rmaydi), har bir event alohida savepointda bajariladi.
+    """
+    now = datetime.utcnow()
+    events = db.execute(
+        select(models.OutboxEvent)
+        .where(models.OutboxEvent.status == "pending", models.OutboxEvent.available_at <= now)
+        .order_by(models.OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    for item in events:
+        item.attempts += 1
+        try:
+            with db.begin_nested():
+                HANDLERS[item.topic](db, item.payload)
+        except Exception as exc:
+            logger.exception("outbox event %s (%s) failed", item.id, item.topic)
+            item.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+            if item.attempts >= MAX_ATTEMPTS:
+                item.status = "failed"
+            else:
+                item.available_at = datetime.utcnow() + _backoff(item.attempts)
+        else:
+            item.status = "done"
+            item.processed_at = datetime.utcnow()
+            item.last_error = None
+
+    db.commit()
+    return len(events)
+
+
+def drain(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """Hozir tayyor eventlar tugaguncha (qayta urinishlar keyingi aylanishda)."""
+    total = 0
+    while True:
+        count = process_batch(db, batch_size)
+        total += count
+        if count < batch_size:
+            return total
+
+
+def purge_processed(db: Session, retention_days: int = RETENTION_DAYS) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = db.execute(
+        delete(models.OutboxEvent).where(
+            models.OutboxEvent.status == "done",
+            models.OutboxEvent.processed_at < cutoff,
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return result.rowcount
+
+
+# =====================================
+# Handlerlar
+# =====================================
+@handler("application.activated")
+def create_student_from_application(db: Session, payload: dict) -> None:
+    """
+    Ariza active bo'lganda student yaratadi.
+    Telefon bo'yicha tirik student allaqachon bo'lsa yoki ariza qaytadan
+    active emas bo'lsa — hech narsa qilmaydi (qayta yetkazish xavfsiz).
+    O'chirilgan (soft delete) o'quvchining telefoni band emas
+    (uq_students_phone_live) — yangi o'quvchi yaratiladi.
+    """
+    application = db.get(models.Application, payload["application_id"])
+    if application is None or application.status != "active":
+        return
+
+    existing = db.query(models.Student.id).filter(
+        models.Student.phone == application.phone
+    ).first()
+    if existing:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(models.Student(
+                full_name=application.full_name,
+                phone=application.phone,
+                school=application.school or "—",
+                grade=application.grade or "—",
+                address=application.address,
+                email=None,  # Arizada email yo'q
+            ))
+    except IntegrityError:
+        # Parallel so'rov shu telefon bilan o'quvchi yaratib ulgurgan — bajarilgan
+        if db.query(models.Student.id).filter(models.Student.phone == application.phone).first():
+            return
+        raise
+
+
+@handler("payment.paid")
+def send_payment_receipt(db: Session, payload: dict) -> None:
+    """To'lov cheki; SMS / email provayderi ulanmaguncha faqat log."""
+    payment = db.get(models.Payment, payload["payment_id"])
+    if payment is None or payment.status != "paid":
+        return
+
+    student = db.get(models.Student, payment.student_id)
+    course = db.get(models.Course, payment.course_id)
+    logger.info(
+        "receipt: payment=%s student=%s phone=%s course=%s month=%s amount=%s",
+        payment.id,
+        student.full_name if student else None,
+        student.phone if student else None,
+        course.name if course else None,
+        payment.month,
+        payment.amount,
+    )
+
+
+
+@handler("teacher_stats.refresh")
+def refresh_teacher_stats(db: Session, payload: dict) -> None:
+    """Tarkib o'zgargan o'qituvchilar statistikasini qayta hisoblash (app/rollups.py)."""
+    from app import rollups   # rollups outbox'ni import qiladi — aylanma importdan qochish
+
+    rollups.refresh(db, rollups.resolve_teachers(db, payload))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outbox eventlarini bajarish")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--loop", type=float, default=0, help="sekund; 0 — navbat bo'shaguncha bir marta")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    while True:
+        db = SessionLocal()
+        try:
+            processed = drain(db, args.batch_size)
+            if processed or not args.loop:
+                print(datetime.utcnow().isoformat(), {"processed": processed})
+        finally:
+            db.close()
+        if not args.loop:
+            break
+        time.sleep(args.loop)
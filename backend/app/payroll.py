@@ -0,0 +1,146 @@
+# app/payroll.py
+# O'qituvchi oyligi: oy davomida guruhlarida yig'ilgan to'lovlardan foiz
+#
+# Hisob bitta set-based so'rov: oyning to'langan (status = paid) to'lovlari
+# o'quvchining shu kursdagi guruhiga bog'lanadi (app/rollups.payment_groups)
+# va o'qituvchi bo'yicha yig'iladi. Natija o'zgarmas payroll_runs /
+# payroll_items qatorlariga yoziladi; qayta hisoblash natijasi oxirgi run
+# bilan bir xil bo'lsa (checksum) — yangi run yaratilmaydi.
+#   python -m app.payroll 2026-02
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models
+from app.rollups import payment_groups
+
+# Qoidasi yo'q o'qituvchilar uchun foiz
+DEFAULT_PERCENT = Decimal(os.getenv("PAYROLL_DEFAULT_PERCENT", "0"))
+
+
+def check_month(value: str) -> str:
+    """"2026-02" formatini tekshiradi (ValueError)."""
+    year, month = map(int, value.split("-"))
+    date(year, month, 1)
+    return f"{year:04d}-{month:02d}"
+
+
+def compute(db: Session, month: str) -> list:
+    """O'qituvchilar bo'yicha oylik elementlari (saqlamaydi), teacher_id bo'yicha tartiblangan."""
+    attribution = payment_groups()
+    collected = db.query(
+        models.Group.teacher_id,
+        func.count(models.Payment.id),
+        func.sum(models.Payment.amount),
+    ).join(
+        attribution,
+        (attribution.c.student_id == models.Payment.student_id)
+        & (attribution.c.course_id == models.Payment.course_id),
+    ).join(
+        models.Group, models.Group.id == attribution.c.group_id
+    ).filter(
+        models.Payment.month == month,
+        models.Payment.status == "paid",
+    ).group_by(models.Group.teacher_id).all()
+
+    rules = {
+        rule.teacher_id: rule
+        for rule in db.query(models.PayrollRule).join(models.Teacher).all()
+    }
+    totals = {tid: (count, int(amount or 0)) for tid, count, amount in collected}
+
+    items = []
+    for teacher_id in sorted(set(totals) | set(rules)):
+        count, amount = totals.get(teacher_id, (0, 0))
+        rule = rules.get(teacher_id)
+        percent = Decimal(rule.percent) if rule else DEFAULT_PERCENT
+        fixed = rule.fixed_amount if rule else 0
+        if not amount and not fixed:
+            continue
+
+        share = (Decimal(amount) * percent / 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        items.append({
+            "teacher_id": teacher_id,
+            "payments_count": count,
+            "collected": amount,
+            "percent": percent.quantize(Decimal("0.01")),
+            "fixed_amount": fixed,
+            "payout": int(share) + fixed,
+        })
+    return items
+
+
+def checksum(items: list) -> str:
+    payload = json.dumps(items, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def close_month(db: Session, month: str) -> tuple:
+    """
+    Oyni yopadi: (run, created). Oxirgi run bilan natija bir xil bo'lsa,
+    o'sha run qaytariladi (idempotent), aks holda yangi revision yoziladi.
+    """
+    month = check_month(month)
+    items = compute(db, month)
+    digest = checksum(items)
+
+    latest = db.query(models.PayrollRun).filter(
+        models.PayrollRun.month == month
+    ).order_by(models.PayrollRun.revision.desc()).first()
+    if latest and latest.checksum == digest:
+        return latest, False
+
+    run = models.PayrollRun(
+        month=month,
+        revision=latest.revision + 1 if latest else 1,
+        checksum=digest,
+        teachers_count=len(items),
+        total_collected=sum(item["collected"] for item in items),
+        total_payout=sum(item["payout"] for item in items),
+    )
+    db.add(run)
+    db.flush()
+
+    if items:
+        db.execute(insert(models.PayrollItem), [dict(item, run_id=run.id) for item in items])
+    db.commit()
+    db.refresh(run)
+    return run, True
+
+
+# =====================================
+# O'zgarmaslik
+# =====================================
+@event.listens_for(models.PayrollRun, "before_update")
+@event.listens_for(models.PayrollItem, "before_update")
+def _forbid_update(mapper, connection, target):
+    raise ValueError("Payroll runs are immutable; close the month again to get a new revision")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oy bo'yicha o'qituvchi oyligini hisoblash")
+    parser.add_argument("month", help="YYYY-MM")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        run, created = close_month(db, args.month)
+        print({
+            "run_id": run.id,
+            "month": run.month,
+            "revision": run.revision,
+            "created": created,
+            "teachers": run.teachers_count,
+            "total_collected": run.total_collected,
+            "total_payout": run.total_payout,
+        })
+    finally:
+        db.close()
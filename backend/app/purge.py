@@ -0,0 +1,80 @@
+# app/purge.py
+# Soft delete qilingan qatorlarni jismoniy o'chirish (background job)
+#
+# Qatorlar SOFT_DELETE_RETENTION_DAYS kundan keyin BATCH_SIZE tadan
+# o'chiriladi; har bir chunk alohida tranzaksiya, bog'liq qatorlarni baza
+# ON DELETE CASCADE bilan o'chiradi. O'chirilgan qatorlar delta sync uchun
+# tombstones jadvaliga o'tkaziladi; TOMBSTONE_RETENTION_DAYS dan eski
+# tombstone'lar va bajarilgan outbox eventlari ham shu yerda tozalanadi. Cron yoki off-peak vaqtda ishga tushiring:
+#   python -m app.purge              # bir marta
+#   python -m app.purge --loop 3600  # har soatda
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models, outbox, sync
+
+RETENTION_DAYS = int(os.getenv("SOFT_DELETE_RETENTION_DAYS", "30"))
+BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+
+
+def purge_model(db: Session, model, cutoff: datetime, batch_size: int = BATCH_SIZE) -> int:
+    total = 0
+    while True:
+        rows = db.execute(
+            select(model.id, model.deleted_at)
+            .where(model.deleted_at.isnot(None), model.deleted_at < cutoff)
+            .order_by(model.deleted_at)
+            .limit(batch_size)
+            .execution_options(include_deleted=True)
+        ).all()
+        if not rows:
+            return total
+
+        ids = [row.id for row in rows]
+        db.execute(
+            delete(model).where(model.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        # asl o'chirilgan vaqt bilan — mijozlar watermarki bo'yicha ko'rinib turadi
+        db.execute(insert(models.Tombstone), [
+            {"entity": model.__tablename__, "row_id": row.id, "deleted_at": row.deleted_at}
+            for row in rows
+        ])
+        db.commit()
+        total += len(ids)
+
+
+def purge(db: Session, retention_days: int = RETENTION_DAYS, batch_size: int = BATCH_SIZE) -> dict:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = {
+        model.__tablename__: purge_model(db, model, cutoff, batch_size)
+        for model in models.SOFT_DELETE_MODELS
+    }
+    result["tombstones"] = sync.purge_tombstones(db)
+    result["outbox_events"] = outbox.purge_processed(db)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soft delete qilingan qatorlarni o'chirish")
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--loop", type=int, default=0, help="sekund; 0 — bir marta ishlash")
+    args = parser.parse_args()
+
+    while True:
+        db = SessionLocal()
+        try:
+            print(datetime.utcnow().isoformat(), purge(db, args.days, args.batch_size))
+        finally:
+            db.close()
+        if not args.loop:
+            break
+        time.sleep(args.loop)
@@ -0,0 +1,201 @@
+# app/query_utils.py
+# Routerlar uchun umumiy so'rov yordamchilari
+
+import base64
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, func, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import noload, selectinload
+
+from app import events
+
+
+# =====================================
+# ?expand=course,teacher,student
+# =====================================
+def expand_options(expand: Optional[str], relations: dict) -> list:
+    """
+    ?expand= qiymatini loader optionlarga aylantiradi.
+    So'ralgan bog'lanishlar selectinload bilan (bitta SELECT ... IN) yuklanadi,
+    qolganlari noload — javobda None bo'ladi va lazy-load so'rovi yuborilmaydi.
+    """
+    requested = {name.strip() for name in (expand or "").split(",") if name.strip()}
+
+    unknown = requested - relations.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}. "
+                   f"Allowed: {', '.join(relations)}"
+        )
+
+    return [
+        selectinload(attr) if name in requested else noload(attr)
+        for name, attr in relations.items()
+    ]
+
+
+# =====================================
+# INSERT ... ON CONFLICT (Postgres va SQLite)
+# =====================================
+def dialect_insert(db, model):
+    """
+    on_conflict_do_nothing / on_conflict_do_update qo'llab-quvvatlaydigan insert.
+    Ikkala dialektda ham RETURNING ishlaydi (SQLite >= 3.35).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
+
+
+# =====================================
+# JSON massiv ichida qiymat bormi (server tomonda filtr)
+# =====================================
+def json_array_contains(db, column, value):
+    """
+    Postgres: JSONB @> '["value"]' (GIN index ishlatiladi).
+    SQLite: EXISTS (SELECT 1 FROM json_each(column) WHERE value = ?).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return type_coerce(column, JSONB).contains([value])
+
+    items = func.json_each(column).table_valued("value")
+    return select(items.c.value).where(items.c.value == value).exists()
+
+
+# =====================================
+# Keyset (cursor) pagination: ORDER BY created_at DESC, id DESC
+# =====================================
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query, model, cursor: Optional[str], limit: int):
+    """
+    created_at/id bo'yicha kamayish tartibida bitta sahifa qaytaradi.
+    OFFSET ishlatilmaydi — sahifa chuqurligi so'rov narxiga ta'sir qilmaydi.
+    Natija: (rows, next_cursor)
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+
+    rows = query.order_by(
+        model.created_at.desc(), model.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if hasattr(last, "_fields"):   # Row: (entity, qo'shimcha ustunlar...)
+            last = last[0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, next_cursor
+
+
+# =====================================
+# Soft delete (bulk)
+# =====================================
+def bulk_soft_delete(db, model, ids: list) -> int:
+    """
+    Qatorlarni deleted_at bilan belgilaydi (commit qiladi) va sonini qaytaradi.
+    Bog'liq qatorlar global filtrda yashiriladi (models.LIVE_PARENTS),
+    oqimga ular uchun scope eventlari; jismoniy o'chirish — app/purge.py
+    (ON DELETE CASCADE).
+    """
+    if not ids:
+        return 0
+    deleted = db.execute(
+        update(model)
+        .where(model.id.in_(set(ids)), model.deleted_at.is_(None))
+        .values(deleted_at=datetime.utcnow())
+        .returning(model.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+    events.emit_parent_deleted(db, model, deleted)
+    db.commit()
+    return len(deleted)
+
+
+# =====================================
+# Delta sync: ?updated_since= / ?sync_cursor= + X-Sync-Watermark
+# =====================================
+# Uzoq tranzaksiyalar updated_at'ni commitdan oldin qo'yadi — watermark
+# shuncha soniya orqaga suriladi (chegaradagi qatorlar qayta yuborilishi
+# mumkin, mijoz id bo'yicha upsert qiladi).
+SYNC_LAG_SECONDS = int(os.getenv("SYNC_LAG_SECONDS", "5"))
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def sync_watermark() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=SYNC_LAG_SECONDS)
+
+
+def sync_page(query, model, updated_since: Optional[datetime], response: Response,
+              sync_cursor: Optional[str] = None, skip: int = 0, limit: Optional[int] = None) -> list:
+    """
+    updated_since (yoki sync_cursor) berilsa — faqat shundan keyin
+    o'zgarganlar, (updated_at, id) tartibida; offset/limit shu yerda.
+
+    Sahifa to'lsa (len == limit) delta hali tugamagan: X-Sync-Cursor —
+    oxirgi qatorning (updated_at, id) si (keyingi sahifa ?sync_cursor=),
+    X-Sync-Watermark — uning updated_at'i. Soat bo'yicha watermark faqat
+    delta tugaganda (aks holda sahifadan keyingi qatorlar tashlab ketiladi).
+    O'chirilganlar — /sync/tombstones.
+    """
+    watermark = sync_watermark()   # so'rovdan OLDIN
+    if sync_cursor:
+        after, after_id = decode_cursor(sync_cursor)
+        query = query.filter(or_(
+            model.updated_at > after,
+            and_(model.updated_at == after, model.id > after_id),
+        ))
+    elif updated_since is not None:
+        query = query.filter(model.updated_at >= to_naive_utc(updated_since))
+
+    delta = bool(sync_cursor) or updated_since is not None
+    if delta:
+        query = query.order_by(None).order_by(model.updated_at, model.id)
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+
+    if delta and limit is not None and rows and len(rows) >= limit:
+        last = rows[-1]
+        if hasattr(last, "_fields"):   # Row: (entity, qo'shimcha ustunlar...)
+            last = last[0]
+        response.headers["X-Sync-Cursor"] = encode_cursor(last.updated_at, last.id)
+        response.headers["X-Sync-Watermark"] = last.updated_at.isoformat()
+    else:
+        response.headers["X-Sync-Watermark"] = watermark.isoformat()
+    return rows
@@ -0,0 +1,354 @@
+# app/rollups.py
+# O'qituvchi statistikasi (teacher_stats) — yozuvlar bilan birga yangilanadi
+#
+# To'lovlar — delta: to'lov qo'shilsa / o'zgarsa / o'chirilsa, commitdan
+# oldin (shu tranzaksiyada) faqat tegishli o'qituvchi qatoriga
+#   payments_count = payments_count + :d, revenue = revenue + :d, ...
+# yoziladi. Qayta hisob yo'q; qator qulfi faqat shu UPDATE davomida.
+#
+# Tarkib o'zgarishlari (guruh, guruh-o'quvchi, o'quvchi / kurs /
+# o'qituvchi soft delete) ko'p to'lovning qaysi o'qituvchiga
+# tegishliligini o'zgartiradi — ular uchun outbox'ga REFRESH_TOPIC eventi
+# yoziladi va worker (app/outbox.py) o'z tranzaksiyasida qatorni
+# FOR UPDATE bilan qulflab qayta hisoblaydi; yozish so'rovi kutmaydi.
+# Qulf hisobdan OLDIN olinadi: parallel delta UPDATE'lar yo yakunlanib
+# hisobga kiradi, yo qulfni kutib natija ustiga qo'shiladi.
+# Core bulk so'rovlar ORM eventlaridan o'tmaydi — routelar mark_dirty()
+# ni chaqiradi. To'liq qayta qurish (kamdan-kam poygalar uchun ham):
+#   python -m app.rollups
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, distinct, event, func, inspect, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models, outbox
+from app.query_utils import dialect_insert
+
+REFRESH_TOPIC = "teacher_stats.refresh"
+
+
+# =====================================
+# To'lovni guruhga bog'lash
+# =====================================
+def payment_groups(student_ids=None, pairs: Optional[list] = None):
+    """
+    (student_id, course_id) -> group_id: o'quvchining shu kursdagi guruhi.
+    Bir kursda bir nechta guruh bo'lsa — eng kichik id (barqaror tanlov).
+    student_ids (ro'yxat yoki subquery) / pairs [(student_id, course_id)]
+    berilsa — faqat shular (butun jadval yig'ilmaydi).
+    """
+    query = (
+        select(
+            models.GroupStudent.student_id.label("student_id"),
+            models.Group.course_id.label("course_id"),
+            func.min(models.Group.id).label("group_id"),
+        )
+        .join(models.Group, models.Group.id == models.GroupStudent.group_id)
+        .join(models.Student, models.Student.id == models.GroupStudent.student_id)
+    )
+    if student_ids is not None:
+        query = query.where(models.GroupStudent.student_id.in_(student_ids))
+    if pairs is not None:
+        query = query.where(tuple_(models.GroupStudent.student_id, models.Group.course_id).in_(pairs))
+    return (
+        query
+        .group_by(models.GroupStudent.student_id, models.Group.course_id)
+        .subquery("payment_groups")
+    )
+
+
+# =====================================
+# Qayta hisoblash
+# =====================================
+def compute(db: Session, teacher_ids: list) -> dict:
+    """teacher_id -> statistikalar; uchta GROUP BY so'rovi, faqat shu o'qituvchilar o'quvchilari bo'yicha."""
+    stats = {
+        tid: {"teacher_id": tid, "groups_count": 0, "students_count": 0,
+              "payments_count": 0, "revenue": 0, "pending": 0}
+        for tid in teacher_ids
+    }
+    if not stats:
+        return stats
+
+    groups = db.query(
+        models.Group.teacher_id, func.count(models.Group.id)
+    ).filter(
+        models.Group.teacher_id.in_(teacher_ids)
+    ).group_by(models.Group.teacher_id).all()
+    for tid, count in groups:
+        stats[tid]["groups_count"] = count
+
+    students = db.query(
+        models.Group.teacher_id, func.count(distinct(models.GroupStudent.student_id))
+    ).join(
+        models.GroupStudent, models.GroupStudent.group_id == models.Group.id
+    ).join(
+        models.Student, models.Student.id == models.GroupStudent.student_id
+    ).filter(
+        models.Group.teacher_id.in_(teacher_ids)
+    ).group_by(models.Group.teacher_id).all()
+    for tid, count in students:
+        stats[tid]["students_count"] = count
+
+    teacher_students = (
+        select(models.GroupStudent.student_id)
+        .join(models.Group, models.Group.id == models.GroupStudent.group_id)
+        .where(models.Group.teacher_id.in_(teacher_ids))
+    )
+    attribution = payment_groups(student_ids=teacher_students)
+    payments = db.query(
+        models.Group.teacher_id,
+        func.count(models.Payment.id),
+        func.coalesce(func.sum(case((models.Payment.status == "paid", models.Payment.amount), else_=0)), 0),
+        func.coalesce(func.sum(case((models.Payment.status != "paid", models.Payment.amount), else_=0)), 0),
+    ).join(
+        attribution,
+        (attribution.c.student_id == models.Payment.student_id)
+        & (attribution.c.course_id == models.Payment.course_id),
+    ).join(
+        models.Group, models.Group.id == attribution.c.group_id
+    ).filter(
+        models.Group.teacher_id.in_(teacher_ids)
+    ).group_by(models.Group.teacher_id).all()
+    for tid, count, revenue, pending in payments:
+        stats[tid].update(payments_count=count, revenue=revenue, pending=pending)
+
+    return stats
+
+
+def _lock(db: Session, teacher_ids: list) -> None:
+    """Yo'q qatorlarni qo'shib, barchasini teacher_id tartibida qulflaydi (deadlocksiz)."""
+    stmt = dialect_insert(db, models.TeacherStats).values([
+        {"teacher_id": tid, "groups_count": 0, "students_count": 0,
+         "payments_count": 0, "revenue": 0, "pending": 0}
+        for tid in teacher_ids
+    ])
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["teacher_id"]))
+    db.execute(
+        select(models.TeacherStats.teacher_id)
+        .where(models.TeacherStats.teacher_id.in_(teacher_ids))
+        .order_by(models.TeacherStats.teacher_id)
+        .with_for_update()
+    ).all()
+
+
+def refresh(db: Session, teacher_ids: Iterable[int]) -> int:
+    """Berilgan o'qituvchilar qatorini qulflab, qayta hisoblab yozadi (commit qilmaydi)."""
+    teacher_ids = sorted(set(teacher_ids))
+    if not teacher_ids:
+        return 0
+
+    _lock(db, teacher_ids)
+    now = datetime.utcnow()
+    rows = [dict(row, refreshed_at=now) for row in compute(db, teacher_ids).values()]
+
+    stmt = dialect_insert(db, models.TeacherStats).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["teacher_id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("groups_count", "students_count", "payments_count",
+                           "revenue", "pending", "refreshed_at")
+        },
+    ))
+    return len(rows)
+
+
+def rebuild(db: Session, batch_size: int = 500) -> int:
+    """Barcha o'qituvchilar uchun to'liq qayta qurish."""
+    teacher_ids = db.execute(select(models.Teacher.id)).scalars().all()
+    db.execute(
+        delete(models.TeacherStats).where(models.TeacherStats.teacher_id.notin_(teacher_ids)),
+        execution_options={"synchronize_session": False},
+    )
+    for i in range(0, len(teacher_ids), batch_size):
+        refresh(db, teacher_ids[i:i + batch_size])
+    db.commit()
+    return len(teacher_ids)
+
+
+# =====================================
+# Tarkib o'zgarishlari -> outbox (worker qayta hisoblaydi)
+# =====================================
+def mark_dirty(session: Session, teacher_ids=(), group_ids=(), student_ids=(), course_ids=()) -> None:
+    """Commit bilan birga shu o'qituvchilar / guruhlar / o'quvchilar / kurslar uchun qayta hisob navbatga."""
+    dirty = session.info.setdefault(
+        "rollup_dirty", {"teacher": set(), "group": set(), "student": set(), "course": set()}
+    )
+    dirty["teacher"].update(teacher_ids)
+    dirty["group"].update(group_ids)
+    dirty["student"].update(student_ids)
+    dirty["course"].update(course_ids)
+
+
+def resolve_teachers(session: Session, dirty: dict) -> set:
+    """Guruh / o'quvchi / kurs -> o'qituvchilar (soft delete qilinganlar ham hisobga olinadi)."""
+    teacher_ids = set(dirty.get("teacher", ()))
+    if dirty.get("group"):
+        teacher_ids.update(session.execute(
+            select(models.Group.teacher_id)
+            .where(models.Group.id.in_(dirty["group"]))
+            .execution_options(include_deleted=True)
+        ).scalars())
+    if dirty.get("student"):
+        teacher_ids.update(session.execute(
+            select(models.Group.teacher_id)
+            .join(models.GroupStudent, models.GroupStudent.group_id == models.Group.id)
+            .where(models.GroupStudent.student_id.in_(dirty["student"]))
+            .execution_options(include_deleted=True)
+        ).scalars())
+    if dirty.get("course"):
+        # kurs o'chirilsa uning guruhlari yashiriladi (models.LIVE_PARENTS)
+        teacher_ids.update(session.execute(
+            select(models.Group.teacher_id)
+            .where(models.Group.course_id.in_(dirty["course"]))
+            .execution_options(include_deleted=True)
+        ).scalars())
+    return teacher_ids
+
+
+# =====================================
+# To'lov deltalari
+# =====================================
+def _contribution(student_id, course_id, amount, status, sign: int) -> tuple:
+    """(student_id, course_id, payments_count, revenue, pending) ko'paytiruvchi sign bilan."""
+    amount = amount or 0
+    paid = status == "paid"
+    return (student_id, course_id, sign, sign * amount if paid else 0, 0 if paid else sign * amount)
+
+
+def _old_value(state, key):
+    history = state.attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(state.object, key)
+
+
+def _apply_deltas(session: Session, deltas: list) -> None:
+    pairs = sorted({(student_id, course_id) for student_id, course_id, *_ in deltas})
+    attribution = payment_groups(pairs=pairs)
+    teacher_of = dict(
+        (((student_id, course_id), teacher_id) for student_id, course_id, teacher_id in session.execute(
+            select(attribution.c.student_id, attribution.c.course_id, models.Group.teacher_id)
+            .join(models.Group, models.Group.id == attribution.c.group_id)
+        ))
+    )
+
+    totals = {}
+    for student_id, course_id, count, revenue, pending in deltas:
+        teacher_id = teacher_of.get((student_id, course_id))
+        if teacher_id is None:
+            continue   # guruhsiz to'lov hech kimga hisoblanmaydi
+        row = totals.setdefault(teacher_id, [0, 0, 0])
+        row[0] += count
+        row[1] += revenue
+        row[2] += pending
+
+    missing = []
+    Stats = models.TeacherStats
+    for teacher_id, (count, revenue, pending) in sorted(totals.items()):
+        if not (count or revenue or pending):
+            continue
+        updated = session.execute(
+            update(Stats)
+            .where(Stats.teacher_id == teacher_id)
+            .values(
+                payments_count=Stats.payments_count + count,
+                revenue=Stats.revenue + revenue,
+                pending=Stats.pending + pending,
+            )
+            .returning(Stats.teacher_id),
+            execution_options={"synchronize_session": False},
+        ).first()
+        if updated is None:
+            missing.append(teacher_id)   # hali hisoblanmagan — to'liq hisob kerak
+
+    if missing:
+        mark_dirty(session, teacher_ids=missing)
+
+
+# =====================================
+# ORM hooklari
+# =====================================
+def _deleted_at_changed(obj) -> bool:
+    return inspect(obj).attrs.deleted_at.history.has_changes()
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    deltas = session.info.setdefault("rollup_deltas", [])
+    teacher_ids, group_ids, student_ids, course_ids = set(), set(), set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, models.Payment):
+            deltas.append(_contribution(obj.student_id, obj.course_id, obj.amount, obj.status, 1))
+        elif isinstance(obj, models.Group):
+            group_ids.add(obj.id)
+        elif isinstance(obj, models.GroupStudent):
+            group_ids.add(obj.group_id)
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Payment):
+            state = inspect(obj)
+            deltas.append(_contribution(
+                *(_old_value(state, key) for key in ("student_id", "course_id", "amount", "status")), -1
+            ))
+        elif isinstance(obj, models.Group):
+            group_ids.add(obj.id)
+        elif isinstance(obj, models.GroupStudent):
+            group_ids.add(obj.group_id)
+
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        state = inspect(obj)
+        if isinstance(obj, models.Payment):
+            keys = ("student_id", "course_id", "amount", "status")
+            if any(state.attrs[key].history.has_changes() for key in keys):
+                deltas.append(_contribution(*(_old_value(state, key) for key in keys), -1))
+                deltas.append(_contribution(obj.student_id, obj.course_id, obj.amount, obj.status, 1))
+        elif isinstance(obj, models.Group):
+            group_ids.add(obj.id)
+            # o'qituvchi almashsa — eski o'qituvchi ham (after_flush'da tarix hali bor)
+            teacher_ids.update(t for t in state.attrs.teacher_id.history.deleted if t is not None)
+        elif isinstance(obj, models.GroupStudent):
+            group_ids.add(obj.group_id)
+            group_ids.update(g for g in state.attrs.group_id.history.deleted if g is not None)
+        elif isinstance(obj, models.Student) and _deleted_at_changed(obj):
+            student_ids.add(obj.id)
+        elif isinstance(obj, models.Course) and _deleted_at_changed(obj):
+            course_ids.add(obj.id)
+        elif isinstance(obj, models.Teacher) and _deleted_at_changed(obj):
+            teacher_ids.add(obj.id)
+
+    if teacher_ids or group_ids or student_ids or course_ids:
+        mark_dirty(session, teacher_ids, group_ids, student_ids, course_ids)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _flush_rollups(session):
+    session.flush()
+    deltas = session.info.pop("rollup_deltas", None)
+    if deltas:
+        _apply_deltas(session, deltas)
+
+    dirty = session.info.pop("rollup_dirty", None)
+    if dirty and any(dirty.values()):
+        # Shu commit bilan birga; worker qayta hisoblaydi
+        outbox.enqueue(session, REFRESH_TOPIC, {kind: sorted(ids) for kind, ids in dirty.items()})
+        session.flush()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("rollup_deltas", None)
+    session.info.pop("rollup_dirty", None)
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        print(datetime.utcnow().isoformat(), {"teachers": rebuild(db)})
+    finally:
+        db.close()
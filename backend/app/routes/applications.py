@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date, datetime, timedelta
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, dedup, cache, rollups, events, outbox
+from app.query_utils import keyset_page, dialect_insert, sync_page
 
 router = APIRouter(
     prefix="/applications",
@@ -16,13 +19,84 @@ router = APIRouter(
 # =====================================
 @router.get("/", response_model=List[schemas.ApplicationResponse])
 def get_applications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    return db.query(models.Application).order_by(
-        models.Application.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    query = db.query(models.Application).order_by(models.Application.created_at.desc())
+    return sync_page(query, models.Application, updated_since, response, sync_cursor, skip, limit)
+
+
+# =====================================
+# Applications inbox: filtrlar + facet sonlari + cursor pagination
+# =====================================
+@router.get("/inbox", response_model=schemas.ApplicationInbox)
+def get_applications_inbox(
+    status: Optional[str] = None,
+    course_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,     # shu kun ham kiradi
+    school: Optional[str] = None,
+    grade: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Arizalar inbox'i: bitta sahifa (keyset) va status/kurs bo'yicha facet sonlari.
+    Facetlar bitta GROUP BY (status, course_id) so'rovidan hisoblanadi; har bir
+    facet o'z o'lchamidagi filtrni hisobga olmaydi (tablar bo'sh qolmasin).
+    """
+    App = models.Application
+
+    conditions = []
+    if date_from:
+        conditions.append(App.created_at >= date_from)
+    if date_to:
+        conditions.append(App.created_at < date_to + timedelta(days=1))
+    if school:
+        conditions.append(App.school == school)
+    if grade:
+        conditions.append(App.grade == grade)
+
+    query = db.query(App).filter(*conditions)
+    if status:
+        query = query.filter(App.status == status)
+    if course_id:
+        query = query.filter(App.course_id == course_id)
+
+    rows, next_cursor = keyset_page(query, App, cursor, limit)
+
+    grouped = db.query(
+        App.status, App.course_id, func.count(App.id)
+    ).filter(*conditions).group_by(App.status, App.course_id).all()
+
+    # course_id NULL (kurssiz yoki kurs o'chirilgan) arizalar kurs facetiga kirmaydi
+    by_status, by_course = {}, {}
+    for row_status, row_course, count in grouped:
+        if row_status is not None and (not course_id or row_course == course_id):
+            by_status[row_status] = by_status.get(row_status, 0) + count
+        if row_course is not None and (not status or row_status == status):
+            by_course[row_course] = by_course.get(row_course, 0) + count
+
+    return {
+        "items": rows,
+        "facets": {"status": by_status, "course": by_course},
+        "total": sum(by_status.values()) if not status else by_status.get(status, 0),
+        "next_cursor": next_cursor,
+    }
+
+
+# =====================================
+# Duplicate clusters (arizalar + o'quvchilar)
+# =====================================
+@router.get("/duplicates", response_model=List[List[schemas.DuplicateMember]])
+def get_duplicate_clusters(db: Session = Depends(get_db)):
+    """Telefon yoki o'xshash ism (+ deyarli bir xil telefon) bo'yicha guruhlangan takrorlar."""
+    return dedup.cluster_duplicates(db)
 
 
 # =====================================
@@ -45,6 +119,7 @@ def create_application(
     db: Session = Depends(get_db)
 ):
     db_app = models.Application(**application.dict())
+    dedup.flag_application(db, db_app)
     db.add(db_app)
     db.commit()
     db.refresh(db_app)
@@ -72,35 +147,6 @@ def update_application(
     return db_app
 
 
-# =====================================
-# Helper: arizadan student yaratish
-# =====================================
-def _create_student_from_application(db: Session, db_app: models.Application) -> models.Student | None:
-    """
-    Ariza active bo'lganda student yaratadi.
-    Agar student allaqachon mavjud bo'lsa (phone bo'yicha), qaytaradi.
-    """
-    # Telefon raqami bo'yicha student allaqachon bormi?
-    existing = db.query(models.Student).filter(
-        models.Student.phone == db_app.phone
-    ).first()
-
-    if existing:
-        return existing  # Allaqachon bor, qayta yaratma
-
-    new_student = models.Student(
-        full_name=db_app.full_name,
-        phone=db_app.phone,
-        school=db_app.school or "—",
-        grade=db_app.grade or "—",
-        address=db_app.address,
-        email=None,  # Arizada email yo'q
-    )
-    db.add(new_student)
-    db.flush()  # ID olish uchun (commit qilmasdan)
-    return new_student
-
-
 # =====================================
 # Update application status (PATCH - qisman yangilash)
 # =====================================
@@ -112,7 +158,7 @@ def patch_application(
 ):
     """
     Arizani qisman yangilash.
-    Agar status 'active' ga o'zgarsa — student avtomatik yaratiladi.
+    Agar status 'active' ga o'zgarsa — student outbox worker tomonidan yaratiladi.
     """
     db_app = db.get(models.Application, application_id)
     if not db_app:
@@ -126,12 +172,12 @@ def patch_application(
 
     # updated_at ni avtomatik yangilash
     from datetime import datetime
-    setattr(db_app, "updated_at", datetime.now())
+    setattr(db_app, "updated_at", datetime.utcnow())
 
-    # ✅ ASOSIY LOGIKA: status active bo'lsa student yarat
+    # ✅ ASOSIY LOGIKA: status active bo'lsa student yarat (shu commit bilan navbatga)
     new_status = update.dict(exclude_unset=True).get("status")
     if new_status == "active" and old_status != "active":
-        _create_student_from_application(db, db_app)
+        outbox.enqueue(db, "application.activated", {"application_id": db_app.id})
 
     db.commit()
     db.refresh(db_app)
@@ -150,7 +196,7 @@ def update_application_status(
 ):
     """
     Faqat statusni yangilash uchun maxsus endpoint.
-    Agar status 'active' bo'lsa — student avtomatik yaratiladi.
+    Agar status 'active' bo'lsa — student outbox worker tomonidan yaratiladi.
     """
     db_app = db.get(models.Application, application_id)
     if not db_app:
@@ -167,11 +213,11 @@ def update_application_status(
     db_app.status = new_status
 
     from datetime import datetime
-    db_app.updated_at = datetime.now()
+    db_app.updated_at = datetime.utcnow()
 
-    # ✅ ASOSIY LOGIKA: status active bo'lsa student yarat
+    # ✅ ASOSIY LOGIKA: status active bo'lsa student yarat (shu commit bilan navbatga)
     if new_status == "active" and old_status != "active":
-        _create_student_from_application(db, db_app)
+        outbox.enqueue(db, "application.activated", {"application_id": db_app.id})
 
     db.commit()
     db.refresh(db_app)
@@ -179,6 +225,113 @@ def update_application_status(
     return db_app
 
 
+# =====================================
+# Bulk status update (butun guruhni birdaniga tasdiqlash)
+# =====================================
+@router.post("/bulk-status", response_model=schemas.ApplicationBulkStatusResult)
+def bulk_update_application_status(
+    payload: schemas.ApplicationBulkStatus,
+    db: Session = Depends(get_db)
+):
+    """
+    Ko'p arizaning statusini bitta tranzaksiyada o'zgartiradi.
+    status 'active' bo'lsa, yo'q o'quvchilar bitta
+    INSERT ... ON CONFLICT (phone) DO NOTHING bilan yaratiladi va
+    group_id berilsa, shu guruhga qo'shiladi.
+    """
+    if payload.status not in ["pending", "active", "rejected"]:
+        raise HTTPException(status_code=400, detail="Noto'g'ri status qiymati")
+
+    ids = list(set(payload.ids))
+    if not ids:
+        return {"updated": 0, "students_created": 0, "added_to_group": 0, "not_found": []}
+
+    if payload.group_id is not None and not db.get(models.Group, payload.group_id):
+        raise HTTPException(status_code=404, detail="Guruh topilmadi")
+
+    apps = db.query(models.Application).filter(models.Application.id.in_(ids)).all()
+    found_ids = [a.id for a in apps]
+    not_found = sorted(set(ids) - set(found_ids))
+
+    db.execute(
+        update(models.Application)
+        .where(models.Application.id.in_(found_ids))
+        .values(status=payload.status),
+        execution_options={"synchronize_session": False},
+    )
+    events.emit(db, "applications", "update", [
+        {"id": app_id, "status": payload.status} for app_id in found_ids
+    ])
+
+    students_created = 0
+    added_to_group = 0
+    created = []
+
+    if payload.status == "active":
+        # Bir xil telefon bir necha arizada bo'lsa — bitta o'quvchi
+        by_phone = {}
+        for a in apps:
+            if a.status != "active":
+                by_phone.setdefault(a.phone, {
+                    "full_name": a.full_name,
+                    "phone": a.phone,
+                    "school": a.school or "—",
+                    "grade": a.grade or "—",
+                    "address": a.address,
+                })
+
+        if by_phone:
+            created = db.execute(
+                dialect_insert(db, models.Student)
+                .values(list(by_phone.values()))
+                .on_conflict_do_nothing(
+                    index_elements=["phone"],
+                    index_where=models.Student.deleted_at.is_(None),   # uq_students_phone_live
+                )
+                .returning(models.Student.id, models.Student.full_name, models.Student.phone)
+            ).all()
+            students_created = len(created)
+
+        if payload.group_id is not None:
+            phones = list({a.phone for a in apps})
+            student_ids = [
+                row.id for row in db.query(models.Student.id).filter(
+                    models.Student.phone.in_(phones)
+                ).all()
+            ]
+            if student_ids:
+                added = db.execute(
+                    dialect_insert(db, models.GroupStudent)
+                    .values([
+                        {"group_id": payload.group_id, "student_id": sid}
+                        for sid in student_ids
+                    ])
+                    .on_conflict_do_nothing(index_elements=["group_id", "student_id"])
+                    .returning(models.GroupStudent.id, models.GroupStudent.student_id)
+                ).all()
+                added_to_group = len(added)
+                events.emit(db, "group_students", "insert", [
+                    {"id": row.id, "group_id": payload.group_id, "student_id": row.student_id}
+                    for row in added
+                ])
+                rollups.mark_dirty(db, group_ids=[payload.group_id])
+
+    db.commit()
+
+    # Core INSERT ORM eventlaridan o'tmaydi — takrorlar indeksini qo'lda yangilaymiz
+    for row in created:
+        dedup.index.add("student", row.id, row.full_name, row.phone)
+    if added_to_group:
+        cache.student_overview.invalidate(student_ids)
+
+    return {
+        "updated": len(found_ids),
+        "students_created": students_created,
+        "added_to_group": added_to_group,
+        "not_found": not_found,
+    }
+
+
 # =====================================
 # Delete application
 # =====================================
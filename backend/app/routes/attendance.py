@@ -0,0 +1,209 @@
+# app/routes/attendance.py
+
+from collections import defaultdict
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app import models, schemas, attendance, payroll
+
+router = APIRouter(
+    prefix="/attendance",
+    tags=["Attendance"]
+)
+
+
+# =====================================
+# Helperlar
+# =====================================
+def _get_group_or_404(db: Session, group_id: int) -> models.Group:
+    group = db.get(models.Group, group_id)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found"
+        )
+    return group
+
+
+def _check_month(month: str) -> str:
+    try:
+        return payroll.check_month(month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be in YYYY-MM format"
+        )
+
+
+def _get_or_create_month(db: Session, group_id: int, month: str) -> models.AttendanceMonth:
+    """Guruh-oy qatorini qulflab oladi (Postgres: SELECT ... FOR UPDATE)."""
+    query = db.query(models.AttendanceMonth).filter(
+        models.AttendanceMonth.group_id == group_id,
+        models.AttendanceMonth.month == month,
+    )
+    row = query.with_for_update().first()
+    if row:
+        return row
+
+    row = models.AttendanceMonth(group_id=group_id, month=month, slots=[], lessons=0,
+                                 expected=b"", present=b"")
+    try:
+        with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        # Parallel so'rov birinchi bo'lib yaratdi
+        row = query.with_for_update().one()
+    return row
+
+
+def _month_view(row: models.AttendanceMonth, month: str, group_id: int) -> dict:
+    if row is None:
+        return {"group_id": group_id, "month": month, "lesson_days": [], "students": []}
+
+    expected = attendance.to_int(row.expected)
+    present = attendance.to_int(row.present)
+
+    students = []
+    for i, student_id in enumerate(row.slots or []):
+        slot_expected = attendance.slot_bits(expected, i)
+        slot_present = attendance.slot_bits(present, i)
+        students.append({
+            "student_id": student_id,
+            "present_days": attendance.days_of(slot_present),
+            "absent_days": attendance.days_of(slot_expected & ~slot_present),
+            "rate": attendance.rate(slot_present.bit_count(), slot_expected.bit_count()),
+        })
+
+    return {
+        "group_id": group_id,
+        "month": month,
+        "lesson_days": attendance.days_of(row.lessons or 0),
+        "students": students,
+    }
+
+
+# =====================================
+# Mark attendance for a whole lesson
+# =====================================
+@router.put("/groups/{group_id}/lessons/{lesson_date}", response_model=schemas.AttendanceMonthResponse)
+def mark_lesson(
+    group_id: int,
+    lesson_date: date,
+    payload: schemas.AttendanceMark,
+    db: Session = Depends(get_db)
+):
+    """Bitta dars uchun butun guruh: present ro'yxatida yo'qlar — kelmagan."""
+    _get_group_or_404(db, group_id)
+
+    roster = [
+        row.student_id for row in db.query(models.GroupStudent.student_id).filter(
+            models.GroupStudent.group_id == group_id
+        ).all()
+    ]
+    unknown = set(payload.present) - set(roster)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Students not in this group: {sorted(unknown)}"
+        )
+
+    month = lesson_date.strftime("%Y-%m")
+    row = _get_or_create_month(db, group_id, month)
+    attendance.mark_lesson(row, lesson_date.day, roster, set(payload.present))
+    db.commit()
+
+    return _month_view(row, month, group_id)
+
+
+# =====================================
+# Remove a lesson
+# =====================================
+@router.delete("/groups/{group_id}/lessons/{lesson_date}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_lesson(
+    group_id: int,
+    lesson_date: date,
+    db: Session = Depends(get_db)
+):
+    row = db.query(models.AttendanceMonth).filter(
+        models.AttendanceMonth.group_id == group_id,
+        models.AttendanceMonth.month == lesson_date.strftime("%Y-%m"),
+    ).with_for_update().first()
+
+    if not row or not (row.lessons or 0) >> (lesson_date.day - 1) & 1:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found"
+        )
+
+    attendance.clear_lesson(row, lesson_date.day)
+    db.commit()
+    return None
+
+
+# =====================================
+# Group attendance for a month
+# =====================================
+@router.get("/groups/{group_id}", response_model=schemas.AttendanceMonthResponse)
+def get_group_attendance(
+    group_id: int,
+    month: str,   # "2026-02"
+    db: Session = Depends(get_db)
+):
+    month = _check_month(month)
+    _get_group_or_404(db, group_id)
+    row = db.query(models.AttendanceMonth).filter(
+        models.AttendanceMonth.group_id == group_id,
+        models.AttendanceMonth.month == month,
+    ).first()
+    return _month_view(row, month, group_id)
+
+
+# =====================================
+# Monthly attendance-rate report (group / teacher)
+# =====================================
+@router.get("/report", response_model=List[schemas.AttendanceReportRow])
+def get_attendance_report(
+    month: str,
+    by: str = "group",   # group | teacher
+    db: Session = Depends(get_db)
+):
+    """
+    Oy bo'yicha davomat foizi. Har bir guruh-oy qatori uchun bitmaplarning
+    bit_count() i olinadi; o'qituvchi kesimida guruhlar yig'indisi.
+    """
+    if by not in ("group", "teacher"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="by must be 'group' or 'teacher'"
+        )
+    month = _check_month(month)
+
+    rows = db.query(
+        models.AttendanceMonth, models.Group.teacher_id
+    ).join(
+        models.Group, models.Group.id == models.AttendanceMonth.group_id
+    ).filter(models.AttendanceMonth.month == month).all()
+
+    report = defaultdict(lambda: {"lessons": 0, "attended": 0, "expected": 0})
+    for row, teacher_id in rows:
+        key = row.group_id if by == "group" else teacher_id
+        attended, expected = attendance.totals(row)
+        item = report[key]
+        item["lessons"] += (row.lessons or 0).bit_count()
+        item["attended"] += attended
+        item["expected"] += expected
+
+    return [
+        {
+            "id": key,
+            "month": month,
+            **item,
+            "rate": attendance.rate(item["attended"], item["expected"]),
+        }
+        for key, item in sorted(report.items())
+    ]
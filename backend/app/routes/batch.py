@@ -0,0 +1,128 @@
+# app/routes/batch.py
+
+import asyncio
+import json
+import logging
+import os
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app import schemas
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"]
+)
+
+MAX_SUB_REQUESTS = 20
+MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "5"))
+SUB_REQUEST_TIMEOUT = float(os.getenv("BATCH_SUB_REQUEST_TIMEOUT", "10"))
+
+# Oqim (SSE / WebSocket) va ichma-ich batch — hech qachon tugamaydi yoki JSON emas
+DENIED_PREFIXES = ("/batch", "/events", "/docs", "/redoc", "/openapi.json")
+
+
+def _allowed_path(path: str) -> bool:
+    if not path.startswith("/"):
+        return False
+    url_path = urlsplit(path).path.rstrip("/") or "/"
+    return not any(
+        url_path == prefix or url_path.startswith(prefix + "/")
+        for prefix in DENIED_PREFIXES
+    )
+
+
+# =====================================
+# Helper: bitta sub-requestni ilova ichida bajarish (ASGI)
+# =====================================
+async def _dispatch(request: Request, path: str) -> tuple[int, object]:
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": [
+            (k, v) for k, v in request.scope.get("headers", [])
+            # accept-encoding: javob gzip bo'lsa JSON sifatida o'qib bo'lmaydi
+            if k not in (b"content-length", b"content-type", b"accept-encoding")
+        ],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    result = {"status": 500, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            result["body"] += message.get("body", b"")
+
+    try:
+        await asyncio.wait_for(request.app(scope, receive, send), SUB_REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("batch sub-request timed out: %s", path)
+        return 504, None
+    except Exception:
+        # Bitta sub-requestning xatosi qolganlarining natijasini yo'qotmasin
+        logger.exception("batch sub-request failed: %s", path)
+        return 500, None
+
+    try:
+        body = json.loads(result["body"]) if result["body"] else None
+    except ValueError:
+        body = result["body"].decode(errors="replace")
+
+    return result["status"], body
+
+
+# =====================================
+# Run several GET requests in one round trip
+# =====================================
+@router.post("/", response_model=schemas.BatchResponse)
+async def run_batch(batch: schemas.BatchRequest, request: Request):
+    """
+    Bir nechta GET so'rovni bitta HTTP chaqiruvda bajaradi (tarmoq round
+    trip'lari tejaladi). Sub-requestlar parallel (MAX_CONCURRENCY tagacha),
+    har biri o'z DB sessiyasida bajariladi — batch eng sekin chaqiruvcha
+    davom etadi. Biri xato bersa, faqat o'sha element 500, vaqti
+    (SUB_REQUEST_TIMEOUT) o'tsa — 504 bo'ladi.
+    """
+    if len(batch.requests) > MAX_SUB_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch may contain at most {MAX_SUB_REQUESTS} requests"
+        )
+
+    for sub in batch.requests:
+        if sub.method.upper() != "GET":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only GET sub-requests are allowed"
+            )
+        if not _allowed_path(sub.path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sub-request path: {sub.path}"
+            )
+
+    limit = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def run(sub):
+        async with limit:
+            code, body = await _dispatch(request, sub.path)
+        return {"id": sub.id, "status": code, "body": body}
+
+    return {"responses": await asyncio.gather(*(run(sub) for sub in batch.requests))}
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, blog_render
+from app.query_utils import sync_page
 
 router = APIRouter(
     prefix="/blogs",
@@ -13,18 +16,106 @@ router = APIRouter(
 
 
 # =====================================
-# Get all blogs (pagination)
+# Helperlar: slug va HTML (yozish vaqtida)
 # =====================================
-@router.get("/", response_model=List[schemas.BlogResponse])
+def _unique_slug(db: Session, base: str, blog_id: Optional[int] = None) -> str:
+    """base, base-2, base-3 ... — o'chirilgan (soft delete) bloglar ham hisobga olinadi."""
+    taken = set(db.execute(
+        select(models.Blog.slug)
+        .where(models.Blog.slug.like(f"{base}%"), models.Blog.id != (blog_id or 0))
+        .execution_options(include_deleted=True)
+    ).scalars())
+
+    slug, n = base, 2
+    while slug in taken:
+        slug, n = f"{base}-{n}", n + 1
+    return slug
+
+
+def _prepare(db: Session, db_blog: models.Blog, data: dict) -> None:
+    if "slug" in data or not db_blog.slug:
+        requested = data.pop("slug", None)
+        base = blog_render.slugify(requested or data.get("title") or db_blog.title)
+        db_blog.slug = _unique_slug(db, base, db_blog.id)
+
+    for key, value in data.items():
+        setattr(db_blog, key, value)
+
+    db_blog.content_html = blog_render.render(db_blog.content)
+    db_blog.youtube_id = blog_render.youtube_id(db_blog.youtube_link)
+
+
+def _summary_query(db: Session):
+    """Kartochka ustunlari; content / content_html SELECT qilinmaydi."""
+    return db.query(models.Blog).options(load_only(
+        models.Blog.id, models.Blog.title, models.Blog.slug, models.Blog.image,
+        models.Blog.youtube_link, models.Blog.youtube_id,
+        models.Blog.short_text, models.Blog.status,
+        models.Blog.created_at, models.Blog.updated_at,
+    ))
+
+
+# =====================================
+# Get all blogs (pagination, summary — to'liq matn /{id} va /slug/{slug} da)
+# =====================================
+@router.get("/", response_model=List[schemas.BlogSummary])
 def get_blogs(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    status: Optional[str] = None,
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    blogs = db.query(models.Blog).offset(skip).limit(limit).all()
+    query = _summary_query(db)
+    if status:
+        query = query.filter(models.Blog.status == status)
+    blogs = sync_page(query, models.Blog, updated_since, response, sync_cursor, skip, limit)
     return blogs
 
 
+# =====================================
+# Blog cards (published, yangilari birinchi)
+# =====================================
+@router.get("/summary", response_model=List[schemas.BlogSummary])
+def get_blog_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    status: Optional[str] = "published",
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
+    db: Session = Depends(get_db)
+):
+    """(status, created_at) indeksi bo'yicha."""
+    query = _summary_query(db)
+    if status:
+        query = query.filter(models.Blog.status == status)
+
+    query = query.order_by(models.Blog.created_at.desc(), models.Blog.id.desc())
+    return sync_page(query, models.Blog, updated_since, response, sync_cursor, skip, limit)
+
+
+# =====================================
+# Get blog by slug
+# =====================================
+@router.get("/slug/{slug}", response_model=schemas.BlogResponse)
+def get_blog_by_slug(
+    slug: str,
+    db: Session = Depends(get_db)
+):
+    blog = db.query(models.Blog).filter(models.Blog.slug == slug).first()
+
+    if not blog:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Blog not found"
+        )
+
+    return blog
+
+
 # =====================================
 # Get blog by ID
 # =====================================
@@ -56,7 +147,8 @@ def create_blog(
     blog: schemas.BlogCreate,
     db: Session = Depends(get_db)
 ):
-    db_blog = models.Blog(**blog.dict())
+    db_blog = models.Blog()
+    _prepare(db, db_blog, blog.dict())
 
     db.add(db_blog)
 
@@ -90,10 +182,7 @@ def update_blog(
             detail="Blog not found"
         )
 
-    update_data = blog_update.dict(exclude_unset=True)
-
-    for key, value in update_data.items():
-        setattr(db_blog, key, value)
+    _prepare(db, db_blog, blog_update.dict(exclude_unset=True))
 
     try:
         db.commit()
@@ -127,7 +216,7 @@ def delete_blog(
             detail="Blog not found"
         )
 
-    db.delete(blog)
+    blog.soft_delete()
     db.commit()
 
     return None
\ No newline at end of file
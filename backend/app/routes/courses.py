@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, cache, snapshot, rollups
+from app.query_utils import bulk_soft_delete, sync_page
 
 router = APIRouter(
     prefix="/courses",
@@ -16,11 +18,14 @@ router = APIRouter(
 # =====================================
 @router.get("/", response_model=List[schemas.CourseResponse])
 def get_courses(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    courses = db.query(models.Course).offset(skip).limit(limit).all()
+    courses = sync_page(db.query(models.Course), models.Course, updated_since, response, sync_cursor, skip, limit)
     return courses
 
 
@@ -89,6 +94,22 @@ def update_course(
     return db_course
 
 
+# =====================================
+# Bulk delete courses
+# =====================================
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_courses(
+    payload: schemas.BulkDeleteRequest,
+    db: Session = Depends(get_db)
+):
+    """Bitta UPDATE ... SET deleted_at WHERE id IN (...); jismoniy o'chirish — app/purge.py."""
+    rollups.mark_dirty(db, course_ids=payload.ids)
+    deleted = bulk_soft_delete(db, models.Course, payload.ids)
+    cache.student_overview.clear()
+    snapshot.store.mark_stale(["courses"])
+    return {"deleted": deleted}
+
+
 # =====================================
 # Delete course
 # =====================================
@@ -105,7 +126,7 @@ def delete_course(course_id: int, db: Session = Depends(get_db)):
             detail="Course not found"
         )
 
-    db.delete(course)
+    course.soft_delete()
     db.commit()
 
     return None
\ No newline at end of file
@@ -1,23 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app import models, schemas
+from app.query_utils import expand_options, sync_page
 
 router = APIRouter(
     prefix="/enrollments",
     tags=["Enrollments"]
 )
 
+EXPANDABLE = {
+    "student": models.Enrollment.student,
+    "course": models.Enrollment.course,
+}
+
 
 # =====================================
 # Get all enrollments
 # =====================================
-@router.get("/", response_model=List[schemas.EnrollmentResponse])
-def get_enrollments(db: Session = Depends(get_db)):
-    return db.query(models.Enrollment).all()
+@router.get("/", response_model=List[schemas.EnrollmentExpanded])
+def get_enrollments(
+    response: Response,
+    expand: Optional[str] = None,   # "student,course"
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
+    db: Session = Depends(get_db)
+):
+    query = db.query(models.Enrollment).options(*expand_options(expand, EXPANDABLE))
+    return sync_page(query, models.Enrollment, updated_since, response, sync_cursor)
 
 
 # =====================================
@@ -0,0 +1,108 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app import events
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+HEARTBEAT_SECONDS = 15
+
+
+def _parse_topics(topics: Optional[str]) -> set:
+    if not topics:
+        return set(events.TOPICS)
+    requested = {t.strip() for t in topics.split(",") if t.strip()}
+    unknown = requested - events.TOPICS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown topics: {sorted(unknown)}; available: {sorted(events.TOPICS)}"
+        )
+    return requested
+
+
+# =====================================
+# Server-Sent Events
+# =====================================
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = None,   # "applications,payments"; bo'sh — hammasi
+):
+    """
+    text/event-stream: har bir event — {"topic", "op", "id", "data", "seq", ...}.
+    Qayta ulanganda brauzer Last-Event-ID yuboradi — bufferdagi o'tkazib
+    yuborilgan eventlar avval jo'natiladi.
+    """
+    wanted = _parse_topics(topics)
+    try:
+        last_seq = int(request.headers.get("last-event-id", "0"))
+    except ValueError:
+        last_seq = 0
+
+    async def generate():
+        token, missed = events.broadcaster.subscribe(last_seq)
+        _, queue = token
+        try:
+            yield "retry: 3000\n\n"
+            for item in missed:
+                if item["topic"] in wanted:
+                    yield f"id: {item['seq']}\nevent: {item['op']}\ndata: {json.dumps(item)}\n\n"
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if item["topic"] in wanted:
+                    yield f"id: {item['seq']}\nevent: {item['op']}\ndata: {json.dumps(item)}\n\n"
+        finally:
+            events.broadcaster.unsubscribe(token)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# =====================================
+# WebSocket
+# =====================================
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, topics: Optional[str] = None):
+    try:
+        wanted = _parse_topics(topics)
+    except HTTPException as exc:
+        await websocket.close(code=1008, reason=str(exc.detail))
+        return
+
+    await websocket.accept()
+    token, _ = events.broadcaster.subscribe()
+    _, queue = token
+
+    async def pump():
+        while True:
+            item = await queue.get()
+            if item["topic"] in wanted:
+                await websocket.send_json(item)
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Mijoz xabarlari e'tiborsiz; receive uzilishni aniqlash uchun
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        events.broadcaster.unsubscribe(token)
@@ -1,42 +1,58 @@
 # app/routes/group_students.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, cache, rollups, events, sync
+from app.query_utils import expand_options, dialect_insert, sync_page
 
 router = APIRouter(
     prefix="/group-students",
     tags=["Group Students"]
 )
 
+EXPANDABLE = {
+    "group": models.GroupStudent.group,
+    "student": models.GroupStudent.student,
+}
+
 
 # =====================================
 # Get all group-student relations
 # =====================================
-@router.get("/", response_model=List[schemas.GroupStudentResponse])
+@router.get("/", response_model=List[schemas.GroupStudentExpanded])
 def get_group_students(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    expand: Optional[str] = None,   # "group,student"
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
     """Barcha guruh-student bog'lanishlarini olish"""
-    return db.query(models.GroupStudent).offset(skip).limit(limit).all()
+    query = db.query(models.GroupStudent).options(*expand_options(expand, EXPANDABLE))
+    return sync_page(query, models.GroupStudent, updated_since, response, sync_cursor, skip, limit)
 
 
 # =====================================
 # Get students by group ID
 # =====================================
-@router.get("/group/{group_id}", response_model=List[schemas.GroupStudentResponse])
+@router.get("/group/{group_id}", response_model=List[schemas.GroupStudentExpanded])
 def get_group_students_by_group(
     group_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Guruh ID bo'yicha studentlarni olish"""
-    return db.query(models.GroupStudent).filter(
+    return db.query(models.GroupStudent).options(
+        *expand_options(expand, EXPANDABLE)
+    ).filter(
         models.GroupStudent.group_id == group_id
     ).all()
 
@@ -44,13 +60,16 @@ def get_group_students_by_group(
 # =====================================
 # Get groups by student ID
 # =====================================
-@router.get("/student/{student_id}", response_model=List[schemas.GroupStudentResponse])
+@router.get("/student/{student_id}", response_model=List[schemas.GroupStudentExpanded])
 def get_student_groups(
     student_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Student ID bo'yicha guruhlarni olish"""
-    return db.query(models.GroupStudent).filter(
+    return db.query(models.GroupStudent).options(
+        *expand_options(expand, EXPANDABLE)
+    ).filter(
         models.GroupStudent.student_id == student_id
     ).all()
 
@@ -114,6 +133,116 @@ def add_student_to_group(
     return db_group_student
 
 
+# =====================================
+# Helperlar: set-based qo'shish / olib tashlash
+# =====================================
+def _get_group_or_404(db: Session, group_id: int) -> models.Group:
+    group = db.get(models.Group, group_id)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Group {group_id} not found"
+        )
+    return group
+
+
+def _insert_members(db: Session, group_id: int, student_ids: list) -> int:
+    """INSERT ... ON CONFLICT (group_id, student_id) DO NOTHING — yangi qo'shilganlar soni."""
+    if not student_ids:
+        return 0
+    inserted = db.execute(
+        dialect_insert(db, models.GroupStudent)
+        .values([{"group_id": group_id, "student_id": sid} for sid in student_ids])
+        .on_conflict_do_nothing(index_elements=["group_id", "student_id"])
+        .returning(models.GroupStudent.id, models.GroupStudent.student_id)
+    ).all()
+    events.emit(db, "group_students", "insert", [
+        {"id": row.id, "group_id": group_id, "student_id": row.student_id} for row in inserted
+    ])
+    return len(inserted)
+
+
+def _delete_members(db: Session, group_id: int, student_ids: list) -> list:
+    """DELETE ... WHERE student_id IN (...) — olib tashlangan student_id'lar."""
+    if not student_ids:
+        return []
+    deleted = db.execute(
+        delete(models.GroupStudent)
+        .where(
+            models.GroupStudent.group_id == group_id,
+            models.GroupStudent.student_id.in_(student_ids),
+        )
+        .returning(models.GroupStudent.id, models.GroupStudent.student_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    events.emit(db, "group_students", "delete", [
+        {"id": row.id, "group_id": group_id, "student_id": row.student_id} for row in deleted
+    ])
+    sync.record(db, "group_students", [row.id for row in deleted])
+    return [row.student_id for row in deleted]
+
+
+# =====================================
+# Bulk add / remove students
+# =====================================
+@router.post("/bulk", response_model=schemas.GroupStudentBulkResult)
+def bulk_update_group_students(
+    payload: schemas.GroupStudentBulk,
+    db: Session = Depends(get_db)
+):
+    """Bir nechta studentni guruhga qo'shish va/yoki olib tashlash (bitta tranzaksiya)"""
+    _get_group_or_404(db, payload.group_id)
+
+    add_ids = list(set(payload.add))
+    existing = [
+        row.id for row in db.query(models.Student.id).filter(
+            models.Student.id.in_(add_ids)
+        ).all()
+    ] if add_ids else []
+
+    added = _insert_members(db, payload.group_id, existing)
+    removed = _delete_members(db, payload.group_id, list(set(payload.remove)))
+    rollups.mark_dirty(db, group_ids=[payload.group_id])
+    db.commit()
+
+    # Core INSERT/DELETE ORM eventlaridan o'tmaydi
+    cache.student_overview.invalidate(existing + removed)
+
+    return {
+        "added": added,
+        "removed": len(removed),
+        "not_found": sorted(set(add_ids) - set(existing)),
+    }
+
+
+# =====================================
+# Transfer students between groups
+# =====================================
+@router.post("/transfer", response_model=schemas.GroupStudentTransferResult)
+def transfer_group_students(
+    payload: schemas.GroupStudentTransfer,
+    db: Session = Depends(get_db)
+):
+    """Studentlarni bir guruhdan boshqasiga ko'chirish: bitta DELETE + bitta INSERT"""
+    if payload.from_group_id == payload.to_group_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target groups must differ"
+        )
+
+    _get_group_or_404(db, payload.from_group_id)
+    _get_group_or_404(db, payload.to_group_id)
+
+    moved = _delete_members(db, payload.from_group_id, list(set(payload.student_ids)))
+    added = _insert_members(db, payload.to_group_id, moved)
+    rollups.mark_dirty(db, group_ids=[payload.from_group_id, payload.to_group_id])
+    db.commit()
+
+    cache.student_overview.invalidate(moved)
+
+    return {"moved": len(moved), "added": added}
+
+
 # =====================================
 # Remove student from group
 # =====================================
@@ -1,37 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, case, and_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, cache, rollups
+from app.query_utils import expand_options, bulk_soft_delete, sync_page
 
 router = APIRouter(
     prefix="/groups",
     tags=["Groups"]
 )
 
+EXPANDABLE = {
+    "course": models.Group.course,
+    "teacher": models.Group.teacher,
+}
+
 
 # =====================================
 # Get all groups
 # =====================================
-@router.get("/", response_model=List[schemas.GroupResponse])
+@router.get("/", response_model=List[schemas.GroupExpanded])
 def get_groups(
+    response: Response,
+    expand: Optional[str] = None,   # "course,teacher"
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    groups = db.query(models.Group).all()
+    query = db.query(models.Group).options(*expand_options(expand, EXPANDABLE))
+    groups = sync_page(query, models.Group, updated_since, response, sync_cursor)
     return groups
 
 
 # =====================================
 # Get group by ID
 # =====================================
-@router.get("/{group_id}", response_model=schemas.GroupResponse)
+@router.get("/{group_id}", response_model=schemas.GroupExpanded)
 def get_group(
     group_id: int,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    group = db.get(models.Group, group_id)
+    group = db.get(
+        models.Group, group_id,
+        options=expand_options(expand, EXPANDABLE)
+    )
 
     if not group:
         raise HTTPException(
@@ -42,6 +59,184 @@ def get_group(
     return group
 
 
+# =====================================
+# Get group with course, teacher and roster
+# =====================================
+@router.get("/{group_id}/detail", response_model=schemas.GroupDetailResponse)
+def get_group_detail(
+    group_id: int,
+    month: Optional[str] = None,   # "2026-02" — o'quvchilarning shu oydagi to'lov holati
+    db: Session = Depends(get_db)
+):
+    """
+    Guruh sahifasi uchun bitta so'rov: guruh + kurs + o'qituvchi (JOIN) va
+    o'quvchilar ro'yxati (SELECT IN). month berilsa, to'lovlar bitta
+    aggregat so'rov bilan qo'shiladi.
+    """
+    group = db.query(models.Group).options(
+        joinedload(models.Group.course),
+        joinedload(models.Group.teacher),
+        selectinload(models.Group.students).joinedload(models.GroupStudent.student),
+    ).filter(models.Group.id == group_id).first()
+
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found"
+        )
+
+    # O'chirilgan (soft delete) o'quvchilar student=None bo'lib keladi
+    students = [
+        {"id": gs.id, "student_id": gs.student_id, "student": gs.student}
+        for gs in group.students if gs.student is not None
+    ]
+
+    if month:
+        student_ids = [gs["student_id"] for gs in students]
+        paid_rows = db.query(
+            models.Payment.student_id,
+            func.sum(case((models.Payment.status == "paid", models.Payment.amount), else_=0)),
+        ).filter(
+            models.Payment.student_id.in_(student_ids),
+            models.Payment.course_id == group.course_id,
+            models.Payment.month == month,
+        ).group_by(models.Payment.student_id).all() if student_ids else []
+
+        paid = {student_id: total or 0 for student_id, total in paid_rows}
+        for gs in students:
+            amount = paid.get(gs["student_id"], 0)
+            gs["paid_amount"] = amount
+            if amount >= group.course.price:
+                gs["payment_status"] = "paid"
+            elif amount > 0:
+                gs["payment_status"] = "partial"
+            else:
+                gs["payment_status"] = "unpaid"
+
+    return {
+        "id": group.id,
+        "name": group.name,
+        "course_id": group.course_id,
+        "teacher_id": group.teacher_id,
+        "created_at": group.created_at,
+        "updated_at": group.updated_at,
+        "course": group.course,
+        "teacher": group.teacher,
+        "students": students,
+        "month": month,
+    }
+
+
+# =====================================
+# Helperlar: "2026-02" formatidagi oylar
+# =====================================
+def _parse_month(value: str) -> int:
+    """"2026-02" -> oy indeksi (yil * 12 + oy - 1)"""
+    try:
+        year, month = map(int, value.split("-"))
+        date(year, month, 1)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be in YYYY-MM format"
+        )
+    return year * 12 + month - 1
+
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _month_range(start: str, end: str) -> list:
+    first, last = _parse_month(start), _parse_month(end)
+    if not 0 <= last - first < 36:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month range must contain between 1 and 36 months"
+        )
+    return [_format_month(i) for i in range(first, last + 1)]
+
+
+# =====================================
+# Payments matrix (o'quvchilar × oylar)
+# =====================================
+@router.get("/{group_id}/payments-matrix", response_model=schemas.PaymentsMatrix)
+def get_group_payments_matrix(
+    group_id: int,
+    from_month: Optional[str] = Query(None, alias="from"),   # "2026-01"
+    to_month: Optional[str] = Query(None, alias="to"),       # "2026-12"
+    db: Session = Depends(get_db)
+):
+    """
+    Guruh o'quvchilari bo'yicha har oy to'langan/kutilayotgan summalar.
+    Bitta aggregat so'rov: group_students LEFT JOIN payments (guruh kursi, oy oralig'i)
+    GROUP BY student, month. Standart oraliq — joriy oy bilan tugaydigan 12 oy.
+    """
+    group = db.query(models.Group).options(
+        joinedload(models.Group.course)
+    ).filter(models.Group.id == group_id).first()
+
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Group not found"
+        )
+
+    if not to_month:
+        to_month = date.today().strftime("%Y-%m")
+    if not from_month:
+        from_month = _format_month(_parse_month(to_month) - 11)
+
+    months = _month_range(from_month, to_month)
+
+    Payment = models.Payment
+    rows = db.query(
+        models.Student.id,
+        models.Student.full_name,
+        Payment.month,
+        func.sum(case((Payment.status == "paid", Payment.amount), else_=0)),
+        func.sum(case((Payment.status != "paid", Payment.amount), else_=0)),
+    ).join(
+        models.GroupStudent, models.GroupStudent.student_id == models.Student.id
+    ).outerjoin(
+        Payment, and_(
+            Payment.student_id == models.Student.id,
+            Payment.course_id == group.course_id,
+            Payment.month >= months[0],
+            Payment.month <= months[-1],
+        )
+    ).filter(
+        models.GroupStudent.group_id == group_id
+    ).group_by(
+        models.Student.id, models.Student.full_name, Payment.month
+    ).order_by(models.Student.full_name, models.Student.id).all()
+
+    column = {m: j for j, m in enumerate(months)}
+    row_of = {}
+    students, paid, pending = [], [], []
+
+    for student_id, full_name, month, paid_sum, pending_sum in rows:
+        if student_id not in row_of:
+            row_of[student_id] = len(students)
+            students.append({"id": student_id, "full_name": full_name})
+            paid.append([0] * len(months))
+            pending.append([0] * len(months))
+        if month in column:
+            i, j = row_of[student_id], column[month]
+            paid[i][j] = paid_sum or 0
+            pending[i][j] = pending_sum or 0
+
+    return {
+        "group_id": group.id,
+        "course_id": group.course_id,
+        "course_price": group.course.price,
+        "months": months,
+        "students": students,
+        "paid": paid,
+        "pending": pending,
+    }
+
+
 # =====================================
 # Create group
 # =====================================
@@ -104,6 +299,21 @@ def update_group(
     return db_group
 
 
+# =====================================
+# Bulk delete groups
+# =====================================
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_groups(
+    payload: schemas.BulkDeleteRequest,
+    db: Session = Depends(get_db)
+):
+    """Bitta UPDATE ... SET deleted_at WHERE id IN (...); jismoniy o'chirish — app/purge.py."""
+    rollups.mark_dirty(db, group_ids=payload.ids)
+    deleted = bulk_soft_delete(db, models.Group, payload.ids)
+    cache.student_overview.clear()
+    return {"deleted": deleted}
+
+
 # =====================================
 # Delete group
 # =====================================
@@ -123,7 +333,7 @@ def delete_group(
             detail="Group not found"
         )
 
-    db.delete(group)
+    group.soft_delete()
     db.commit()
 
     return None
\ No newline at end of file
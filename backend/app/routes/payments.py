@@ -1,36 +1,48 @@
 # app/routes/payments.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, outbox
+from app.query_utils import expand_options, sync_page
 
 router = APIRouter(
     prefix="/payments",
     tags=["Payments"]
 )
 
+EXPANDABLE = {
+    "student": models.Payment.student,
+    "course": models.Payment.course,
+}
+
 
 # =====================================
 # Get all payments (filter by student)
 # =====================================
-@router.get("/", response_model=List[schemas.PaymentResponse])
+@router.get("/", response_model=List[schemas.PaymentExpanded])
 def get_payments(
+    response: Response,
     student_id: int = None,
     course_id: int = None,
     month: str = None,
+    expand: Optional[str] = None,   # "student,course"
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Payment)
+    query = db.query(models.Payment).options(*expand_options(expand, EXPANDABLE))
     if student_id:
         query = query.filter(models.Payment.student_id == student_id)
     if course_id:
         query = query.filter(models.Payment.course_id == course_id)
     if month:
         query = query.filter(models.Payment.month == month)
-    return query.order_by(models.Payment.created_at.desc()).all()
+    query = query.order_by(models.Payment.created_at.desc())
+    return sync_page(query, models.Payment, updated_since, response, sync_cursor)
 
 
 # =====================================
@@ -90,9 +102,16 @@ def get_student_courses_with_payments(
 # =====================================
 # Get payment by ID
 # =====================================
-@router.get("/{payment_id}", response_model=schemas.PaymentResponse)
-def get_payment(payment_id: int, db: Session = Depends(get_db)):
-    payment = db.get(models.Payment, payment_id)
+@router.get("/{payment_id}", response_model=schemas.PaymentExpanded)
+def get_payment(
+    payment_id: int,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    payment = db.get(
+        models.Payment, payment_id,
+        options=expand_options(expand, EXPANDABLE)
+    )
     if not payment:
         raise HTTPException(status_code=404, detail="To'lov topilmadi")
     return payment
@@ -133,6 +152,9 @@ def create_payment(
 
     db_payment = models.Payment(**payment.dict())
     db.add(db_payment)
+    if db_payment.status == "paid":
+        db.flush()
+        outbox.enqueue(db, "payment.paid", {"payment_id": db_payment.id})
     db.commit()
     db.refresh(db_payment)
     return db_payment
@@ -151,11 +173,15 @@ def update_payment(
     if not payment:
         raise HTTPException(status_code=404, detail="To'lov topilmadi")
 
+    was_paid = payment.status == "paid"
     for key, value in update.dict(exclude_unset=True).items():
         setattr(payment, key, value)
 
     from datetime import datetime
-    payment.updated_at = datetime.now()
+    payment.updated_at = datetime.utcnow()
+
+    if payment.status == "paid" and not was_paid:
+        outbox.enqueue(db, "payment.paid", {"payment_id": payment.id})
 
     db.commit()
     db.refresh(payment)
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+
+from app.database import get_db
+from app import models, schemas, payroll
+
+router = APIRouter(
+    prefix="/payroll",
+    tags=["Payroll"]
+)
+
+
+def _check_month(month: str) -> str:
+    try:
+        return payroll.check_month(month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Month must be in YYYY-MM format"
+        )
+
+
+# =====================================
+# Payroll rules (har bir o'qituvchi uchun)
+# =====================================
+@router.get("/rules", response_model=List[schemas.PayrollRuleResponse])
+def get_payroll_rules(db: Session = Depends(get_db)):
+    return db.query(models.PayrollRule).order_by(models.PayrollRule.teacher_id).all()
+
+
+@router.put("/rules/{teacher_id}", response_model=schemas.PayrollRuleResponse)
+def set_payroll_rule(
+    teacher_id: int,
+    rule: schemas.PayrollRuleCreate,
+    db: Session = Depends(get_db)
+):
+    if not db.get(models.Teacher, teacher_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teacher not found"
+        )
+
+    db_rule = db.query(models.PayrollRule).filter(
+        models.PayrollRule.teacher_id == teacher_id
+    ).first()
+    if db_rule is None:
+        db_rule = models.PayrollRule(teacher_id=teacher_id)
+        db.add(db_rule)
+
+    for key, value in rule.dict().items():
+        setattr(db_rule, key, value)
+
+    db.commit()
+    db.refresh(db_rule)
+
+    return db_rule
+
+
+@router.delete("/rules/{teacher_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_payroll_rule(teacher_id: int, db: Session = Depends(get_db)):
+    db_rule = db.query(models.PayrollRule).filter(
+        models.PayrollRule.teacher_id == teacher_id
+    ).first()
+
+    if not db_rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Payroll rule not found"
+        )
+
+    db.delete(db_rule)
+    db.commit()
+    return None
+
+
+# =====================================
+# Preview (saqlanmaydi)
+# =====================================
+@router.get("/preview", response_model=List[schemas.PayrollItemResponse])
+def preview_payroll(month: str, db: Session = Depends(get_db)):
+    return payroll.compute(db, _check_month(month))
+
+
+# =====================================
+# Close month (run yaratish, idempotent)
+# =====================================
+@router.post("/runs", response_model=schemas.PayrollRunDetail, status_code=status.HTTP_201_CREATED)
+def close_payroll_month(
+    month: str,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """Natija oxirgi run bilan bir xil bo'lsa — o'sha run (200), aks holda yangi revision (201)."""
+    month = _check_month(month)
+    try:
+        run, created = payroll.close_month(db, month)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Payroll for this month is being closed concurrently"
+        )
+
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return run
+
+
+@router.get("/runs", response_model=List[schemas.PayrollRunResponse])
+def get_payroll_runs(
+    month: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(models.PayrollRun)
+    if month:
+        query = query.filter(models.PayrollRun.month == _check_month(month))
+    return query.order_by(models.PayrollRun.month.desc(), models.PayrollRun.revision.desc()).all()
+
+
+@router.get("/runs/{run_id}", response_model=schemas.PayrollRunDetail)
+def get_payroll_run(run_id: int, db: Session = Depends(get_db)):
+    run = db.query(models.PayrollRun).options(
+        selectinload(models.PayrollRun.items)
+    ).filter(models.PayrollRun.id == run_id).first()
+
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Payroll run not found"
+        )
+
+    return run
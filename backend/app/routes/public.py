@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app import snapshot
+
+router = APIRouter(
+    prefix="/public",
+    tags=["Public"]
+)
+
+
+# =====================================
+# Public snapshot (courses / teachers / vacancies / blogs)
+# =====================================
+@router.get("/{name}")
+def get_public_snapshot(name: str, request: Request):
+    """
+    Bazaga murojaat qilmaydi: xotiradagi tayyor JSON (gzip) qaytariladi.
+    If-None-Match mos kelsa — 304.
+    """
+    if name not in snapshot.BUILDERS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found"
+        )
+
+    blob = snapshot.store.get(name)
+    headers = {
+        "ETag": blob.etag,
+        "Cache-Control": "public, max-age=60",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if blob.etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=blob.gzipped, media_type="application/json", headers=headers)
+
+    return Response(content=blob.body, media_type="application/json", headers=headers)
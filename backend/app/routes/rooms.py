@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import List
+
+from app.database import get_db
+from app import models, schemas, scheduling
+
+router = APIRouter(
+    prefix="/rooms",
+    tags=["Rooms"]
+)
+
+
+def _get_room_or_404(db: Session, room_id: int) -> models.Room:
+    room = db.get(models.Room, room_id)
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found"
+        )
+    return room
+
+
+# =====================================
+# Get all rooms
+# =====================================
+@router.get("/", response_model=List[schemas.RoomResponse])
+def get_rooms(db: Session = Depends(get_db)):
+    return db.query(models.Room).order_by(models.Room.name).all()
+
+
+# =====================================
+# Get room by ID
+# =====================================
+@router.get("/{room_id}", response_model=schemas.RoomResponse)
+def get_room(room_id: int, db: Session = Depends(get_db)):
+    return _get_room_or_404(db, room_id)
+
+
+# =====================================
+# Room timetable
+# =====================================
+@router.get("/{room_id}/timetable", response_model=List[schemas.TimetableEntry])
+def get_room_timetable(room_id: int, db: Session = Depends(get_db)):
+    _get_room_or_404(db, room_id)
+    return scheduling.timetable(db, room_id=room_id)
+
+
+# =====================================
+# Create room
+# =====================================
+@router.post(
+    "/",
+    response_model=schemas.RoomResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def create_room(room: schemas.RoomCreate, db: Session = Depends(get_db)):
+    db_room = models.Room(**room.dict())
+    db.add(db_room)
+
+    try:
+        db.commit()
+        db.refresh(db_room)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Room with this name already exists"
+        )
+
+    return db_room
+
+
+# =====================================
+# Update room
+# =====================================
+@router.put("/{room_id}", response_model=schemas.RoomResponse)
+def update_room(
+    room_id: int,
+    room_update: schemas.RoomUpdate,
+    db: Session = Depends(get_db)
+):
+    db_room = _get_room_or_404(db, room_id)
+
+    for key, value in room_update.dict(exclude_unset=True).items():
+        setattr(db_room, key, value)
+
+    try:
+        db.commit()
+        db.refresh(db_room)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Room with this name already exists"
+        )
+
+    return db_room
+
+
+# =====================================
+# Delete room (jadvaldagi room_id -> NULL)
+# =====================================
+@router.delete(
+    "/{room_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def delete_room(room_id: int, db: Session = Depends(get_db)):
+    room = _get_room_or_404(db, room_id)
+    db.delete(room)
+    db.commit()
+    return None
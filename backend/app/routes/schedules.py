@@ -0,0 +1,222 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.database import get_db
+from app import models, schemas, scheduling
+
+router = APIRouter(
+    prefix="/schedules",
+    tags=["Schedules"]
+)
+
+
+# =====================================
+# Helperlar
+# =====================================
+def _group_teachers(db: Session, group_ids: set) -> dict:
+    """group_id -> teacher_id; topilmagan guruh bo'lsa 404."""
+    rows = db.query(models.Group.id, models.Group.teacher_id).filter(
+        models.Group.id.in_(group_ids)
+    ).all()
+    teachers = {row.id: row.teacher_id for row in rows}
+
+    missing = group_ids - set(teachers)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Groups not found: {sorted(missing)}"
+        )
+    return teachers
+
+
+def _check_rooms(db: Session, room_ids: set) -> None:
+    room_ids.discard(None)
+    if not room_ids:
+        return
+    found = {row.id for row in db.query(models.Room.id).filter(models.Room.id.in_(room_ids)).all()}
+    missing = room_ids - found
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rooms not found: {sorted(missing)}"
+        )
+
+
+def _to_slot(item: schemas.ScheduleCreate, teacher_id: int, schedule_id: Optional[int] = None):
+    return scheduling.Slot(
+        schedule_id, item.group_id, teacher_id, item.room_id, item.weekday,
+        scheduling.to_minutes(item.start_time), scheduling.to_minutes(item.end_time)
+    )
+
+
+def _ensure_free(db: Session, item: schemas.ScheduleCreate, schedule_id: Optional[int] = None):
+    """
+    Yangi / o'zgargan dars mavjud jadval bilan kesishsa — 409. Qulf commitgacha
+    turadi: parallel so'rov shu o'qituvchi / xona uchun tekshiruvni kutadi.
+    """
+    teacher_id = _group_teachers(db, {item.group_id})[item.group_id]
+    _check_rooms(db, {item.room_id})
+
+    slot = _to_slot(item, teacher_id, schedule_id)
+    scheduling.lock_resources(db, slot)
+    index = scheduling.build_index(scheduling.overlapping_slots(db, slot))
+    conflicts = scheduling.conflicts_for(index, slot)
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=[schemas.ScheduleConflict(**c).model_dump(mode="json") for c in conflicts]
+        )
+
+
+def _get_schedule_or_404(db: Session, schedule_id: int) -> models.GroupSchedule:
+    schedule = db.get(models.GroupSchedule, schedule_id)
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found"
+        )
+    return schedule
+
+
+# =====================================
+# Get schedules (optionally by group)
+# =====================================
+@router.get("/", response_model=List[schemas.ScheduleResponse])
+def get_schedules(
+    group_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(models.GroupSchedule)
+    if group_id is not None:
+        query = query.filter(models.GroupSchedule.group_id == group_id)
+    return query.order_by(models.GroupSchedule.weekday, models.GroupSchedule.start_time).all()
+
+
+# =====================================
+# Validate a term plan (hech narsa saqlanmaydi)
+# =====================================
+@router.post("/validate", response_model=schemas.SchedulePlanResult)
+def validate_plan(
+    plan: schemas.SchedulePlan,
+    db: Session = Depends(get_db)
+):
+    """
+    Reja guruhlarining mavjud jadvali reja bilan almashtirilgan deb hisoblanadi;
+    boshqa guruhlarning jadvali indeksga oldindan yuklanadi.
+    """
+    group_ids = {item.group_id for item in plan.items}
+    teachers = _group_teachers(db, group_ids) if group_ids else {}
+    _check_rooms(db, {item.room_id for item in plan.items})
+
+    index = scheduling.build_index(scheduling.load_slots(db, exclude_group_ids=group_ids))
+    slots = [_to_slot(item, teachers[item.group_id]) for item in plan.items]
+    conflicts = scheduling.find_conflicts(slots, index)
+
+    return {"valid": not conflicts, "checked": len(slots), "conflicts": conflicts}
+
+
+# =====================================
+# Free slots for a teacher / room / group
+# =====================================
+@router.get("/free-slots", response_model=List[schemas.FreeSlot])
+def get_free_slots(
+    duration: int = Query(90, ge=15, le=24 * 60),
+    teacher_id: Optional[int] = None,
+    room_id: Optional[int] = None,
+    group_id: Optional[int] = None,
+    weekday: Optional[int] = Query(None, ge=0, le=6),
+    db: Session = Depends(get_db)
+):
+    """Berilgan resurslarning barchasi bir vaqtda bo'sh bo'lgan oraliqlar."""
+    if teacher_id is None and room_id is None and group_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="teacher_id, room_id or group_id is required"
+        )
+
+    index = scheduling.build_index(scheduling.load_slots(db))
+    weekdays = [weekday] if weekday is not None else range(7)
+
+    result = []
+    for day in weekdays:
+        keys = []
+        if teacher_id is not None:
+            keys.append(("teacher", teacher_id, day))
+        if room_id is not None:
+            keys.append(("room", room_id, day))
+        if group_id is not None:
+            keys.append(("group", group_id, day))
+
+        for start, end in scheduling.free_slots(index, keys, duration):
+            result.append({
+                "weekday": day,
+                "start_time": scheduling.to_time(start),
+                "end_time": scheduling.to_time(end),
+            })
+    return result
+
+
+# =====================================
+# Get schedule by ID
+# =====================================
+@router.get("/{schedule_id}", response_model=schemas.ScheduleResponse)
+def get_schedule(schedule_id: int, db: Session = Depends(get_db)):
+    return _get_schedule_or_404(db, schedule_id)
+
+
+# =====================================
+# Create schedule entry
+# =====================================
+@router.post(
+    "/",
+    response_model=schemas.ScheduleResponse,
+    status_code=status.HTTP_201_CREATED
+)
+def create_schedule(
+    schedule: schemas.ScheduleCreate,
+    db: Session = Depends(get_db)
+):
+    _ensure_free(db, schedule)
+
+    db_schedule = models.GroupSchedule(**schedule.dict())
+    db.add(db_schedule)
+    db.commit()
+    db.refresh(db_schedule)
+
+    return db_schedule
+
+
+# =====================================
+# Update schedule entry
+# =====================================
+@router.put("/{schedule_id}", response_model=schemas.ScheduleResponse)
+def update_schedule(
+    schedule_id: int,
+    schedule: schemas.ScheduleCreate,
+    db: Session = Depends(get_db)
+):
+    db_schedule = _get_schedule_or_404(db, schedule_id)
+    _ensure_free(db, schedule, schedule_id)
+
+    for key, value in schedule.dict().items():
+        setattr(db_schedule, key, value)
+
+    db.commit()
+    db.refresh(db_schedule)
+
+    return db_schedule
+
+
+# =====================================
+# Delete schedule entry
+# =====================================
+@router.delete(
+    "/{schedule_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
+    schedule = _get_schedule_or_404(db, schedule_id)
+    db.delete(schedule)
+    db.commit()
+    return None
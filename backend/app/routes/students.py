@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, status
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, cache, dedup, rollups
+from app.query_utils import bulk_soft_delete, sync_page
+from app.student_import import import_students
 
 router = APIRouter(
     prefix="/students",
@@ -17,11 +21,14 @@ router = APIRouter(
 # =====================================
 @router.get("/", response_model=List[schemas.StudentResponse])
 def get_students(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    students = db.query(models.Student).offset(skip).limit(limit).all()
+    students = sync_page(db.query(models.Student), models.Student, updated_since, response, sync_cursor, skip, limit)
     return students
 
 
@@ -41,6 +48,92 @@ def get_student(student_id: int, db: Session = Depends(get_db)):
     return student
 
 
+# =====================================
+# Student overview (profil + guruhlar + enrollmentlar + to'lovlar)
+# =====================================
+@router.get("/{student_id}/overview", response_model=schemas.StudentOverview)
+def get_student_overview(student_id: int, db: Session = Depends(get_db)):
+    """
+    O'quvchi sahifasi uchun hammasi bitta javobda. Tarix uzunligidan qat'i nazar
+    4 ta so'rov: o'quvchi, guruhlar (JOIN kurs/o'qituvchi), enrollmentlar,
+    oy/kurs bo'yicha to'lovlar yig'indisi. Natija keshlanadi; to'lov, guruh va
+    enrollment yozuvlari keshni o'chiradi (app/cache.py).
+
+    outstanding_balance — o'quvchi guruhlaridagi kurslar bo'yicha, to'lov yozuvi
+    bor har bir oy uchun max(0, kurs narxi - to'langan) yig'indisi.
+    """
+    cached = cache.student_overview.get(student_id)
+    if cached is not None:
+        return cached
+    token = cache.student_overview.token(student_id)
+
+    student = db.get(models.Student, student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+
+    groups = db.query(
+        models.Group.id.label("group_id"),
+        models.Group.name.label("group_name"),
+        models.Course.id.label("course_id"),
+        models.Course.name.label("course_name"),
+        models.Course.price.label("course_price"),
+        models.Teacher.id.label("teacher_id"),
+        models.Teacher.full_name.label("teacher_name"),
+    ).join(
+        models.GroupStudent, models.GroupStudent.group_id == models.Group.id
+    ).join(
+        models.Course, models.Course.id == models.Group.course_id
+    ).join(
+        models.Teacher, models.Teacher.id == models.Group.teacher_id
+    ).filter(
+        models.GroupStudent.student_id == student_id
+    ).order_by(models.Group.id).all()
+
+    enrollments = db.query(
+        models.Enrollment.id,
+        models.Enrollment.course_id,
+        models.Course.name.label("course_name"),
+        models.Enrollment.status,
+    ).join(
+        models.Course, models.Course.id == models.Enrollment.course_id
+    ).filter(
+        models.Enrollment.student_id == student_id
+    ).order_by(models.Enrollment.id).all()
+
+    payments = db.query(
+        models.Payment.month,
+        models.Payment.course_id,
+        func.sum(case((models.Payment.status == "paid", models.Payment.amount), else_=0)).label("paid"),
+        func.sum(case((models.Payment.status != "paid", models.Payment.amount), else_=0)).label("pending"),
+    ).filter(
+        models.Payment.student_id == student_id
+    ).group_by(
+        models.Payment.month, models.Payment.course_id
+    ).order_by(models.Payment.month.desc(), models.Payment.course_id).all()
+
+    prices = {g.course_id: g.course_price for g in groups}
+    outstanding = sum(
+        max(0, prices[p.course_id] - (p.paid or 0))
+        for p in payments if p.course_id in prices
+    )
+
+    overview = {
+        "student": schemas.StudentResponse.model_validate(student),
+        "groups": [g._asdict() for g in groups],
+        "enrollments": [e._asdict() for e in enrollments],
+        "payments": [
+            {"month": p.month, "course_id": p.course_id, "paid": p.paid or 0, "pending": p.pending or 0}
+            for p in payments
+        ],
+        "outstanding_balance": outstanding,
+    }
+    cache.student_overview.set(student_id, overview, token=token)
+    return overview
+
+
 # =====================================
 # Create student
 # =====================================
@@ -70,6 +163,27 @@ def create_student(
     return db_student
 
 
+# =====================================
+# Bulk import (CSV / XLSX)
+# =====================================
+@router.post("/import", response_model=schemas.StudentImportReport)
+def import_students_file(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Sarlavhali CSV yoki XLSX fayl: full_name, phone, email, school, grade, address.
+    Telefon bo'yicha mavjud o'quvchilar yangilanadi; xatoli qatorlar hisobotda qaytadi.
+    """
+    try:
+        return import_students(db, file.file, file.filename)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Faylni o'qib bo'lmadi: {e}"
+        )
+
+
 # =====================================
 # Update student
 # =====================================
@@ -105,6 +219,24 @@ def update_student(
     return db_student
 
 
+# =====================================
+# Bulk delete students
+# =====================================
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_students(
+    payload: schemas.BulkDeleteRequest,
+    db: Session = Depends(get_db)
+):
+    """Bitta UPDATE ... SET deleted_at WHERE id IN (...); jismoniy o'chirish — app/purge.py."""
+    rollups.mark_dirty(db, student_ids=payload.ids)
+    deleted = bulk_soft_delete(db, models.Student, payload.ids)
+
+    # Core UPDATE ORM eventlaridan o'tmaydi
+    cache.student_overview.clear()
+    dedup.index.invalidate()
+    return {"deleted": deleted}
+
+
 # =====================================
 # Delete student
 # =====================================
@@ -121,7 +253,7 @@ def delete_student(student_id: int, db: Session = Depends(get_db)):
             detail="Student not found"
         )
 
-    db.delete(student)
+    student.soft_delete()
     db.commit()
 
     return None
\ No newline at end of file
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app import schemas, sync
+from app.query_utils import sync_watermark, to_naive_utc
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+
+# =====================================
+# Tombstones (since dan keyin o'chirilganlar)
+# =====================================
+@router.get("/tombstones", response_model=schemas.TombstonePage)
+def get_tombstones(
+    since: datetime,
+    response: Response,
+    entity: Optional[str] = None,   # "payments", "students", ...
+    db: Session = Depends(get_db)
+):
+    """
+    Ro'yxatlar ?updated_since= bilan faqat o'zgarganlarni beradi; bu yerda —
+    o'chirilganlar. since saqlash muddatidan eski bo'lsa — 410 (to'liq qayta yuklang).
+    """
+    watermark = sync_watermark()
+    since = to_naive_utc(since)
+    if since < sync.oldest_available():
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Tombstones are no longer available for this watermark; do a full resync"
+        )
+
+    response.headers["X-Sync-Watermark"] = watermark.isoformat()
+    return {
+        "items": sync.tombstones(db, since, entity),
+        "watermark": watermark,
+    }
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, distinct, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
-from app import models, schemas
+from app import models, schemas, cache, scheduling, rollups, tags, snapshot
+from app.query_utils import bulk_soft_delete, sync_page
 
 router = APIRouter(
     prefix="/teachers",
@@ -17,14 +20,105 @@ router = APIRouter(
 # =====================================
 @router.get("/", response_model=List[schemas.TeacherResponse])
 def get_teachers(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
+    tag: Optional[List[str]] = Query(None),
+    match: str = "any",   # any (OR) | all (AND)
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    teachers = db.query(models.Teacher).offset(skip).limit(limit).all()
+    """?tag=react&tag=python — teacher_tags (tag_id, teacher_id) indeksi bo'yicha filtr."""
+    query = db.query(models.Teacher)
+
+    slugs = {tags.slugify(name) for name in tag or [] if name.strip()}
+    if slugs:
+        if match not in ("any", "all"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="match must be 'any' or 'all'"
+            )
+
+        matching = select(models.TeacherTag.teacher_id).join(
+            models.Tag, models.Tag.id == models.TeacherTag.tag_id
+        ).where(models.Tag.slug.in_(slugs)).group_by(models.TeacherTag.teacher_id)
+        if match == "all":
+            matching = matching.having(func.count(distinct(models.TeacherTag.tag_id)) == len(slugs))
+
+        query = query.filter(models.Teacher.id.in_(matching))
+
+    teachers = sync_page(
+        query.order_by(models.Teacher.id), models.Teacher, updated_since, response, sync_cursor, skip, limit
+    )
     return teachers
 
 
+# =====================================
+# Tag counts (public filtr uchun)
+# =====================================
+@router.get("/tags", response_model=List[schemas.TagCount])
+def get_teacher_tags(db: Session = Depends(get_db)):
+    rows = db.query(
+        models.Tag.name, models.Tag.slug, func.count(models.TeacherTag.teacher_id)
+    ).join(
+        models.TeacherTag, models.TeacherTag.tag_id == models.Tag.id
+    ).join(
+        models.Teacher, models.Teacher.id == models.TeacherTag.teacher_id
+    ).group_by(
+        models.Tag.id, models.Tag.name, models.Tag.slug
+    ).order_by(
+        func.count(models.TeacherTag.teacher_id).desc(), models.Tag.name
+    ).all()
+
+    return [{"name": name, "slug": slug, "count": count} for name, slug, count in rows]
+
+
+# =====================================
+# Teacher stats (rollup jadvalidan)
+# =====================================
+@router.get("/stats", response_model=List[schemas.TeacherStatsResponse])
+def get_teachers_stats(
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """teacher_stats jadvalidan o'qiladi — to'lovlar bo'yicha jonli hisob yo'q."""
+    rows = db.query(
+        models.TeacherStats, models.Teacher.full_name
+    ).join(
+        models.Teacher, models.Teacher.id == models.TeacherStats.teacher_id
+    ).order_by(
+        models.TeacherStats.revenue.desc(), models.TeacherStats.teacher_id
+    ).offset(skip).limit(limit).all()
+
+    return [
+        {**schemas.TeacherStatsBase.model_validate(stats).model_dump(), "full_name": full_name}
+        for stats, full_name in rows
+    ]
+
+
+@router.get("/{teacher_id}/stats", response_model=schemas.TeacherStatsResponse)
+def get_teacher_stats(
+    teacher_id: int,
+    db: Session = Depends(get_db)
+):
+    teacher = db.get(models.Teacher, teacher_id)
+
+    if not teacher:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teacher not found"
+        )
+
+    stats = db.get(models.TeacherStats, teacher_id)
+    if stats is None:
+        # Rebuild hali ishlamagan bo'lsa — jonli hisob, GET hech narsa yozmaydi
+        return {**rollups.compute(db, [teacher_id])[teacher_id], "full_name": teacher.full_name}
+
+    return {**schemas.TeacherStatsBase.model_validate(stats).model_dump(), "full_name": teacher.full_name}
+
+
 # =====================================
 # Get teacher by ID
 # =====================================
@@ -44,6 +138,23 @@ def get_teacher(
     return teacher
 
 
+# =====================================
+# Teacher timetable
+# =====================================
+@router.get("/{teacher_id}/timetable", response_model=List[schemas.TimetableEntry])
+def get_teacher_timetable(
+    teacher_id: int,
+    db: Session = Depends(get_db)
+):
+    if not db.get(models.Teacher, teacher_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teacher not found"
+        )
+
+    return scheduling.timetable(db, teacher_id=teacher_id)
+
+
 # =====================================
 # Create teacher
 # =====================================
@@ -56,7 +167,10 @@ def create_teacher(
     teacher: schemas.TeacherCreate,
     db: Session = Depends(get_db)
 ):
-    db_teacher = models.Teacher(**teacher.dict())
+    data = teacher.dict()
+    tag_value = data.pop("tags", None)
+    db_teacher = models.Teacher(**data)
+    tags.set_teacher_tags(db, db_teacher, tag_value)
 
     db.add(db_teacher)
 
@@ -91,6 +205,8 @@ def update_teacher(
         )
 
     update_data = teacher_update.dict(exclude_unset=True)
+    if "tags" in update_data:
+        tags.set_teacher_tags(db, db_teacher, update_data.pop("tags"))
 
     for key, value in update_data.items():
         setattr(db_teacher, key, value)
@@ -108,6 +224,22 @@ def update_teacher(
     return db_teacher
 
 
+# =====================================
+# Bulk delete teachers
+# =====================================
+@router.post("/bulk-delete", response_model=schemas.BulkDeleteResult)
+def bulk_delete_teachers(
+    payload: schemas.BulkDeleteRequest,
+    db: Session = Depends(get_db)
+):
+    """Bitta UPDATE ... SET deleted_at WHERE id IN (...); jismoniy o'chirish — app/purge.py."""
+    rollups.mark_dirty(db, teacher_ids=payload.ids)
+    deleted = bulk_soft_delete(db, models.Teacher, payload.ids)
+    cache.student_overview.clear()
+    snapshot.store.mark_stale(["teachers"])
+    return {"deleted": deleted}
+
+
 # =====================================
 # Delete teacher
 # =====================================
@@ -127,7 +259,7 @@ def delete_teacher(
             detail="Teacher not found"
         )
 
-    db.delete(teacher)
+    teacher.soft_delete()
     db.commit()
 
     return None
\ No newline at end of file
@@ -1,11 +1,13 @@
-import json
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
 from app import models, schemas
+from app.query_utils import json_array_contains, sync_page
 
 router = APIRouter(
     prefix="/vacancies",
@@ -13,14 +15,43 @@ router = APIRouter(
 )
 
 
-# ─── Helper: DB object → dict (requirements: str → list) ───
-def _serialize(v: models.Vacancy) -> dict:
-    data = {c.name: getattr(v, c.name) for c in v.__table__.columns}
-    try:
-        data["requirements"] = json.loads(data["requirements"] or "[]")
-    except Exception:
-        data["requirements"] = []
-    return data
+# =====================================
+# Helperlar: filtrlar va arizalar soni
+# =====================================
+def _filters(
+    db: Session,
+    status_: Optional[str] = None,
+    type_: Optional[str] = None,
+    location: Optional[str] = None,
+    requirement: Optional[str] = None,
+) -> list:
+    conditions = []
+    if status_:
+        conditions.append(models.Vacancy.status == status_)
+    if type_:
+        conditions.append(models.Vacancy.type == type_)
+    if location:
+        conditions.append(models.Vacancy.location == location)
+    if requirement:
+        conditions.append(json_array_contains(db, models.Vacancy.requirements, requirement))
+    return conditions
+
+
+def _with_counts(db: Session, vacancies: list) -> list:
+    """Sahifadagi vakansiyalar uchun arizalar soni — bitta GROUP BY (N+1 yo'q)."""
+    ids = [v.id for v in vacancies]
+    counts = dict(db.query(
+        models.VacancyApplication.vacancy_id, func.count(models.VacancyApplication.id)
+    ).filter(
+        models.VacancyApplication.vacancy_id.in_(ids)
+    ).group_by(models.VacancyApplication.vacancy_id).all()) if ids else {}
+
+    return [
+        schemas.VacancyResponse.model_validate(v).model_copy(
+            update={"applications_count": counts.get(v.id, 0)}
+        )
+        for v in vacancies
+    ]
 
 
 # =====================================
@@ -28,12 +59,64 @@ def _serialize(v: models.Vacancy) -> dict:
 # =====================================
 @router.get("/", response_model=List[schemas.VacancyResponse])
 def get_vacancies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    location: Optional[str] = None,
+    requirement: Optional[str] = None,   # shu talab ro'yxatda bor vakansiyalar
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
     db: Session = Depends(get_db)
 ):
-    vacancies = db.query(models.Vacancy).offset(skip).limit(limit).all()
-    return [_serialize(v) for v in vacancies]
+    query = db.query(models.Vacancy).filter(*_filters(db, status, type, location, requirement))
+    return _with_counts(db, sync_page(query, models.Vacancy, updated_since, response, sync_cursor, skip, limit))
+
+
+# =====================================
+# Job board: ro'yxat + type / location facet sonlari
+# =====================================
+@router.get("/board", response_model=schemas.VacancyBoard)
+def get_vacancy_board(
+    skip: int = 0,
+    limit: int = 20,
+    status: Optional[str] = "active",
+    type: Optional[str] = None,
+    location: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Facetlar bitta GROUP BY (type, location) so'rovidan: type sonlari
+    location filtrini, location sonlari esa type filtrini hisobga oladi —
+    foydalanuvchi tanlovini o'zgartirganda nechta natija chiqishini ko'radi.
+    """
+    rows = db.query(
+        models.Vacancy.type, models.Vacancy.location, func.count(models.Vacancy.id)
+    ).filter(*_filters(db, status)).group_by(
+        models.Vacancy.type, models.Vacancy.location
+    ).all()
+
+    type_counts, location_counts, total = {}, {}, 0
+    for row_type, row_location, count in rows:
+        if not location or row_location == location:
+            type_counts[row_type] = type_counts.get(row_type, 0) + count
+        if not type or row_type == type:
+            location_counts[row_location] = location_counts.get(row_location, 0) + count
+        if (not type or row_type == type) and (not location or row_location == location):
+            total += count
+
+    items = db.query(models.Vacancy).filter(
+        *_filters(db, status, type, location)
+    ).order_by(
+        models.Vacancy.created_at.desc(), models.Vacancy.id.desc()
+    ).offset(skip).limit(limit).all()
+
+    return {
+        "items": _with_counts(db, items),
+        "facets": {"type": type_counts, "location": location_counts},
+        "total": total,
+    }
 
 
 # =====================================
@@ -50,7 +133,7 @@ def get_vacancy(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vacancy not found"
         )
-    return _serialize(vacancy)
+    return vacancy
 
 
 # =====================================
@@ -61,10 +144,7 @@ def create_vacancy(
     vacancy: schemas.VacancyCreate,
     db: Session = Depends(get_db)
 ):
-    data = vacancy.dict()
-    data["requirements"] = json.dumps(data.get("requirements") or [])
-
-    db_vac = models.Vacancy(**data)
+    db_vac = models.Vacancy(**vacancy.dict())
     db.add(db_vac)
 
     try:
@@ -77,7 +157,7 @@ def create_vacancy(
             detail="Vacancy creation error"
         )
 
-    return _serialize(db_vac)
+    return db_vac
 
 
 # =====================================
@@ -96,10 +176,7 @@ def update_vacancy(
             detail="Vacancy not found"
         )
 
-    data = vacancy_update.dict()
-    data["requirements"] = json.dumps(data.get("requirements") or [])
-
-    for key, value in data.items():
+    for key, value in vacancy_update.dict().items():
         setattr(db_vac, key, value)
 
     try:
@@ -112,7 +189,7 @@ def update_vacancy(
             detail="Vacancy update error"
         )
 
-    return _serialize(db_vac)
+    return db_vac
 
 
 # =====================================
@@ -130,6 +207,6 @@ def delete_vacancy(
             detail="Vacancy not found"
         )
 
-    db.delete(vacancy)
+    vacancy.soft_delete()
     db.commit()
     return None
\ No newline at end of file
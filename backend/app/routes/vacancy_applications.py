@@ -1,12 +1,14 @@
 # app/routes/vacancy_applications.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
-import json
+from typing import List, Optional
 
 from app.database import get_db
 from app import models, schemas
+from app.query_utils import keyset_page, json_array_contains, sync_page
 
 router = APIRouter(
     prefix="/vacancy-applications",
@@ -14,56 +16,119 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[schemas.VacancyApplicationResponse])
-def get_applications(db: Session = Depends(get_db)):
-    applications = db.query(models.VacancyApplication).order_by(
-        models.VacancyApplication.created_at.desc()
-    ).all()
-    
-    # Vakansiya nomlarini qo'shish
-    result = []
-    for app in applications:
-        app_dict = {
-            "id": app.id,
-            "full_name": app.full_name,
-            "phone": app.phone,
-            "education": app.education,
-            "certificates": json.loads(app.certificates) if app.certificates else [],
-            "certificate_level": app.certificate_level,
-            "vacancy_id": app.vacancy_id,
-            "status": app.status,
-            "notes": app.notes,
-            "created_at": app.created_at,
-            "updated_at": app.updated_at,
-            "vacancy_title": app.vacancy.title if app.vacancy else None
-        }
-        result.append(app_dict)
-    
-    return result
-
-
-@router.get("/{app_id}", response_model=schemas.VacancyApplicationResponse)
-def get_application(app_id: int, db: Session = Depends(get_db)):
-    app = db.get(models.VacancyApplication, app_id)
-    if not app:
-        raise HTTPException(status_code=404, detail="Ariza topilmadi")
-    
+# ─── Helper: DB object → dict (+ vakansiya nomi) ───
+def _serialize(app: models.VacancyApplication, vacancy_title: Optional[str]) -> dict:
     return {
         "id": app.id,
         "full_name": app.full_name,
         "phone": app.phone,
         "education": app.education,
-        "certificates": json.loads(app.certificates) if app.certificates else [],
+        "certificates": app.certificates or [],
         "certificate_level": app.certificate_level,
         "vacancy_id": app.vacancy_id,
         "status": app.status,
         "notes": app.notes,
         "created_at": app.created_at,
         "updated_at": app.updated_at,
-        "vacancy_title": app.vacancy.title if app.vacancy else None
+        "vacancy_title": vacancy_title
     }
 
 
+# ─── Helper: status'dan tashqari filtrlar (ro'yxat va sonlar uchun umumiy) ───
+def _filters(
+    db: Session,
+    vacancy_id: Optional[int],
+    certificate: Optional[str],
+    certificate_level: Optional[str],
+) -> list:
+    conditions = []
+    if vacancy_id:
+        conditions.append(models.VacancyApplication.vacancy_id == vacancy_id)
+    if certificate:
+        conditions.append(json_array_contains(db, models.VacancyApplication.certificates, certificate))
+    if certificate_level:
+        conditions.append(models.VacancyApplication.certificate_level == certificate_level)
+    return conditions
+
+
+# ─── Helper: arizalar + vakansiya nomi (bitta JOIN, N+1 yo'q) ───
+def _query_with_title(db: Session, status_: Optional[str], conditions: list):
+    query = db.query(
+        models.VacancyApplication, models.Vacancy.title
+    ).outerjoin(
+        models.Vacancy, models.Vacancy.id == models.VacancyApplication.vacancy_id
+    ).filter(*conditions)
+    if status_:
+        query = query.filter(models.VacancyApplication.status == status_)
+    return query
+
+
+@router.get("/", response_model=List[schemas.VacancyApplicationResponse])
+def get_applications(
+    response: Response,
+    status: Optional[str] = None,
+    vacancy_id: Optional[int] = None,
+    certificate: Optional[str] = None,
+    certificate_level: Optional[str] = None,
+    updated_since: Optional[datetime] = None,   # delta sync
+    sync_cursor: Optional[str] = None,          # to'lgan delta sahifasidan keyin (X-Sync-Cursor)
+    db: Session = Depends(get_db)
+):
+    conditions = _filters(db, vacancy_id, certificate, certificate_level)
+    query = _query_with_title(db, status, conditions).order_by(
+        models.VacancyApplication.created_at.desc()
+    )
+    rows = sync_page(query, models.VacancyApplication, updated_since, response, sync_cursor)
+
+    return [_serialize(app, title) for app, title in rows]
+
+
+# =====================================
+# HR inbox: filtrlar + status bo'yicha sonlar + cursor pagination
+# =====================================
+@router.get("/inbox", response_model=schemas.VacancyApplicationInbox)
+def get_applications_inbox(
+    status: Optional[str] = None,
+    vacancy_id: Optional[int] = None,
+    certificate: Optional[str] = None,
+    certificate_level: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Inbox sahifasi uchun: bitta sahifa arizalar (keyset pagination) va
+    tab sarlavhalari uchun har bir status bo'yicha sonlar.
+    Sonlar status filtrini hisobga olmaydi — barcha tablar ko'rinib turadi.
+    """
+    conditions = _filters(db, vacancy_id, certificate, certificate_level)
+
+    rows, next_cursor = keyset_page(
+        _query_with_title(db, status, conditions),
+        models.VacancyApplication, cursor, limit
+    )
+
+    counts = dict(db.query(
+        models.VacancyApplication.status, func.count(models.VacancyApplication.id)
+    ).filter(*conditions).group_by(models.VacancyApplication.status).all())
+
+    return {
+        "items": [_serialize(app, title) for app, title in rows],
+        "counts": counts,
+        "total": sum(counts.values()),
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/{app_id}", response_model=schemas.VacancyApplicationResponse)
+def get_application(app_id: int, db: Session = Depends(get_db)):
+    app = db.get(models.VacancyApplication, app_id)
+    if not app:
+        raise HTTPException(status_code=404, detail="Ariza topilmadi")
+
+    return _serialize(app, app.vacancy.title if app.vacancy else None)
+
+
 @router.post("/", response_model=schemas.VacancyApplicationResponse, status_code=201)
 def create_application(
     application: schemas.VacancyApplicationCreate,
@@ -74,29 +139,12 @@ def create_application(
     if not vacancy:
         raise HTTPException(status_code=404, detail="Vakansiya topilmadi")
 
-    # Certificates ni JSON string ga aylantirish
-    app_data = application.dict()
-    app_data["certificates"] = json.dumps(application.certificates)
-
-    db_app = models.VacancyApplication(**app_data)
+    db_app = models.VacancyApplication(**application.dict())
     db.add(db_app)
     db.commit()
     db.refresh(db_app)
-    
-    return {
-        "id": db_app.id,
-        "full_name": db_app.full_name,
-        "phone": db_app.phone,
-        "education": db_app.education,
-        "certificates": json.loads(db_app.certificates) if db_app.certificates else [],
-        "certificate_level": db_app.certificate_level,
-        "vacancy_id": db_app.vacancy_id,
-        "status": db_app.status,
-        "notes": db_app.notes,
-        "created_at": db_app.created_at,
-        "updated_at": db_app.updated_at,
-        "vacancy_title": vacancy.title
-    }
+
+    return _serialize(db_app, vacancy.title)
 
 
 @router.patch("/{app_id}", response_model=schemas.VacancyApplicationResponse)
@@ -114,21 +162,8 @@ def update_application(
 
     db.commit()
     db.refresh(db_app)
-    
-    return {
-        "id": db_app.id,
-        "full_name": db_app.full_name,
-        "phone": db_app.phone,
-        "education": db_app.education,
-        "certificates": json.loads(db_app.certificates) if db_app.certificates else [],
-        "certificate_level": db_app.certificate_level,
-        "vacancy_id": db_app.vacancy_id,
-        "status": db_app.status,
-        "notes": db_app.notes,
-        "created_at": db_app.created_at,
-        "updated_at": db_app.updated_at,
-        "vacancy_title": db_app.vacancy.title if db_app.vacancy else None
-    }
+
+    return _serialize(db_app, db_app.vacancy.title if db_app.vacancy else None)
 
 
 @router.delete("/{app_id}", status_code=204)
@@ -138,4 +173,4 @@ def delete_application(app_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Ariza topilmadi")
     db.delete(db_app)
     db.commit()
-    return None
\ No newline at end of file
+    return None
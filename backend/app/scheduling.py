@@ -0,0 +1,253 @@
+# app/scheduling.py
+# Dars jadvali: o'qituvchi / xona / guruh bandligi uchun interval indeks
+#
+# Har bir resurs (kind, resource_id, weekday) kaliti bo'yicha intervallar
+# boshlanish vaqti bo'yicha tartiblangan ro'yxatda saqlanadi (bisect).
+# Kesishish tekshiruvi — bitta kalit ichida O(log k + m), butun reja
+# (n ta dars) — O(n log n); juftlab taqqoslash yo'q. Indeks /validate va
+# /free-slots uchun; bitta darsni yozishda esa butun jadval yuklanmaydi —
+# overlapping_slots() shu kundagi kesishuvchilarni bitta so'rovda oladi,
+# lock_resources() parallel yozuvlarni ketma-ket qiladi.
+
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import time
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Bo'sh vaqt qidirish oralig'i (daqiqalarda)
+DAY_START = int(os.getenv("SCHEDULE_DAY_START", 8 * 60))
+DAY_END = int(os.getenv("SCHEDULE_DAY_END", 21 * 60))
+
+
+class Slot(NamedTuple):
+    schedule_id: Optional[int]
+    group_id: int
+    teacher_id: int
+    room_id: Optional[int]
+    weekday: int
+    start: int          # daqiqa (00:00 dan)
+    end: int
+
+
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def resource_keys(slot: Slot) -> list:
+    keys = [("teacher", slot.teacher_id, slot.weekday), ("group", slot.group_id, slot.weekday)]
+    if slot.room_id is not None:
+        keys.append(("room", slot.room_id, slot.weekday))
+    return keys
+
+
+class IntervalIndex:
+    """
+    kalit -> start bo'yicha tartiblangan (start, end, slot) ro'yxati.
+    max_end[i] — 0..i intervallar ichida eng katta end; kesishuvchilarni
+    qidirishda orqaga yurish max_end <= start bo'lganda to'xtaydi.
+    """
+
+    def __init__(self):
+        self._items = defaultdict(list)
+        self._max_end = defaultdict(list)
+
+    def add(self, slot: Slot) -> None:
+        for key in resource_keys(slot):
+            items = self._items[key]
+            max_end = self._max_end[key]
+            pos = bisect_right(items, (slot.start, slot.end), key=lambda item: item[:2])
+            items.insert(pos, (slot.start, slot.end, slot))
+
+            # max_end faqat pos dan keyin o'zgaradi (tartiblangan kiritishda — O(1))
+            del max_end[pos:]
+            running = max_end[-1] if max_end else 0
+            for _, end, _ in items[pos:]:
+                running = max(running, end)
+                max_end.append(running)
+
+    def overlapping(self, key: tuple, start: int, end: int) -> List[Slot]:
+        items = self._items.get(key)
+        if not items:
+            return []
+        max_end = self._max_end[key]
+
+        found = []
+        i = bisect_left(items, (end,)) - 1     # start < end bo'lgan oxirgi interval
+        while i >= 0 and max_end[i] > start:
+            if items[i][1] > start:
+                found.append(items[i][2])
+            i -= 1
+        return found
+
+    def busy(self, key: tuple) -> List[tuple]:
+        return [(start, end) for start, end, _ in self._items.get(key, [])]
+
+
+def conflicts_for(index: IntervalIndex, slot: Slot) -> List[dict]:
+    conflicts = []
+    for key in resource_keys(slot):
+        for other in index.overlapping(key, slot.start, slot.end):
+            if other.schedule_id is not None and other.schedule_id == slot.schedule_id:
+                continue
+            conflicts.append({
+                "kind": key[0],
+                "resource_id": key[1],
+                "weekday": slot.weekday,
+                "start_time": to_time(max(slot.start, other.start)),
+                "end_time": to_time(min(slot.end, other.end)),
+                "schedule_id": slot.schedule_id,
+                "other_schedule_id": other.schedule_id,
+                "group_id": slot.group_id,
+                "other_group_id": other.group_id,
+            })
+    return conflicts
+
+
+def find_conflicts(slots: Iterable[Slot], index: Optional[IntervalIndex] = None) -> List[dict]:
+    """Reja bo'yicha barcha kesishuvlar: har bir dars indeksga qo'shilishdan oldin tekshiriladi."""
+    index = index or IntervalIndex()
+    conflicts = []
+    for slot in sorted(slots, key=lambda s: (s.weekday, s.start)):
+        conflicts.extend(conflicts_for(index, slot))
+        index.add(slot)
+    return conflicts
+
+
+def _slot_query(db: Session):
+    return db.query(
+        models.GroupSchedule.id,
+        models.GroupSchedule.group_id,
+        models.Group.teacher_id,
+        models.GroupSchedule.room_id,
+        models.GroupSchedule.weekday,
+        models.GroupSchedule.start_time,
+        models.GroupSchedule.end_time,
+    ).join(models.Group, models.Group.id == models.GroupSchedule.group_id)
+
+
+def _to_slots(rows) -> List[Slot]:
+    return [
+        Slot(row.id, row.group_id, row.teacher_id, row.room_id, row.weekday,
+             to_minutes(row.start_time), to_minutes(row.end_time))
+        for row in rows
+    ]
+
+
+def load_slots(db: Session, exclude_group_ids: Iterable[int] = (),
+               exclude_schedule_id: Optional[int] = None) -> List[Slot]:
+    """Mavjud jadval — bitta JOIN so'rovi (o'qituvchi guruhdan olinadi)."""
+    query = _slot_query(db)
+
+    exclude_group_ids = list(exclude_group_ids)
+    if exclude_group_ids:
+        query = query.filter(models.GroupSchedule.group_id.notin_(exclude_group_ids))
+    if exclude_schedule_id is not None:
+        query = query.filter(models.GroupSchedule.id != exclude_schedule_id)
+
+    return _to_slots(query.all())
+
+
+def overlapping_slots(db: Session, slot: Slot) -> List[Slot]:
+    """
+    Bitta dars bilan shu kuni kesishuvchi o'qituvchi / guruh / xona darslari —
+    bitta so'rov: (room_id, weekday), (group_id, weekday) va groups.teacher_id
+    indekslari bo'yicha. Yonma-yon darslar (end == start) kesishmaydi.
+    """
+    resources = [
+        models.Group.teacher_id == slot.teacher_id,
+        models.GroupSchedule.group_id == slot.group_id,
+    ]
+    if slot.room_id is not None:
+        resources.append(models.GroupSchedule.room_id == slot.room_id)
+
+    query = _slot_query(db).filter(
+        models.GroupSchedule.weekday == slot.weekday,
+        models.GroupSchedule.start_time < to_time(slot.end),
+        models.GroupSchedule.end_time > to_time(slot.start),
+        or_(*resources),
+    )
+    if slot.schedule_id is not None:
+        query = query.filter(models.GroupSchedule.id != slot.schedule_id)
+    return _to_slots(query.all())
+
+
+def lock_resources(db: Session, slot: Slot) -> None:
+    """
+    Tekshiruv + yozishni serializatsiya: o'qituvchi, keyin xona qatori
+    SELECT ... FOR UPDATE (har doim shu tartibda — deadlocksiz). Guruh bitta
+    o'qituvchiga tegishli, shuning uchun guruh kesishuvlari ham shu qulf
+    ostida. SQLite FOR UPDATE'ni e'tiborsiz qoldiradi — u yozuvlarni o'zi
+    ketma-ket bajaradi.
+    """
+    db.execute(
+        select(models.Teacher.id).where(models.Teacher.id == slot.teacher_id).with_for_update()
+    ).all()
+    if slot.room_id is not None:
+        db.execute(
+            select(models.Room.id).where(models.Room.id == slot.room_id).with_for_update()
+        ).all()
+
+
+def build_index(slots: Iterable[Slot]) -> IntervalIndex:
+    index = IntervalIndex()
+    for slot in slots:
+        index.add(slot)
+    return index
+
+
+def free_slots(index: IntervalIndex, keys: List[tuple], duration: int,
+               day_start: int = DAY_START, day_end: int = DAY_END) -> List[tuple]:
+    """Berilgan resurslarning barchasi bo'sh bo'lgan, kamida duration daqiqalik oraliqlar."""
+    busy = sorted(interval for key in keys for interval in index.busy(key))
+
+    gaps, cursor = [], day_start
+    for start, end in busy:
+        if start - cursor >= duration:
+            gaps.append((cursor, min(start, day_end)))
+        cursor = max(cursor, end)
+        if cursor >= day_end:
+            break
+    if day_end - cursor >= duration:
+        gaps.append((cursor, day_end))
+    return [(start, end) for start, end in gaps if end - start >= duration]
+
+
+def timetable(db: Session, teacher_id: Optional[int] = None, room_id: Optional[int] = None) -> List[dict]:
+    """O'qituvchi yoki xona haftalik jadvali — bitta so'rov (guruh + xona nomi bilan)."""
+    query = db.query(
+        models.GroupSchedule, models.Group.name, models.Group.teacher_id, models.Room.name
+    ).join(
+        models.Group, models.Group.id == models.GroupSchedule.group_id
+    ).outerjoin(
+        models.Room, models.Room.id == models.GroupSchedule.room_id
+    )
+    if teacher_id is not None:
+        query = query.filter(models.Group.teacher_id == teacher_id)
+    if room_id is not None:
+        query = query.filter(models.GroupSchedule.room_id == room_id)
+
+    rows = query.order_by(models.GroupSchedule.weekday, models.GroupSchedule.start_time).all()
+    return [
+        {
+            "id": schedule.id,
+            "group_id": schedule.group_id,
+            "group_name": group_name,
+            "teacher_id": group_teacher_id,
+            "room_id": schedule.room_id,
+            "room_name": room_name,
+            "weekday": schedule.weekday,
+            "start_time": schedule.start_time,
+            "end_time": schedule.end_time,
+        }
+        for schedule, group_name, group_teacher_id, room_name in rows
+    ]
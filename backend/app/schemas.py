@@ -1,9 +1,33 @@
-from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, ConfigDict, field_validator, create_model
+from typing import Any, Dict, Optional, List
+from datetime import datetime, time
+from decimal import Decimal
 import json
 
 
+# ================================
+# ?expand= uchun dinamik sxemalar
+# ================================
+def with_expand(base: type[BaseModel], **relations: type[BaseModel]) -> type[BaseModel]:
+    """
+    base sxemaga ixtiyoriy bog'langan obyektlarni qo'shadi:
+    with_expand(GroupResponse, course=CourseResponse) -> GroupResponseExpanded
+    """
+    fields = {name: (Optional[schema], None) for name, schema in relations.items()}
+    return create_model(f"{base.__name__}Expanded", __base__=base, **fields)
+
+
+# ================================
+# Bulk delete (ID ro'yxati)
+# ================================
+class BulkDeleteRequest(BaseModel):
+    ids: List[int]
+
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+
+
 # ================================
 # Course
 # ================================
@@ -68,6 +92,52 @@ class StudentResponse(StudentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# /students/{id}/overview
+class StudentOverviewGroup(BaseModel):
+    group_id: int
+    group_name: str
+    course_id: int
+    course_name: str
+    course_price: int
+    teacher_id: int
+    teacher_name: str
+
+
+class StudentOverviewEnrollment(BaseModel):
+    id: int
+    course_id: int
+    course_name: str
+    status: str
+
+
+class StudentMonthPayments(BaseModel):
+    month: str
+    course_id: int
+    paid: int
+    pending: int
+
+
+class StudentOverview(BaseModel):
+    student: StudentResponse
+    groups: List[StudentOverviewGroup] = []
+    enrollments: List[StudentOverviewEnrollment] = []
+    payments: List[StudentMonthPayments] = []
+    outstanding_balance: int = 0
+
+
+class ImportRowError(BaseModel):
+    row: int                 # fayldagi qator raqami (1 — sarlavha)
+    errors: List[str]
+
+
+class StudentImportReport(BaseModel):
+    total_rows: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[ImportRowError] = []
+
+
 # ================================
 # Teacher
 # ================================
@@ -103,6 +173,28 @@ class TeacherResponse(TeacherBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TagCount(BaseModel):
+    name: str
+    slug: str
+    count: int
+
+
+class TeacherStatsBase(BaseModel):
+    teacher_id: int
+    groups_count: int
+    students_count: int
+    payments_count: int
+    revenue: int                 # to'langan
+    pending: int                 # to'lanmagan (pending)
+    refreshed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeacherStatsResponse(TeacherStatsBase):
+    full_name: str
+
+
 # ================================
 # Group
 # ================================
@@ -120,6 +212,139 @@ class GroupResponse(GroupCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+GroupExpanded = with_expand(GroupResponse, course=CourseResponse, teacher=TeacherResponse)
+
+
+# Guruh sahifasi uchun: kurs, o'qituvchi va o'quvchilar bilan birga
+class GroupStudentDetail(BaseModel):
+    id: int
+    student_id: int
+    student: StudentResponse
+    paid_amount: Optional[int] = None       # faqat ?month= berilganda
+    payment_status: Optional[str] = None    # paid | partial | unpaid
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GroupDetailResponse(GroupResponse):
+    course: CourseResponse
+    teacher: TeacherResponse
+    students: List[GroupStudentDetail] = []
+    month: Optional[str] = None
+
+
+# Guruh × oylar to'lov jadvali (ustunli format)
+class PaymentsMatrixStudent(BaseModel):
+    id: int
+    full_name: str
+
+
+class PaymentsMatrix(BaseModel):
+    group_id: int
+    course_id: int
+    course_price: int
+    months: List[str]                        # ustunlar: ["2026-01", "2026-02", ...]
+    students: List[PaymentsMatrixStudent]    # qatorlar
+    paid: List[List[int]]                    # paid[i][j] — students[i], months[j]
+    pending: List[List[int]]
+
+
+# ================================
+# Room
+# ================================
+class RoomCreate(BaseModel):
+    name: str
+    capacity: Optional[int] = None
+
+
+class RoomUpdate(BaseModel):
+    name: Optional[str] = None
+    capacity: Optional[int] = None
+
+
+class RoomResponse(RoomCreate):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ================================
+# Group schedule (dars jadvali)
+# ================================
+class ScheduleCreate(BaseModel):
+    group_id: int
+    room_id: Optional[int] = None
+    weekday: int                 # 0 = dushanba ... 6 = yakshanba
+    start_time: time
+    end_time: time
+
+    @field_validator('weekday')
+    @classmethod
+    def check_weekday(cls, v):
+        if not 0 <= v <= 6:
+            raise ValueError("weekday must be between 0 and 6")
+        return v
+
+    @field_validator('end_time')
+    @classmethod
+    def check_range(cls, v, info):
+        start = info.data.get('start_time')
+        if start is not None and v <= start:
+            raise ValueError("end_time must be after start_time")
+        return v
+
+
+class ScheduleResponse(ScheduleCreate):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TimetableEntry(BaseModel):
+    id: int
+    group_id: int
+    group_name: str
+    teacher_id: int
+    room_id: Optional[int] = None
+    room_name: Optional[str] = None
+    weekday: int
+    start_time: time
+    end_time: time
+
+
+class ScheduleConflict(BaseModel):
+    kind: str                    # teacher | room | group
+    resource_id: int
+    weekday: int
+    start_time: time
+    end_time: time
+    schedule_id: Optional[int] = None        # mavjud jadval qatori (bo'lsa)
+    other_schedule_id: Optional[int] = None
+    group_id: int
+    other_group_id: int
+
+
+class SchedulePlan(BaseModel):
+    # Reja: shu guruhlarning mavjud jadvali reja bilan almashtiriladi
+    items: List[ScheduleCreate]
+
+
+class SchedulePlanResult(BaseModel):
+    valid: bool
+    checked: int
+    conflicts: List[ScheduleConflict]
+
+
+class FreeSlot(BaseModel):
+    weekday: int
+    start_time: time
+    end_time: time
+
+
 # ================================
 # Enrollment
 # ================================
@@ -137,6 +362,9 @@ class EnrollmentResponse(EnrollmentCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+EnrollmentExpanded = with_expand(EnrollmentResponse, student=StudentResponse, course=CourseResponse)
+
+
 # ================================
 # User
 # ================================
@@ -183,10 +411,22 @@ class VacancyResponse(VacancyCreate):
     id: int
     created_at: datetime
     updated_at: datetime
+    applications_count: Optional[int] = None     # faqat ro'yxatlarda
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class VacancyFacets(BaseModel):
+    type: Dict[str, int]         # {"full-time": 4, "part-time": 2}
+    location: Dict[str, int]
+
+
+class VacancyBoard(BaseModel):
+    items: List[VacancyResponse]
+    facets: VacancyFacets
+    total: int
+
+
 # ================================
 # Blog
 # ================================
@@ -197,10 +437,29 @@ class BlogCreate(BaseModel):
     short_text: str
     content: str
     status: str = "draft"
+    slug: Optional[str] = None        # berilmasa sarlavhadan yasaladi
 
 
 class BlogResponse(BlogCreate):
     id: int
+    content_html: Optional[str] = None
+    youtube_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Ro'yxat kartochkalari uchun: content / content_html yuklanmaydi
+class BlogSummary(BaseModel):
+    id: int
+    title: str
+    slug: Optional[str] = None
+    image: Optional[str] = None
+    youtube_link: Optional[str] = None
+    youtube_id: Optional[str] = None
+    short_text: str
+    status: str
     created_at: datetime
     updated_at: datetime
 
@@ -229,12 +488,47 @@ class ApplicationUpdate(BaseModel):
 
 class ApplicationResponse(ApplicationCreate):
     id: int
+    course_id: Optional[int] = None     # kurs o'chirilsa NULL (ON DELETE SET NULL)
     created_at: datetime
     updated_at: datetime
+    duplicate_of_application_id: Optional[int] = None
+    duplicate_of_student_id: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class DuplicateMember(BaseModel):
+    kind: str               # application | student
+    id: int
+    full_name: str
+    phone: str
+
+
+class ApplicationBulkStatus(BaseModel):
+    ids: List[int]
+    status: str                          # pending | active | rejected
+    group_id: Optional[int] = None       # active bo'lganda o'quvchilarni shu guruhga qo'shish
+
+
+class ApplicationBulkStatusResult(BaseModel):
+    updated: int
+    students_created: int
+    added_to_group: int
+    not_found: List[int] = []
+
+
+class ApplicationFacets(BaseModel):
+    status: Dict[str, int]      # {"pending": 120, "active": 40, ...}
+    course: Dict[int, int]      # {course_id: soni}
+
+
+class ApplicationInbox(BaseModel):
+    items: List[ApplicationResponse]
+    facets: ApplicationFacets
+    total: int
+    next_cursor: Optional[str] = None
+
+
 # ================================
 # GroupStudent
 # ================================
@@ -255,6 +549,32 @@ class GroupStudentResponse(GroupStudentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+GroupStudentExpanded = with_expand(GroupStudentResponse, group=GroupResponse, student=StudentResponse)
+
+
+class GroupStudentBulk(BaseModel):
+    group_id: int
+    add: List[int] = []          # student_id'lar
+    remove: List[int] = []
+
+
+class GroupStudentBulkResult(BaseModel):
+    added: int
+    removed: int
+    not_found: List[int] = []    # mavjud bo'lmagan student_id'lar (add)
+
+
+class GroupStudentTransfer(BaseModel):
+    from_group_id: int
+    to_group_id: int
+    student_ids: List[int]
+
+
+class GroupStudentTransferResult(BaseModel):
+    moved: int                   # manba guruhdan olib tashlanganlar
+    added: int                   # maqsad guruhga yangi qo'shilganlar (oldin u yerda bo'lmaganlar)
+
+
 # ================================
 # Vacancy Application
 # ================================
@@ -290,12 +610,20 @@ class VacancyApplicationUpdate(BaseModel):
 
 class VacancyApplicationResponse(VacancyApplicationBase):
     id: int
+    vacancy_id: Optional[int] = None    # vakansiya o'chirilgan bo'lsa (SET NULL)
     created_at: datetime
     updated_at: datetime
     vacancy_title: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class VacancyApplicationInbox(BaseModel):
+    items: List[VacancyApplicationResponse]
+    counts: Dict[str, int]          # {"pending": 12, "accepted": 3, ...}
+    total: int
+    next_cursor: Optional[str] = None
+
 # ================================
 # Payment (To'lovlar)
 # ================================
@@ -325,6 +653,9 @@ class PaymentResponse(PaymentCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+PaymentExpanded = with_expand(PaymentResponse, student=StudentResponse, course=CourseResponse)
+
+
 # O'quvchining kursi va to'lovlari birgalikda
 class StudentCourseWithPayments(BaseModel):
     course_id: int
@@ -334,4 +665,122 @@ class StudentCourseWithPayments(BaseModel):
     enrollment_status: str
     payments: List[PaymentResponse] = []
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# ================================
+# Payroll (o'qituvchi oyligi)
+# ================================
+class PayrollRuleCreate(BaseModel):
+    percent: Decimal
+    fixed_amount: int = 0
+
+    @field_validator('percent')
+    @classmethod
+    def check_percent(cls, v):
+        if not 0 <= v <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        return v
+
+
+class PayrollRuleResponse(PayrollRuleCreate):
+    id: int
+    teacher_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PayrollItemResponse(BaseModel):
+    teacher_id: Optional[int] = None
+    payments_count: int
+    collected: int
+    percent: Decimal
+    fixed_amount: int
+    payout: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PayrollRunResponse(BaseModel):
+    id: int
+    month: str
+    revision: int
+    checksum: str
+    teachers_count: int
+    total_collected: int
+    total_payout: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PayrollRunDetail(PayrollRunResponse):
+    items: List[PayrollItemResponse] = []
+
+
+# ================================
+# Attendance (davomat)
+# ================================
+class AttendanceMark(BaseModel):
+    present: List[int] = []      # darsda bo'lgan student_id'lar; qolganlar — kelmagan
+
+
+class AttendanceStudent(BaseModel):
+    student_id: int
+    present_days: List[int]
+    absent_days: List[int]
+    rate: Optional[float] = None
+
+
+class AttendanceMonthResponse(BaseModel):
+    group_id: int
+    month: str
+    lesson_days: List[int]
+    students: List[AttendanceStudent]
+
+
+class AttendanceReportRow(BaseModel):
+    id: int                      # group_id yoki teacher_id (?by=)
+    month: str
+    lessons: int
+    attended: int
+    expected: int
+    rate: Optional[float] = None
+
+
+# ================================
+# Delta sync
+# ================================
+class TombstoneItem(BaseModel):
+    entity: str                  # jadval nomi
+    id: int
+    deleted_at: datetime
+
+
+class TombstonePage(BaseModel):
+    items: List[TombstoneItem]
+    watermark: datetime          # keyingi so'rov uchun since
+
+
+# ================================
+# Batch (bir nechta GET so'rovni bitta round trip'da)
+# ================================
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None     # javobni so'rov bilan moslash uchun (ixtiyoriy)
+    method: str = "GET"
+    path: str                    # masalan: "/groups/5" yoki "/payments/?month=2026-02"
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
@@ -0,0 +1,146 @@
+# app/snapshot.py
+# Public sayt uchun oldindan tayyorlangan JSON (gzip) snapshotlar
+#
+# /public/{name} javobi xotiradagi tayyor baytlardan beriladi (ETag bilan);
+# baza faqat snapshot eskirganda bir marta so'raladi. Course / Teacher /
+# Blog / Vacancy commitlari tegishli snapshotni eskirgan deb belgilaydi.
+# Invalidatsiya faqat shu worker ichida — boshqa workerlar SNAPSHOT_TTL
+# tugagach yangilanadi.
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session, load_only
+
+from app.database import SessionLocal
+from app import models, schemas
+
+SNAPSHOT_TTL = float(os.getenv("SNAPSHOT_TTL", "300"))
+
+
+def _dump(schema, rows) -> bytes:
+    adapter = TypeAdapter(List[schema])
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+class Blob:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=9)
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        self.built_at = time.monotonic()
+
+
+# =====================================
+# Builderlar (public payloadlar)
+# =====================================
+def _build_courses(db: Session) -> bytes:
+    courses = db.query(models.Course).order_by(models.Course.id).all()
+    return _dump(schemas.CourseResponse, courses)
+
+
+def _build_teachers(db: Session) -> bytes:
+    teachers = db.query(models.Teacher).order_by(models.Teacher.id).all()
+    return _dump(schemas.TeacherResponse, teachers)
+
+
+def _build_vacancies(db: Session) -> bytes:
+    vacancies = db.query(models.Vacancy).filter(
+        models.Vacancy.status == "active"
+    ).order_by(models.Vacancy.created_at.desc()).all()
+    return _dump(schemas.VacancyResponse, vacancies)
+
+
+def _build_blogs(db: Session) -> bytes:
+    # Kartochkalar uchun summary; to'liq matn — /blogs/slug/{slug}
+    blogs = db.query(models.Blog).options(load_only(
+        models.Blog.id, models.Blog.title, models.Blog.slug, models.Blog.image,
+        models.Blog.short_text, models.Blog.status,
+        models.Blog.created_at, models.Blog.updated_at,
+    )).filter(
+        models.Blog.status == "published"
+    ).order_by(models.Blog.created_at.desc()).all()
+    return _dump(schemas.BlogSummary, blogs)
+
+
+BUILDERS = {
+    "courses": _build_courses,
+    "teachers": _build_teachers,
+    "vacancies": _build_vacancies,
+    "blogs": _build_blogs,
+}
+
+# Model -> qaysi snapshotlarga ta'sir qiladi
+_SOURCES = {
+    models.Course: "courses",
+    models.Teacher: "teachers",
+    models.Tag: "teachers",
+    models.Vacancy: "vacancies",
+    models.Blog: "blogs",
+}
+
+
+class SnapshotStore:
+    def __init__(self, builders: dict, ttl: float):
+        self.builders = builders
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._blobs = {}
+
+    def get(self, name: str) -> Blob:
+        """Tayyor blob; yo'q yoki eskirgan bo'lsa — bitta thread qayta quradi, qolganlar kutadi."""
+        blob = self._blobs.get(name)
+        if blob is not None and time.monotonic() - blob.built_at < self.ttl:
+            return blob
+
+        with self._lock:
+            blob = self._blobs.get(name)
+            if blob is None or time.monotonic() - blob.built_at >= self.ttl:
+                blob = self._build(self.builders[name])
+                self._blobs[name] = blob
+            return blob
+
+    def _build(self, builder: Callable) -> Blob:
+        db = SessionLocal()
+        try:
+            return Blob(builder(db))
+        finally:
+            db.close()
+
+    def mark_stale(self, names) -> None:
+        with self._lock:
+            for name in names:
+                self._blobs.pop(name, None)
+
+
+store = SnapshotStore(BUILDERS, SNAPSHOT_TTL)
+
+
+# =====================================
+# Invalidatsiya (ORM yozuvlari)
+# =====================================
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    names = session.info.setdefault("snapshot_stale", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = _SOURCES.get(type(obj))
+        if name:
+            names.add(name)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _apply_changes(session):
+    names = session.info.pop("snapshot_stale", None)
+    if names:
+        store.mark_stale(names)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("snapshot_stale", None)
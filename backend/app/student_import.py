@@ -0,0 +1,231 @@
+# app/student_import.py
+# O'quvchilarni CSV/XLSX fayldan ommaviy import qilish
+#
+# Fayl qatorma-qator o'qiladi, CHUNK_SIZE tadan StudentCreate bilan tekshiriladi
+# va har bir chunk bitta tranzaksiyada upsert qilinadi (phone bo'yicha):
+#   Postgres — COPY vaqtinchalik jadvalga, keyin INSERT ... SELECT ... ON CONFLICT
+#   SQLite   — executemany INSERT ... ON CONFLICT DO UPDATE
+
+import codecs
+import csv
+import io
+from datetime import datetime
+from typing import Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models, schemas, dedup, cache
+from app.query_utils import dialect_insert
+
+CHUNK_SIZE = 500
+FIELDS = ["full_name", "phone", "email", "school", "grade", "address"]
+
+
+# =====================================
+# Fayldan qatorlarni o'qish (header -> dict)
+# =====================================
+def _normalize_header(value) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _iter_csv(fileobj) -> Iterator[dict]:
+    reader = csv.reader(codecs.getreader("utf-8-sig")(fileobj))
+    header = [_normalize_header(h) for h in next(reader, [])]
+    for values in reader:
+        yield dict(zip(header, values))
+
+
+def _iter_xlsx(fileobj) -> Iterator[dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import uchun openpyxl o'rnatilmagan")
+
+    sheet = load_workbook(fileobj, read_only=True, data_only=True).active
+    rows = sheet.iter_rows(values_only=True)
+    header = [_normalize_header(h) for h in next(rows, [])]
+    for values in rows:
+        yield dict(zip(header, values))
+
+
+def iter_rows(fileobj, filename: str) -> Iterator[dict]:
+    if (filename or "").lower().endswith((".xlsx", ".xlsm")):
+        return _iter_xlsx(fileobj)
+    return _iter_csv(fileobj)
+
+
+# =====================================
+# Tekshirish
+# =====================================
+def _clean(raw: dict) -> dict:
+    data = {}
+    for field in FIELDS:
+        value = raw.get(field)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value:
+            data[field] = value
+    return data
+
+
+def _validate(row_no: int, raw: dict, report: dict):
+    try:
+        return schemas.StudentCreate(**_clean(raw)).dict()
+    except ValidationError as e:
+        report["errors"].append({
+            "row": row_no,
+            "errors": [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+        })
+        return None
+
+
+# =====================================
+# Upsert
+# =====================================
+def _upsert_sqlite(db: Session, rows: list) -> None:
+    stmt = dialect_insert(db, models.Student)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["phone"],
+        index_where=models.Student.deleted_at.is_(None),   # uq_students_phone_live
+        set_={
+            "full_name": stmt.excluded.full_name,
+            "email": func.coalesce(stmt.excluded.email, models.Student.email),
+            "school": stmt.excluded.school,
+            "grade": stmt.excluded.grade,
+            "address": func.coalesce(stmt.excluded.address, models.Student.address),
+            "updated_at": datetime.utcnow(),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def _upsert_postgres(db: Session, rows: list) -> None:
+    db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS student_import_stage ("
+        "full_name text, phone text, email text, school text, grade text, address text"
+        ") ON COMMIT DELETE ROWS"
+    ))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row.get(f) for f in FIELDS])
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY student_import_stage ({', '.join(FIELDS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+    # Bo'sh CSV maydoni COPY'da NULL bo'ladi
+    db.execute(text(
+        "INSERT INTO students (full_name, phone, email, school, grade, address, created_at, updated_at) "
+        "SELECT full_name, phone, email, school, grade, address, :now, :now FROM student_import_stage "
+        "ON CONFLICT (phone) WHERE deleted_at IS NULL DO UPDATE SET "
+        "full_name = EXCLUDED.full_name, "
+        "email = COALESCE(EXCLUDED.email, students.email), "
+        "school = EXCLUDED.school, "
+        "grade = EXCLUDED.grade, "
+        "address = COALESCE(EXCLUDED.address, students.address), "
+        "updated_at = EXCLUDED.updated_at"
+    ), {"now": datetime.utcnow()})
+    db.execute(text("DELETE FROM student_import_stage"))
+
+
+def _upsert(db: Session, rows: list) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        _upsert_postgres(db, rows)
+    else:
+        _upsert_sqlite(db, rows)
+
+
+def _conflict_error(db: Session, data: dict, exc: IntegrityError) -> str:
+    """Qaysi noyob ustun to'qnashganini tirik o'quvchilar orasidan aniqlaydi."""
+    if data.get("email") and db.query(models.Student.id).filter(
+        models.Student.email == data["email"],
+        models.Student.phone != data["phone"],
+    ).first():
+        return "email: boshqa o'quvchida mavjud"
+    return f"database: {str(exc.orig).splitlines()[0][:200]}"
+
+
+def _load_chunk(db: Session, chunk: list, report: dict) -> None:
+    """chunk: [(row_no, data)]. Bitta tranzaksiya; xato bo'lsa qatorma-qator ajratiladi."""
+    # Fayl ichida bir xil telefon — oxirgisi qoladi
+    by_phone = {}
+    for row_no, data in chunk:
+        if data["phone"] in by_phone:
+            report["errors"].append({
+                "row": by_phone[data["phone"]][0],
+                "errors": [f"phone: {row_no}-qatorda takrorlangan, o'sha qator ishlatildi"],
+            })
+        by_phone[data["phone"]] = (row_no, data)
+    chunk = list(by_phone.values())
+
+    # O'chirilgan (soft delete) o'quvchining telefoni bu ro'yxatga kirmaydi:
+    # uq_students_phone_live faqat tirik qatorlar orasida, shuning uchun
+    # bunday qator yangi tirik o'quvchi sifatida yoziladi va "inserted" hisoblanadi
+    existing = {
+        row.phone for row in db.query(models.Student.phone).filter(
+            models.Student.phone.in_(list(by_phone))
+        )
+    }
+
+    try:
+        _upsert(db, [data for _, data in chunk])
+        db.commit()
+        loaded = chunk
+    except IntegrityError:
+        # Masalan, email boshqa o'quvchida bor — xatoli qatorlarni topish uchun bittalab
+        db.rollback()
+        loaded = []
+        for row_no, data in chunk:
+            try:
+                with db.begin_nested():
+                    _upsert(db, [data])
+                loaded.append((row_no, data))
+            except IntegrityError as exc:
+                report["errors"].append({"row": row_no, "errors": [_conflict_error(db, data, exc)]})
+        db.commit()
+
+    for _, data in loaded:
+        if data["phone"] in existing:
+            report["updated"] += 1
+        else:
+            report["inserted"] += 1
+
+
+def import_students(db: Session, fileobj, filename: str) -> dict:
+    report = {"total_rows": 0, "inserted": 0, "updated": 0, "failed": 0, "errors": []}
+
+    chunk = []
+    # 1-qator — sarlavha
+    for row_no, raw in enumerate(iter_rows(fileobj, filename), start=2):
+        if not any(v not in (None, "") for v in raw.values()):
+            continue
+        report["total_rows"] += 1
+        data = _validate(row_no, raw, report)
+        if data is not None:
+            chunk.append((row_no, data))
+        if len(chunk) >= CHUNK_SIZE:
+            _load_chunk(db, chunk, report)
+            chunk = []
+
+    if chunk:
+        _load_chunk(db, chunk, report)
+
+    report["failed"] = len({e["row"] for e in report["errors"]})
+    report["errors"].sort(key=lambda e: e["row"])
+
+    # Core upsert ORM eventlaridan o'tmaydi
+    dedup.index.invalidate()
+    cache.student_overview.clear()
+    return report
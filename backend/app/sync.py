@@ -0,0 +1,95 @@
+# app/sync.py
+# Delta sync: o'chirilgan qatorlar (tombstone) yozuvi va o'qilishi
+#
+# Soft delete modellari uchun qatorning o'zi tombstone (deleted_at);
+# jismoniy o'chiriladigan modellar uchun tombstones jadvaliga yoziladi —
+# ORM delete'lar avtomatik, Core DELETE'lar record() orqali. Bazaning
+# ON DELETE CASCADE bilan o'chirgan bola qatorlari yozilmaydi: mijoz
+# ota qator tombstone'i bo'yicha ularni ham o'chiradi.
+
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app import models
+
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "90"))
+
+
+def record(db: Session, entity: str, row_ids: Iterable[int]) -> None:
+    """Core DELETE'dan keyin: shu tranzaksiyada tombstone'lar."""
+    now = datetime.utcnow()
+    rows = [{"entity": entity, "row_id": row_id, "deleted_at": now} for row_id in row_ids]
+    if rows:
+        db.execute(insert(models.Tombstone), rows)
+
+
+def oldest_available() -> datetime:
+    """Bundan oldingi since bilan tombstone'lar to'liq emas — to'liq qayta yuklash kerak."""
+    return datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+
+def tombstones(db: Session, since: datetime, entity: Optional[str] = None) -> list:
+    items = []
+
+    query = select(
+        models.Tombstone.entity, models.Tombstone.row_id, models.Tombstone.deleted_at
+    ).where(models.Tombstone.deleted_at >= since)
+    if entity:
+        query = query.where(models.Tombstone.entity == entity)
+    items.extend(
+        {"entity": row.entity, "id": row.row_id, "deleted_at": row.deleted_at}
+        for row in db.execute(query)
+    )
+
+    for model in models.SOFT_DELETE_MODELS:
+        if entity and entity != model.__tablename__:
+            continue
+        rows = db.execute(
+            select(model.id, model.deleted_at)
+            .where(model.deleted_at.isnot(None), model.deleted_at >= since)
+            .execution_options(include_deleted=True)
+        )
+        items.extend(
+            {"entity": model.__tablename__, "id": row.id, "deleted_at": row.deleted_at}
+            for row in rows
+        )
+
+    items.sort(key=lambda item: (item["deleted_at"], item["entity"], item["id"]))
+    return items
+
+
+def purge_tombstones(db: Session, retention_days: int = TOMBSTONE_RETENTION_DAYS) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = db.execute(
+        delete(models.Tombstone).where(models.Tombstone.deleted_at < cutoff),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return result.rowcount
+
+
+# =====================================
+# ORM delete'lar
+# =====================================
+def _is_hard_deleted(obj) -> bool:
+    return (
+        isinstance(obj, models.TimestampMixin)
+        and not isinstance(obj, models.SoftDeleteMixin)
+        and getattr(obj, "id", None) is not None
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_deletes(session, flush_context):
+    now = datetime.utcnow()
+    rows = [
+        {"entity": obj.__tablename__, "row_id": obj.id, "deleted_at": now}
+        for obj in session.deleted if _is_hard_deleted(obj)
+    ]
+    if rows:
+        session.connection().execute(insert(models.Tombstone.__table__), rows)
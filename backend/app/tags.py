@@ -0,0 +1,46 @@
+# app/tags.py
+# O'qituvchi teglari: "React, Frontend" satri <-> tags / teacher_tags jadvallari
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.query_utils import dialect_insert
+
+
+def slugify(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def parse_tags(value: Optional[str]) -> list:
+    """"React, frontend,react" -> ["React", "frontend"] (takrorlarsiz, tartib saqlanadi)."""
+    names = {}
+    for part in (value or "").split(","):
+        name = " ".join(part.split())
+        if name:
+            names.setdefault(slugify(name), name)
+    return list(names.values())
+
+
+def resolve_tags(db: Session, names: list) -> list:
+    """Nomlar -> Tag obyektlari; yo'qlari INSERT ... ON CONFLICT (slug) DO NOTHING bilan yaratiladi."""
+    if not names:
+        return []
+    rows = [{"name": name, "slug": slugify(name)} for name in names]
+    db.execute(
+        dialect_insert(db, models.Tag)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["slug"])
+    )
+    slugs = [row["slug"] for row in rows]
+    by_slug = {
+        tag.slug: tag
+        for tag in db.execute(select(models.Tag).where(models.Tag.slug.in_(slugs))).scalars()
+    }
+    return [by_slug[slug] for slug in slugs]
+
+
+def set_teacher_tags(db: Session, teacher: models.Teacher, value: Optional[str]) -> None:
+    teacher.tag_list = resolve_tags(db, parse_tags(value))
@@ -0,0 +1,36 @@
+"""vacancy applications inbox indexes
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_vacancy_applications_status_created", "vacancy_applications",
+        ["status", "created_at", "id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_vacancy_applications_vacancy_status", "vacancy_applications",
+        ["vacancy_id", "status"], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vacancy_applications_vacancy_status", table_name="vacancy_applications")
+    op.drop_index("ix_vacancy_applications_status_created", table_name="vacancy_applications")
@@ -0,0 +1,67 @@
+"""native JSON columns for vacancy requirements and application certificates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_vacancy_applications_certificate_level", "vacancy_applications",
+        ["certificate_level"], if_not_exists=True,
+    )
+
+    # SQLite'da JSON baribir TEXT sifatida saqlanadi — mavjud qatorlar o'zgarishsiz o'qiladi
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE vacancies ALTER COLUMN requirements TYPE JSONB "
+        "USING COALESCE(NULLIF(requirements, ''), '[]')::jsonb"
+    )
+    op.execute(
+        "ALTER TABLE vacancy_applications ALTER COLUMN certificates DROP DEFAULT"
+    )
+    op.execute(
+        "ALTER TABLE vacancy_applications ALTER COLUMN certificates TYPE JSONB "
+        "USING COALESCE(NULLIF(certificates, ''), '[]')::jsonb"
+    )
+    op.create_index(
+        "ix_vacancies_requirements_gin", "vacancies", ["requirements"],
+        postgresql_using="gin", if_not_exists=True,
+    )
+    op.create_index(
+        "ix_vacancy_applications_certificates_gin", "vacancy_applications", ["certificates"],
+        postgresql_using="gin", if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_vacancy_applications_certificate_level", table_name="vacancy_applications")
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_vacancy_applications_certificates_gin", table_name="vacancy_applications")
+    op.drop_index("ix_vacancies_requirements_gin", table_name="vacancies")
+    op.execute(
+        "ALTER TABLE vacancy_applications ALTER COLUMN certificates TYPE TEXT USING certificates::text"
+    )
+    op.execute(
+        "ALTER TABLE vacancies ALTER COLUMN requirements TYPE TEXT USING requirements::text"
+    )
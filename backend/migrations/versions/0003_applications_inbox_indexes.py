@@ -0,0 +1,43 @@
+"""applications inbox indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_applications_status_created", "applications",
+        ["status", "created_at", "id"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_applications_course_status", "applications",
+        ["course_id", "status"], if_not_exists=True,
+    )
+    op.create_index(
+        "ix_applications_pending_created", "applications", ["created_at", "id"],
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_applications_pending_created", table_name="applications")
+    op.drop_index("ix_applications_course_status", table_name="applications")
+    op.drop_index("ix_applications_status_created", table_name="applications")
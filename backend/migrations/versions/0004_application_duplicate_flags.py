@@ -0,0 +1,42 @@
+"""application duplicate flags
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("applications") as batch:
+        batch.add_column(sa.Column("duplicate_of_application_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("duplicate_of_student_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_applications_duplicate_of_application", "applications",
+            ["duplicate_of_application_id"], ["id"], ondelete="SET NULL",
+        )
+        batch.create_foreign_key(
+            "fk_applications_duplicate_of_student", "students",
+            ["duplicate_of_student_id"], ["id"], ondelete="SET NULL",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("applications") as batch:
+        batch.drop_constraint("fk_applications_duplicate_of_student", type_="foreignkey")
+        batch.drop_constraint("fk_applications_duplicate_of_application", type_="foreignkey")
+        batch.drop_column("duplicate_of_student_id")
+        batch.drop_column("duplicate_of_application_id")
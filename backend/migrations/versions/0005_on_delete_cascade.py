@@ -0,0 +1,51 @@
+"""ON DELETE CASCADE for groups, group_students and enrollments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (jadval, ustun, bog'langan jadval) — Postgres standart nomi: <jadval>_<ustun>_fkey
+FOREIGN_KEYS = [
+    ("groups", "course_id", "courses"),
+    ("groups", "teacher_id", "teachers"),
+    ("group_students", "group_id", "groups"),
+    ("group_students", "student_id", "students"),
+    ("enrollments", "student_id", "students"),
+    ("enrollments", "course_id", "courses"),
+]
+
+
+def _recreate(ondelete) -> None:
+    for table, column, referent in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referent, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite'da FK'ni joyida o'zgartirib bo'lmaydi; lokal baza create_all bilan qayta yaratiladi
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _recreate("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _recreate(None)
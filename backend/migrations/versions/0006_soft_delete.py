@@ -0,0 +1,75 @@
+"""soft delete columns, partial indexes and live-only unique phone/email
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# group_students, enrollments, payments — o'z deleted_at'i yo'q: ota qator
+# o'chirilgan bo'lsa ORM filtrida yashiriladi (models.LIVE_PARENTS)
+TABLES = ["students", "teachers", "courses", "groups", "blogs", "vacancies"]
+
+# (jadval, ustun) — noyob faqat tirik qatorlar orasida.
+# Postgres standart constraint nomi: <jadval>_<ustun>_key
+LIVE_UNIQUE = [("students", "phone"), ("students", "email"), ("teachers", "phone")]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(), nullable=True))
+        op.create_index(
+            f"ix_{table}_live", table, ["id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            sqlite_where=sa.text("deleted_at IS NULL"),
+        )
+        op.create_index(
+            f"ix_{table}_deleted_at", table, ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+            sqlite_where=sa.text("deleted_at IS NOT NULL"),
+        )
+
+    # SQLite'da inline UNIQUE'ni joyida olib bo'lmaydi; lokal baza create_all bilan qayta yaratiladi
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for table, column in LIVE_UNIQUE:
+        if postgres:
+            op.drop_constraint(f"{table}_{column}_key", table, type_="unique")
+        op.create_index(
+            f"uq_{table}_{column}_live", table, [column], unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            sqlite_where=sa.text("deleted_at IS NULL"),
+        )
+
+    # ondelete="SET NULL" ishlashi uchun (purge vakansiyani o'chirganda)
+    with op.batch_alter_table("vacancy_applications") as batch:
+        batch.alter_column("vacancy_id", existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("vacancy_applications") as batch:
+        batch.alter_column("vacancy_id", existing_type=sa.Integer(), nullable=False)
+
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for table, column in LIVE_UNIQUE:
+        op.drop_index(f"uq_{table}_{column}_live", table_name=table)
+        if postgres:
+            op.create_unique_constraint(f"{table}_{column}_key", table, [column])
+
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_deleted_at", table_name=table)
+        op.drop_index(f"ix_{table}_live", table_name=table)
+        op.drop_column(table, "deleted_at")
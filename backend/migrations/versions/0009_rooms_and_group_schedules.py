@@ -0,0 +1,59 @@
+"""rooms and group_schedules tables
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rooms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("capacity", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_rooms_id", "rooms", ["id"], if_not_exists=True)
+
+    op.create_table(
+        "group_schedules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("group_id", sa.Integer(), sa.ForeignKey("groups.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("weekday", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_group_schedules_group", "group_schedules", ["group_id"], if_not_exists=True)
+    op.create_index(
+        "ix_group_schedules_room_weekday", "group_schedules",
+        ["room_id", "weekday"], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_group_schedules_room_weekday", table_name="group_schedules")
+    op.drop_index("ix_group_schedules_group", table_name="group_schedules")
+    op.drop_table("group_schedules")
+    op.drop_index("ix_rooms_id", table_name="rooms")
+    op.drop_table("rooms")
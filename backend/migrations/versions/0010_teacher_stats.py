@@ -0,0 +1,42 @@
+"""teacher_stats rollup table
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "teacher_stats",
+        sa.Column(
+            "teacher_id", sa.Integer(),
+            sa.ForeignKey("teachers.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("groups_count", sa.Integer(), nullable=False),
+        sa.Column("students_count", sa.Integer(), nullable=False),
+        sa.Column("payments_count", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.BigInteger(), nullable=False),
+        sa.Column("pending", sa.BigInteger(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    # Jadvalni to'ldirish: python -m app.rollups
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("teacher_stats")
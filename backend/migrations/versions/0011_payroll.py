@@ -0,0 +1,77 @@
+"""payroll rules, runs and items
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "payroll_rules",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "teacher_id", sa.Integer(),
+            sa.ForeignKey("teachers.id", ondelete="CASCADE"), nullable=False, unique=True,
+        ),
+        sa.Column("percent", sa.Numeric(5, 2), nullable=False),
+        sa.Column("fixed_amount", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "payroll_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("month", sa.String(), nullable=False),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("checksum", sa.String(64), nullable=False),
+        sa.Column("teachers_count", sa.Integer(), nullable=False),
+        sa.Column("total_collected", sa.BigInteger(), nullable=False),
+        sa.Column("total_payout", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("month", "revision", name="unique_payroll_run_revision"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "payroll_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "run_id", sa.Integer(),
+            sa.ForeignKey("payroll_runs.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column(
+            "teacher_id", sa.Integer(),
+            sa.ForeignKey("teachers.id", ondelete="SET NULL"), nullable=True,
+        ),
+        sa.Column("payments_count", sa.Integer(), nullable=False),
+        sa.Column("collected", sa.BigInteger(), nullable=False),
+        sa.Column("percent", sa.Numeric(5, 2), nullable=False),
+        sa.Column("fixed_amount", sa.Integer(), nullable=False),
+        sa.Column("payout", sa.BigInteger(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_payroll_items_run", "payroll_items", ["run_id"], if_not_exists=True)
+    op.create_index("ix_payroll_items_teacher", "payroll_items", ["teacher_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_payroll_items_teacher", table_name="payroll_items")
+    op.drop_index("ix_payroll_items_run", table_name="payroll_items")
+    op.drop_table("payroll_items")
+    op.drop_table("payroll_runs")
+    op.drop_table("payroll_rules")
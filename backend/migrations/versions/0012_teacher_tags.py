@@ -0,0 +1,103 @@
+"""normalize teachers.tags into tags / teacher_tags
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _slug(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tags = op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("slug", sa.String(), nullable=False, unique=True),
+        if_not_exists=True,
+    )
+    teacher_tags = op.create_table(
+        "teacher_tags",
+        sa.Column(
+            "teacher_id", sa.Integer(),
+            sa.ForeignKey("teachers.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column(
+            "tag_id", sa.Integer(),
+            sa.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_teacher_tags_tag_teacher", "teacher_tags",
+        ["tag_id", "teacher_id"], if_not_exists=True,
+    )
+
+    # Mavjud "React, Frontend" satrlarini ajratish
+    # (jadval oldindan bor va to'ldirilgan bo'lsa — id'lar to'qnashmasligi uchun o'tkazib yuboriladi)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, tags FROM teachers WHERE tags IS NOT NULL")).all()
+
+    tag_ids, links = {}, []
+    for teacher_id, value in rows:
+        seen = set()
+        for part in value.split(","):
+            name = " ".join(part.split())
+            slug = _slug(name)
+            if not name or slug in seen:
+                continue
+            seen.add(slug)
+            if slug not in tag_ids:
+                tag_ids[slug] = (len(tag_ids) + 1, name)
+            links.append({"teacher_id": teacher_id, "tag_id": tag_ids[slug][0]})
+
+    if tag_ids and not bind.execute(sa.text("SELECT 1 FROM tags LIMIT 1")).first():
+        op.bulk_insert(tags, [
+            {"id": tag_id, "name": name, "slug": slug}
+            for slug, (tag_id, name) in tag_ids.items()
+        ])
+        op.bulk_insert(teacher_tags, links)
+        if bind.dialect.name == "postgresql":
+            op.execute("SELECT setval('tags_id_seq', (SELECT MAX(id) FROM tags))")
+
+    with op.batch_alter_table("teachers") as batch:
+        batch.drop_column("tags")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("teachers") as batch:
+        batch.add_column(sa.Column("tags", sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT tt.teacher_id, t.name FROM teacher_tags tt "
+        "JOIN tags t ON t.id = tt.tag_id ORDER BY tt.teacher_id, t.name"
+    )).all()
+    joined = {}
+    for teacher_id, name in rows:
+        joined.setdefault(teacher_id, []).append(name)
+    for teacher_id, names in joined.items():
+        bind.execute(
+            sa.text("UPDATE teachers SET tags = :tags WHERE id = :id"),
+            {"tags": ", ".join(names), "id": teacher_id},
+        )
+
+    op.drop_index("ix_teacher_tags_tag_teacher", table_name="teacher_tags")
+    op.drop_table("teacher_tags")
+    op.drop_table("tags")
@@ -0,0 +1,173 @@
+"""blogs: slug, pre-rendered content_html, youtube_id, status index
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+import html
+import re
+import unicodedata
+from html.parser import HTMLParser
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# =====================================
+# app/blog_render.py ning shu reviziyadagi muzlatilgan nusxasi —
+# keyinchalik ilova kodi o'zgarsa ham migratsiya natijasi o'zgarmaydi
+# =====================================
+_YOUTUBE_ID = re.compile(r"(?:youtu\.be/|v/|embed/|watch\?v=|&v=)([\w-]{11})")
+_YOUTUBE_LINE = re.compile(
+    r"^\s*(?:<p>\s*)?(https?://(?:www\.)?(?:youtube\.com|youtu\.be)/\S+?)(?:\s*</p>)?\s*$",
+    re.MULTILINE,
+)
+_HTML_TAG = re.compile(r"<(p|div|br|h[1-6]|ul|ol|li|img|a|strong|em|blockquote|iframe)\b", re.IGNORECASE)
+_EMBED = (
+    '<div class="video-embed"><iframe src="https://www.youtube.com/embed/{id}" '
+    'title="YouTube video" frameborder="0" allowfullscreen></iframe></div>'
+)
+_ALLOWED_TAGS = {
+    "p", "div", "span", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
+    "ul", "ol", "li", "strong", "b", "em", "i", "u", "s", "blockquote",
+    "code", "pre", "a", "img", "table", "thead", "tbody", "tr", "th", "td",
+}
+_VOID_TAGS = {"br", "hr", "img"}
+_ALLOWED_ATTRS = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "th": {"colspan", "rowspan"},
+    "td": {"colspan", "rowspan"},
+}
+_SAFE_URL = re.compile(r"^(?:https?:|mailto:|/|#)", re.IGNORECASE)
+_DROP_CONTENT = {"script", "style", "iframe", "object", "embed", "template", "noscript"}
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out, self.open, self.dropping = [], [], 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROP_CONTENT:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in _ALLOWED_TAGS:
+            return
+        kept = [
+            f' {name}="{html.escape(value, quote=True)}"'
+            for name, value in attrs
+            if name in _ALLOWED_ATTRS.get(tag, ()) and value is not None
+            and (name not in ("href", "src") or _SAFE_URL.match(value.strip()))
+        ]
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        if tag not in _VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS and self.open and self.open[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _DROP_CONTENT:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f"</{current}>")
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(html.escape(data, quote=False))
+
+
+def _youtube_id(url):
+    match = _YOUTUBE_ID.search(url or "")
+    return match.group(1) if match else None
+
+
+def _embed(match):
+    video = _youtube_id(match.group(1))
+    return _EMBED.format(id=video) if video else match.group(0)
+
+
+def _render(content):
+    if _HTML_TAG.search(content or ""):
+        parser = _Sanitizer()
+        parser.feed(content)
+        parser.close()
+        body = "".join(parser.out) + "".join(f"</{tag}>" for tag in reversed(parser.open))
+    else:
+        paragraphs = re.split(r"\n\s*\n", (content or "").strip())
+        body = "\n".join(
+            "<p>%s</p>" % html.escape(p.strip()).replace("\n", "<br>")
+            for p in paragraphs if p.strip()
+        )
+    return _YOUTUBE_LINE.sub(_embed, body)
+
+
+def _slugify(title):
+    ascii_title = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode()
+    ascii_title = re.sub(r"['`ʻʼ‘’]", "", ascii_title)
+    return re.sub(r"[^a-z0-9]+", "-", ascii_title.lower()).strip("-") or "post"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("blogs") as batch:
+        batch.add_column(sa.Column("content_html", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("youtube_id", sa.String(), nullable=True))
+        batch.add_column(sa.Column("slug", sa.String(), nullable=True))
+
+    # Mavjud bloglar: slug + HTML
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, title, content, youtube_link FROM blogs ORDER BY id"
+    )).all()
+    taken = set()
+    for blog_id, title, content, youtube_link in rows:
+        base = slug = _slugify(title)
+        n = 2
+        while slug in taken:
+            slug, n = f"{base}-{n}", n + 1
+        taken.add(slug)
+        bind.execute(
+            sa.text(
+                "UPDATE blogs SET slug = :slug, content_html = :html, youtube_id = :yt "
+                "WHERE id = :id"
+            ),
+            {
+                "slug": slug,
+                "html": _render(content),
+                "yt": _youtube_id(youtube_link),
+                "id": blog_id,
+            },
+        )
+
+    with op.batch_alter_table("blogs") as batch:
+        batch.create_unique_constraint("uq_blogs_slug", ["slug"])
+    op.create_index("ix_blogs_status_created", "blogs", ["status", "created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_blogs_status_created", table_name="blogs")
+    with op.batch_alter_table("blogs") as batch:
+        batch.drop_constraint("uq_blogs_slug", type_="unique")
+        batch.drop_column("slug")
+        batch.drop_column("youtube_id")
+        batch.drop_column("content_html")
@@ -0,0 +1,56 @@
+"""delta sync: updated_at indexes and tombstones table
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, Sequence[str], None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNC_TABLES = (
+    "courses", "students", "teachers", "groups", "group_students", "enrollments",
+    "payments", "applications", "vacancy_applications", "vacancies", "blogs",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SYNC_TABLES:
+        op.create_index(
+            f"ix_{table}_updated_at", table,
+            ["updated_at", "id"], if_not_exists=True,
+        )
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("row_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_tombstones_deleted_at", "tombstones", ["deleted_at"], if_not_exists=True)
+    op.create_index(
+        "ix_tombstones_entity_deleted_at", "tombstones",
+        ["entity", "deleted_at"], if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tombstones_entity_deleted_at", table_name="tombstones")
+    op.drop_index("ix_tombstones_deleted_at", table_name="tombstones")
+    op.drop_table("tombstones")
+    for table in SYNC_TABLES:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
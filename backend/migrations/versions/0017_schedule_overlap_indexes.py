@@ -0,0 +1,35 @@
+"""schedule overlap indexes
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-21 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0017'
+down_revision: Union[str, Sequence[str], None] = '0016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bitta dars yozilganda kesishuv so'rovi: (group_id, weekday) va o'qituvchi guruhlari
+    op.create_index(
+        "ix_group_schedules_group_weekday", "group_schedules",
+        ["group_id", "weekday"], if_not_exists=True,
+    )
+    op.drop_index("ix_group_schedules_group", table_name="group_schedules", if_exists=True)
+    op.create_index("ix_groups_teacher", "groups", ["teacher_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_groups_teacher", table_name="groups")
+    op.create_index("ix_group_schedules_group", "group_schedules", ["group_id"], if_not_exists=True)
+    op.drop_index("ix_group_schedules_group_weekday", table_name="group_schedules")
@@ -0,0 +1,72 @@
+# tests/conftest.py
+# Testlar vaqtinchalik SQLite faylida ishlaydi; har bir test toza sxema oladi.
+#   cd backend && pip install -r requirements-dev.txt && python -m pytest -q
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="webcrm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.main import app
+from app import cache, dedup, outbox, snapshot
+
+
+@pytest.fixture(autouse=True)
+def _schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    # worker xotirasidagi holat ham testlar orasida tozalanadi
+    cache.student_overview.clear()
+    dedup.index.synced_until = None   # keyingi murojaatda to'liq qayta qurish
+    snapshot.store.mark_stale(list(snapshot.BUILDERS))
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def check(response, code=200):
+    assert response.status_code == code, (response.status_code, response.text)
+    return response.json() if response.content else None
+
+
+@pytest.fixture
+def seed(client, db):
+    """Kurs, o'qituvchi, guruh va guruhdagi 3 ta o'quvchi."""
+    course = check(client.post("/courses/", json={
+        "name": "Math", "price": 300000, "duration": "6m", "audience": "kids",
+    }), 201)
+    teacher = check(client.post("/teachers/", json={
+        "full_name": "Teacher One", "specialty": "math", "experience": "5",
+        "phone": "+998901111111", "tags": "math, olympiad",
+    }), 201)
+    group = check(client.post("/groups/", json={
+        "name": "G1", "course_id": course["id"], "teacher_id": teacher["id"],
+    }), 201)
+    students = []
+    for i in range(3):
+        student = check(client.post("/students/", json={
+            "full_name": f"Student {i}", "phone": f"+99890000000{i}", "school": "1", "grade": "5",
+        }), 201)
+        check(client.post("/group-students/", json={
+            "group_id": group["id"], "student_id": student["id"],
+        }), 201)
+        students.append(student)
+    outbox.drain(db)   # teacher_stats qayta hisobi (worker o'rniga)
+    return {"course": course, "teacher": teacher, "group": group, "students": students}
@@ -0,0 +1,33 @@
+from app import purge
+from tests.conftest import check
+
+
+def _application(client, course_id, phone="+998907776655", **extra):
+    return check(client.post("/applications/", json={
+        "full_name": "Ali Valiyev", "phone": phone, "school": "5", "grade": "7",
+        "course_id": course_id, **extra,
+    }), 201)
+
+
+def test_inbox_facets(client, seed):
+    course_id = seed["course"]["id"]
+    _application(client, course_id)
+    _application(client, course_id, phone="+998907776656", status="rejected")
+
+    body = check(client.get("/applications/inbox", params={"status": "pending"}))
+    assert body["total"] == 1
+    assert body["facets"]["status"] == {"pending": 1, "rejected": 1}
+    assert body["facets"]["course"] == {str(course_id): 1}
+
+
+def test_inbox_skips_purged_course_in_facets(client, db, seed):
+    course_id = seed["course"]["id"]
+    _application(client, course_id)
+
+    check(client.delete(f"/courses/{course_id}"), 204)
+    purge.purge(db, retention_days=0)   # course_id -> NULL (ON DELETE SET NULL)
+
+    body = check(client.get("/applications/inbox"))
+    assert body["total"] == 1
+    assert body["facets"]["status"] == {"pending": 1}
+    assert body["facets"]["course"] == {}
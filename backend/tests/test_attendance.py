@@ -0,0 +1,78 @@
+from app import attendance, models
+from tests.conftest import check
+
+
+def _month():
+    return models.AttendanceMonth(group_id=1, month="2026-10", slots=[], lessons=0, expected=b"", present=b"")
+
+
+def _slot_days(row, slot):
+    expected, present = attendance.to_int(row.expected), attendance.to_int(row.present)
+    return (attendance.days_of(attendance.slot_bits(present, slot)),
+            attendance.days_of(attendance.slot_bits(expected, slot)))
+
+
+def test_mark_lesson_assigns_slots_for_students_added_mid_month():
+    row = _month()
+    attendance.mark_lesson(row, 3, roster=[10, 20], present={10})
+    attendance.mark_lesson(row, 31, roster=[10, 20, 30], present={20, 30})
+
+    assert row.slots == [10, 20, 30]
+    assert attendance.days_of(row.lessons) == [3, 31]
+    assert _slot_days(row, 0) == ([3], [3, 31])
+    assert _slot_days(row, 1) == ([31], [3, 31])
+    assert _slot_days(row, 2) == ([31], [31])     # 3-kuni guruhda emas edi
+    assert attendance.totals(row) == (3, 5)
+    assert attendance.rate(3, 5) == 0.6
+
+
+def test_remark_and_clear_lesson_touch_only_that_day():
+    row = _month()
+    attendance.mark_lesson(row, 1, roster=[10, 20], present={10, 20})
+    attendance.mark_lesson(row, 2, roster=[10, 20], present={10, 20})
+    attendance.mark_lesson(row, 2, roster=[10], present=set())   # qayta belgilash, 20 chiqib ketgan
+
+    assert _slot_days(row, 0) == ([1], [1, 2])
+    assert _slot_days(row, 1) == ([1], [1])
+
+    attendance.clear_lesson(row, 1)
+    assert attendance.days_of(row.lessons) == [2]
+    assert attendance.totals(row) == (0, 1)
+    assert attendance.rate(0, 0) is None
+
+
+def test_group_attendance_endpoint(client, seed):
+    group_id = seed["group"]["id"]
+    students = [s["id"] for s in seed["students"]]
+    check(client.put(f"/attendance/groups/{group_id}/lessons/2026-10-05", json={"present": students[:2]}))
+
+    view = check(client.get(f"/attendance/groups/{group_id}", params={"month": "2026-10"}))
+    assert view["lesson_days"] == [5]
+    assert [(s["student_id"], s["absent_days"]) for s in view["students"]] == [
+        (students[0], []), (students[1], []), (students[2], [5]),
+    ]
+
+    assert client.get(f"/attendance/groups/{group_id}", params={"month": "2026-13"}).status_code == 400
+    assert client.get("/attendance/groups/999999", params={"month": "2026-10"}).status_code == 404
+
+
+def test_attendance_report_endpoint(client, seed):
+    group_id = seed["group"]["id"]
+    students = [s["id"] for s in seed["students"]]
+    check(client.put(f"/attendance/groups/{group_id}/lessons/2026-10-05", json={"present": students[:2]}))
+
+    report = check(client.get("/attendance/report", params={"month": "2026-10", "by": "teacher"}))
+    assert report == [{
+        "id": seed["teacher"]["id"], "month": "2026-10",
+        "lessons": 1, "attended": 2, "expected": 3, "rate": 0.6667,
+    }]
+    assert client.get("/attendance/report", params={"month": "October"}).status_code == 400
+
+
+def test_delete_lesson_endpoint(client, seed):
+    group_id = seed["group"]["id"]
+    check(client.put(f"/attendance/groups/{group_id}/lessons/2026-10-05", json={"present": []}))
+
+    check(client.delete(f"/attendance/groups/{group_id}/lessons/2026-10-05"), 204)
+    assert check(client.get(f"/attendance/groups/{group_id}", params={"month": "2026-10"}))["lesson_days"] == []
+    assert client.delete(f"/attendance/groups/{group_id}/lessons/2026-10-05").status_code == 404
@@ -0,0 +1,99 @@
+import time
+
+from app import scheduling
+from app.routes import batch
+from tests.conftest import check
+
+
+def test_batch_runs_sub_requests(client, seed):
+    body = check(client.post("/batch/", json={"requests": [
+        {"id": "group", "path": f"/groups/{seed['group']['id']}"},
+        {"id": "missing", "path": "/students/999"},
+    ]}))
+
+    responses = {item["id"]: item for item in body["responses"]}
+    assert responses["group"]["status"] == 200
+    assert responses["group"]["body"]["name"] == "G1"
+    assert responses["missing"]["status"] == 404
+
+
+def test_batch_rejects_non_get_and_nested_batch(client):
+    assert client.post("/batch/", json={"requests": [
+        {"method": "POST", "path": "/students/"},
+    ]}).status_code == 400
+    assert client.post("/batch/", json={"requests": [
+        {"path": "/batch/"},
+    ]}).status_code == 400
+
+
+def test_batch_rejects_streaming_routes(client):
+    for path in ("/events/stream", "/events/stream?topics=payments", "/events/ws", "/events"):
+        response = client.post("/batch/", json={"requests": [{"path": path}]})
+        assert response.status_code == 400, path
+
+
+def _slow_timetable(seconds):
+    def slow(*args, **kwargs):
+        time.sleep(seconds)
+        return []
+    return slow
+
+
+def test_batch_runs_sub_requests_concurrently(client, seed, monkeypatch):
+    monkeypatch.setattr(scheduling, "timetable", _slow_timetable(0.5))
+    path = f"/teachers/{seed['teacher']['id']}/timetable"
+
+    started = time.monotonic()
+    body = check(client.post("/batch/", json={"requests": [
+        {"id": str(i), "path": path} for i in range(4)
+    ]}))
+
+    assert [item["status"] for item in body["responses"]] == [200] * 4
+    assert [item["id"] for item in body["responses"]] == ["0", "1", "2", "3"]
+    assert time.monotonic() - started < 1.5
+
+
+def test_batch_reports_timeout_per_item(client, seed, monkeypatch):
+    monkeypatch.setattr(scheduling, "timetable", _slow_timetable(1))
+    monkeypatch.setattr(batch, "SUB_REQUEST_TIMEOUT", 0.2)
+    teacher_id = seed["teacher"]["id"]
+
+    body = check(client.post("/batch/", json={"requests": [
+        {"id": "slow", "path": f"/teachers/{teacher_id}/timetable"},
+        {"id": "teacher", "path": f"/teachers/{teacher_id}"},
+    ]}))
+
+    responses = {item["id"]: item for item in body["responses"]}
+    assert responses["slow"]["status"] == 504
+    assert responses["teacher"]["status"] == 200
+
+
+def test_batch_isolates_failing_sub_request(client, seed, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(scheduling, "timetable", boom)
+    teacher_id = seed["teacher"]["id"]
+
+    body = check(client.post("/batch/", json={"requests": [
+        {"id": "broken", "path": f"/teachers/{teacher_id}/timetable"},
+        {"id": "teacher", "path": f"/teachers/{teacher_id}"},
+    ]}))
+
+    responses = {item["id"]: item for item in body["responses"]}
+    assert responses["broken"]["status"] == 500
+    assert responses["teacher"]["status"] == 200
+    assert responses["teacher"]["body"]["full_name"] == "Teacher One"
+
+
+def test_batch_expand_applies_per_sub_request(client, seed):
+    group_id = seed["group"]["id"]
+
+    body = check(client.post("/batch/", json={"requests": [
+        {"id": "plain", "path": f"/groups/{group_id}"},
+        {"id": "expanded", "path": f"/groups/{group_id}?expand=course"},
+    ]}))
+
+    responses = {item["id"]: item for item in body["responses"]}
+    assert responses["plain"]["body"]["course"] is None
+    assert responses["expanded"]["body"]["course"]["name"] == "Math"
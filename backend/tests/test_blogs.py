@@ -0,0 +1,42 @@
+from app import blog_render
+from tests.conftest import check
+
+
+def test_render_strips_scripts_handlers_and_unsafe_urls():
+    body = blog_render.render(
+        '<p onclick="x()">Hi<script>alert(1)</script></p>'
+        '<a href="javascript:alert(1)">bad</a><a href="https://example.com">ok</a>'
+        '<img src="x" onerror="alert(1)"><iframe src="https://evil.example"></iframe>'
+    )
+    assert body == '<p>Hi</p><a>bad</a><a href="https://example.com">ok</a><img>'
+
+
+def test_render_plain_text_and_youtube_embed():
+    body = blog_render.render("Salom <b>\n\nhttps://youtu.be/dQw4w9WgXcQ")
+    assert body.startswith("<p>Salom &lt;b&gt;</p>")
+    assert 'src="https://www.youtube.com/embed/dQw4w9WgXcQ"' in body
+
+
+def test_create_blog_stores_sanitized_html(client):
+    blog = check(client.post("/blogs/", json={
+        "title": "Python: boshlang'ich kurs",
+        "short_text": "intro",
+        "content": "<p>Text</p><script>document.cookie</script>",
+    }), 201)
+    assert blog["slug"] == "python-boshlangich-kurs"
+    assert blog["content_html"] == "<p>Text</p>"
+
+
+def test_list_returns_summaries_and_detail_full_body(client):
+    blog = check(client.post("/blogs/", json={
+        "title": "Summary", "short_text": "intro", "content": "<p>Long body</p>",
+        "youtube_link": "https://youtu.be/dQw4w9WgXcQ",
+    }), 201)
+
+    listed = check(client.get("/blogs/"))
+    assert [item["id"] for item in listed] == [blog["id"]]
+    assert "content" not in listed[0] and "content_html" not in listed[0]
+    assert listed[0]["youtube_id"] == "dQw4w9WgXcQ"
+
+    assert check(client.get(f"/blogs/{blog['id']}"))["content_html"] == "<p>Long body</p>"
+    assert check(client.get(f"/blogs/slug/{blog['slug']}"))["content"] == "<p>Long body</p>"
@@ -0,0 +1,38 @@
+from app import cache, models
+from tests.conftest import check
+
+
+def test_set_skips_value_read_before_invalidation():
+    store = cache.TTLCache(ttl=60)
+
+    token = store.token(1)
+    store.invalidate([1])          # boshqa so'rov commit qildi
+    store.set(1, "stale", token=token)
+    assert store.get(1) is None
+
+    token = store.token(1)
+    store.clear()
+    store.set(1, "stale", token=token)
+    assert store.get(1) is None
+
+    store.set(1, "fresh", token=store.token(1))
+    assert store.get(1) == "fresh"
+
+
+def test_moving_payment_invalidates_both_students(client, db, seed):
+    old, new = (s["id"] for s in seed["students"][:2])
+    payment = check(client.post("/payments/", json={
+        "student_id": old, "course_id": seed["course"]["id"],
+        "amount": 100000, "month": "2026-10", "status": "paid",
+    }), 201)
+    check(client.get(f"/students/{old}/overview"))
+    check(client.get(f"/students/{new}/overview"))
+    assert cache.student_overview.get(old) is not None
+
+    db.get(models.Payment, payment["id"]).student_id = new
+    db.commit()
+
+    assert cache.student_overview.get(old) is None
+    assert cache.student_overview.get(new) is None
+    assert check(client.get(f"/students/{old}/overview"))["payments"] == []
+    assert len(check(client.get(f"/students/{new}/overview"))["payments"]) == 1
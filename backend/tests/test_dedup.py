@@ -0,0 +1,73 @@
+import random
+
+from sqlalchemy import insert
+
+from app import dedup, models
+from tests.conftest import check
+
+
+def _brute_force(idx, full_name, phone):
+    phone_key = dedup.normalize_phone(phone)
+    grams = dedup.trigrams(dedup.normalize_name(full_name))
+    found = set()
+    for key, (other_phone, other_grams) in idx._entries.items():
+        if phone_key and other_phone == phone_key:
+            found.add(key)
+            continue
+        if not phone_key or not other_phone or dedup._phone_diff(phone_key, other_phone) > dedup.PHONE_MAX_DIFF:
+            continue
+        common = len(grams & other_grams)
+        if common / (len(grams) + len(other_grams) - common) >= dedup.NAME_THRESHOLD:
+            found.add(key)
+    return found
+
+
+def test_find_matches_brute_force():
+    rng = random.Random(7)
+    first = ["ali", "vali", "aziz", "aziza", "dilshod", "dilnoza", "jasur", "kamola"]
+    last = ["valiyev", "aliyev", "karimov", "karimova", "toshmatov", "rahimov"]
+    idx = dedup.DuplicateIndex()
+    people = []
+    for i in range(400):
+        name = f"{rng.choice(first)} {rng.choice(last)}"
+        phone = f"90{rng.randrange(10 ** 7):07d}"
+        idx.add("student", i, name, phone)
+        people.append((name, phone))
+
+    for name, phone in people[:100]:
+        near = phone[:-1] + str((int(phone[-1]) + 1) % 10)
+        expected = _brute_force(idx, name, near)
+        assert {(kind, row_id) for kind, row_id, _ in idx.find(name, near)} == expected
+
+
+def test_empty_phones_are_not_duplicates():
+    idx = dedup.DuplicateIndex()
+    idx.add("application", 1, "Ali Valiyev", "")
+    assert idx.find("Ali Valiyev", "") == []
+    assert idx.find("Ali Valiyev", "+998901234567") == []
+
+
+def test_refresh_picks_up_core_inserts_and_soft_deletes(client, db, seed):
+    idx = dedup.get_index(db)
+    assert idx.find("Student 0", "+998900000000")
+
+    db.execute(insert(models.Student), [{
+        "full_name": "Bulk Inserted", "phone": "+998905550000", "school": "1", "grade": "5",
+    }])
+    db.commit()
+    check(client.delete(f"/students/{seed['students'][0]['id']}"), 204)
+
+    idx.synced_until = idx.synced_until.replace(year=2000)   # hammasini qayta o'qish
+    idx.invalidate()
+    dedup.get_index(db)
+
+    assert idx.find("Bulk Inserted", "+998905550000")
+    assert not idx.find("Student 0", "+998900000000")
+
+
+def test_create_application_flags_duplicate_student(client, seed):
+    app = check(client.post("/applications/", json={
+        "full_name": "student 1", "phone": "+998 90 000 00 01", "school": "1", "grade": "5",
+        "course_id": seed["course"]["id"],
+    }), 201)
+    assert app["duplicate_of_student_id"] == seed["students"][1]["id"]
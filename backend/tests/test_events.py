@@ -0,0 +1,49 @@
+import pytest
+
+from app import events
+from tests.conftest import check
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    delivered = []
+    monkeypatch.setattr(events, "_deliver", delivered.extend)
+    return delivered
+
+
+def _pay(client, seed):
+    return check(client.post("/payments/", json={
+        "student_id": seed["students"][0]["id"], "course_id": seed["course"]["id"],
+        "amount": 100000, "month": "2026-10", "status": "paid",
+    }), 201)
+
+
+def test_payment_write_emits_after_commit(client, seed, feed):
+    payment = _pay(client, seed)
+    check(client.delete(f"/payments/{payment['id']}"), 204)
+
+    assert [(e["topic"], e["op"], e["id"]) for e in feed] == [
+        ("payments", "insert", payment["id"]),
+        ("payments", "delete", payment["id"]),
+    ]
+
+
+def test_parent_soft_delete_emits_scope_deletes(client, seed, feed):
+    _pay(client, seed)
+    student_id, group_id = seed["students"][0]["id"], seed["group"]["id"]
+    feed.clear()
+
+    check(client.post("/students/bulk-delete", json={"ids": [student_id, student_id]}))
+    assert {(e["topic"], e["op"], e["id"], str(e["data"])) for e in feed} == {
+        ("payments", "delete", None, str({"student_id": [student_id]})),
+        ("group_students", "delete", None, str({"student_id": [student_id]})),
+    }
+
+    feed.clear()
+    check(client.delete(f"/teachers/{seed['teacher']['id']}"), 204)
+    assert [(e["topic"], e["data"]) for e in feed] == [("group_students", {"group_id": [group_id]})]
+
+    # qayta o'chirish — event yo'q
+    feed.clear()
+    check(client.post("/students/bulk-delete", json={"ids": [student_id]}))
+    assert feed == []
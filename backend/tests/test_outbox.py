@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import models, outbox
+from tests.conftest import check
+
+
+def _application(client, seed, phone="+998935555555"):
+    return check(client.post("/applications/", json={
+        "full_name": "Applicant", "phone": phone, "school": "School",
+        "grade": "9", "course_id": seed["course"]["id"],
+    }), 201)
+
+
+def _activate(client, application_id):
+    check(client.patch(f"/applications/{application_id}/status", json={"status": "active"}))
+
+
+def _students_with_phone(db, phone):
+    db.expire_all()
+    return db.execute(select(models.Student).where(models.Student.phone == phone)).scalars().all()
+
+
+def _activation_events(db):
+    return select(models.OutboxEvent).where(models.OutboxEvent.topic == "application.activated")
+
+
+def test_activation_creates_student_once(client, db, seed):
+    application = _application(client, seed)
+    _activate(client, application["id"])
+    assert _students_with_phone(db, application["phone"]) == []   # commitda faqat navbatga
+
+    assert outbox.drain(db) == 1
+    assert [s.full_name for s in _students_with_phone(db, application["phone"])] == ["Applicant"]
+
+    # qayta yetkazish (at-least-once) — ikkinchi o'quvchi yaratilmaydi
+    outbox.enqueue(db, "application.activated", {"application_id": application["id"]})
+    db.commit()
+    outbox.drain(db)
+    assert len(_students_with_phone(db, application["phone"])) == 1
+    statuses = [event.status for event in db.execute(_activation_events(db)).scalars()]
+    assert statuses == ["done", "done"]
+
+
+def test_activation_over_deleted_student_phone(client, db, seed):
+    deleted = seed["students"][0]
+    check(client.delete(f"/students/{deleted['id']}"), 204)
+    application = _application(client, seed, phone=deleted["phone"])
+    _activate(client, application["id"])
+
+    outbox.drain(db)
+
+    event = db.execute(_activation_events(db)).scalar_one()
+    assert (event.status, event.last_error) == ("done", None)
+    live = _students_with_phone(db, deleted["phone"])
+    assert len(live) == 1 and live[0].id != deleted["id"]
+
+
+def test_failing_handler_backs_off_then_fails(client, db, seed, monkeypatch):
+    def broken(db, payload):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setitem(outbox.HANDLERS, "application.activated", broken)
+    monkeypatch.setattr(outbox, "MAX_ATTEMPTS", 2)
+    _activate(client, _application(client, seed)["id"])
+
+    outbox.process_batch(db)
+    event = db.execute(_activation_events(db)).scalar_one()
+    assert (event.status, event.attempts) == ("pending", 1)
+    assert event.last_error == "RuntimeError: provider down"
+    assert event.available_at > datetime.utcnow()
+    assert outbox.process_batch(db) == 0   # hali vaqti kelmagan
+
+    event.available_at = datetime.utcnow()
+    db.commit()
+    outbox.process_batch(db)
+    db.refresh(event)
+    assert (event.status, event.attempts) == ("failed", 2)
@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+import pytest
+
+from app import models, payroll
+from tests.conftest import check
+
+
+def _pay(client, seed, amount, student=0, month="2026-10"):
+    check(client.post("/payments/", json={
+        "student_id": seed["students"][student]["id"], "course_id": seed["course"]["id"],
+        "amount": amount, "month": month, "status": "paid",
+    }), 201)
+
+
+def test_fixed_amount_only_rule(client, seed):
+    teacher_id = seed["teacher"]["id"]
+    check(client.put(f"/payroll/rules/{teacher_id}", json={"percent": 0, "fixed_amount": 500000}))
+
+    items = check(client.get("/payroll/preview", params={"month": "2026-10"}))
+    assert [(i["teacher_id"], i["collected"], i["fixed_amount"], i["payout"]) for i in items] == [
+        (teacher_id, 0, 500000, 500000),
+    ]
+
+
+def test_teacher_without_rule_uses_default_percent(client, seed, monkeypatch):
+    monkeypatch.setattr(payroll, "DEFAULT_PERCENT", Decimal("10"))
+    _pay(client, seed, 100005)
+
+    [item] = check(client.get("/payroll/preview", params={"month": "2026-10"}))
+    assert Decimal(item["percent"]) == Decimal("10")
+    assert (item["collected"], item["payout"]) == (100005, 10001)   # 10000.5 -> ROUND_HALF_UP
+
+
+def test_rule_percent_rounds_half_up(client, seed):
+    check(client.put(f"/payroll/rules/{seed['teacher']['id']}", json={"percent": "12.5", "fixed_amount": 1000}))
+    _pay(client, seed, 100004)
+
+    [item] = check(client.get("/payroll/preview", params={"month": "2026-10"}))
+    assert item["payout"] == 12501 + 1000   # 12500.5
+
+
+def test_close_month_is_idempotent_until_payments_change(client, seed):
+    check(client.put(f"/payroll/rules/{seed['teacher']['id']}", json={"percent": 50}))
+    _pay(client, seed, 100000)
+
+    first = check(client.post("/payroll/runs", params={"month": "2026-10"}), 201)
+    again = check(client.post("/payroll/runs", params={"month": "2026-10"}), 200)
+    assert (again["id"], again["revision"]) == (first["id"], 1)
+
+    _pay(client, seed, 40000, student=1)
+    second = check(client.post("/payroll/runs", params={"month": "2026-10"}), 201)
+    assert second["revision"] == 2
+    assert (second["total_collected"], second["total_payout"]) == (140000, 70000)
+    assert [run["revision"] for run in check(client.get("/payroll/runs", params={"month": "2026-10"}))] == [2, 1]
+
+
+def test_payroll_run_cannot_be_updated(client, db, seed):
+    _pay(client, seed, 100000)
+    run_id = check(client.post("/payroll/runs", params={"month": "2026-10"}), 201)["id"]
+
+    run = db.get(models.PayrollRun, run_id)
+    run.total_payout = 1
+    with pytest.raises(ValueError, match="immutable"):
+        db.commit()
+    db.rollback()
@@ -0,0 +1,80 @@
+from sqlalchemy import delete, select
+
+from app import models, outbox, rollups
+from tests.conftest import check
+
+
+def _stats(db):
+    db.expire_all()
+    return {
+        row.teacher_id: (row.groups_count, row.students_count, row.payments_count, row.revenue, row.pending)
+        for row in db.execute(select(models.TeacherStats)).scalars()
+    }
+
+
+def test_incremental_refresh_matches_rebuild(client, db, seed):
+    course_id, group_id = seed["course"]["id"], seed["group"]["id"]
+    students = [s["id"] for s in seed["students"]]
+    for status, student_id in (("paid", students[0]), ("pending", students[1]), ("paid", students[1])):
+        check(client.post("/payments/", json={
+            "student_id": student_id, "course_id": course_id,
+            "amount": 100000, "month": "2026-10", "status": status,
+        }), 201)
+    check(client.post("/students/bulk-delete", json={"ids": [students[2]]}))
+    outbox.drain(db)
+
+    incremental = _stats(db)
+    assert incremental[seed["teacher"]["id"]] == (1, 2, 3, 200000, 100000)
+
+    rollups.rebuild(db)
+    assert _stats(db) == incremental
+
+    check(client.delete(f"/groups/{group_id}"), 204)
+    outbox.drain(db)
+    assert _stats(db)[seed["teacher"]["id"]] == (0, 0, 0, 0, 0)
+
+
+def test_deleting_course_resets_teacher_stats(client, db, seed):
+    check(client.post("/payments/", json={
+        "student_id": seed["students"][0]["id"], "course_id": seed["course"]["id"],
+        "amount": 100000, "month": "2026-10", "status": "paid",
+    }), 201)
+    assert _stats(db)[seed["teacher"]["id"]] == (1, 3, 1, 100000, 0)
+
+    check(client.post("/courses/bulk-delete", json={"ids": [seed["course"]["id"]]}))
+    outbox.drain(db)
+
+    assert _stats(db)[seed["teacher"]["id"]] == (0, 0, 0, 0, 0)
+
+
+def test_teacher_stats_get_does_not_write(client, db, seed):
+    teacher_id = seed["teacher"]["id"]
+    db.execute(delete(models.TeacherStats))
+    db.commit()
+
+    body = check(client.get(f"/teachers/{teacher_id}/stats"))
+
+    assert (body["groups_count"], body["students_count"]) == (1, 3)
+    assert body["full_name"] == "Teacher One"
+    assert db.get(models.TeacherStats, teacher_id) is None
+
+
+def test_payment_writes_apply_deltas_without_refresh(client, db, seed):
+    teacher_id = seed["teacher"]["id"]
+    assert _stats(db)[teacher_id] == (1, 3, 0, 0, 0)
+
+    payment = check(client.post("/payments/", json={
+        "student_id": seed["students"][0]["id"], "course_id": seed["course"]["id"],
+        "amount": 100000, "month": "2026-10", "status": "pending",
+    }), 201)
+    assert _stats(db)[teacher_id] == (1, 3, 1, 0, 100000)
+
+    check(client.patch(f"/payments/{payment['id']}", json={"status": "paid", "amount": 120000}))
+    assert _stats(db)[teacher_id] == (1, 3, 1, 120000, 0)
+
+    check(client.delete(f"/payments/{payment['id']}"), 204)
+    assert _stats(db)[teacher_id] == (1, 3, 0, 0, 0)
+
+    # to'lovlar qayta hisob navbatiga tushmaydi
+    topics = db.execute(select(models.OutboxEvent.topic).where(models.OutboxEvent.processed_at.is_(None)))
+    assert rollups.REFRESH_TOPIC not in topics.scalars().all()
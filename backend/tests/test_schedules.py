@@ -0,0 +1,78 @@
+from app import scheduling
+from tests.conftest import check
+
+
+def _slot(start, end, schedule_id=None, group_id=1, teacher_id=1, room_id=None, weekday=0):
+    return scheduling.Slot(schedule_id, group_id, teacher_id, room_id, weekday, start, end)
+
+
+def test_index_adjacent_overlapping_and_covering():
+    index = scheduling.build_index([_slot(600, 690, schedule_id=1)])   # 10:00-11:30
+
+    assert scheduling.conflicts_for(index, _slot(690, 780, group_id=2)) == []    # yonma-yon
+    assert scheduling.conflicts_for(index, _slot(510, 600, group_id=2)) == []
+    overlap = scheduling.conflicts_for(index, _slot(660, 750, group_id=2))
+    assert [(c["kind"], c["start_time"].isoformat(), c["end_time"].isoformat()) for c in overlap] == [
+        ("teacher", "11:00:00", "11:30:00"),
+    ]
+    covering = scheduling.conflicts_for(index, _slot(540, 720, group_id=2, teacher_id=2))
+    assert covering == []   # boshqa o'qituvchi, boshqa guruh, xonasiz
+    covered = scheduling.conflicts_for(index, _slot(620, 640, group_id=1, teacher_id=2))
+    assert [c["kind"] for c in covered] == ["group"]
+
+
+def test_free_slots_merge_busy_intervals():
+    index = scheduling.build_index([
+        _slot(600, 690, schedule_id=1),
+        _slot(660, 720, schedule_id=2, group_id=2),
+        _slot(780, 840, schedule_id=3, group_id=3),
+    ])
+    gaps = scheduling.free_slots(index, [("teacher", 1, 0)], 60, day_start=540, day_end=960)
+    assert gaps == [(540, 600), (720, 780), (840, 960)]
+
+
+def _schedule(client, group_id, start, end, room_id=None, code=201):
+    return check(client.post("/schedules/", json={
+        "group_id": group_id, "room_id": room_id, "weekday": 1,
+        "start_time": start, "end_time": end,
+    }), code)
+
+
+def test_create_schedule_checks_teacher_and_room(client, seed):
+    group_id = seed["group"]["id"]
+    room = check(client.post("/rooms/", json={"name": "101"}), 201)
+    other = check(client.post("/groups/", json={
+        "name": "G2", "course_id": seed["course"]["id"], "teacher_id": seed["teacher"]["id"],
+    }), 201)
+    first = _schedule(client, group_id, "10:00", "11:30", room["id"])
+
+    _schedule(client, other["id"], "11:30", "13:00")                 # yonma-yon — ruxsat
+    conflicts = _schedule(client, other["id"], "09:00", "11:00", code=409)["detail"]
+    assert {c["kind"] for c in conflicts} == {"teacher"}
+    assert {c["other_schedule_id"] for c in conflicts} == {first["id"]}
+
+    teacher = check(client.post("/teachers/", json={
+        "full_name": "Teacher Two", "specialty": "math", "experience": "2", "phone": "+998902222222",
+    }), 201)
+    third = check(client.post("/groups/", json={
+        "name": "G3", "course_id": seed["course"]["id"], "teacher_id": teacher["id"],
+    }), 201)
+    conflicts = _schedule(client, third["id"], "09:00", "14:00", room["id"], code=409)["detail"]
+    assert [c["kind"] for c in conflicts] == ["room"]
+
+    # o'zini yangilash o'zi bilan kesishmaydi
+    check(client.put(f"/schedules/{first['id']}", json={
+        "group_id": group_id, "room_id": room["id"], "weekday": 1,
+        "start_time": "10:15", "end_time": "11:15",
+    }))
+
+
+def test_free_slots_endpoint(client, seed):
+    _schedule(client, seed["group"]["id"], "10:00", "12:00")
+
+    slots = check(client.get("/schedules/free-slots", params={
+        "teacher_id": seed["teacher"]["id"], "weekday": 1, "duration": 90,
+    }))
+    assert [(s["start_time"], s["end_time"]) for s in slots] == [
+        ("08:00:00", "10:00:00"), ("12:00:00", "21:00:00"),
+    ]
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app import models, purge
+from tests.conftest import check
+
+
+def _pay(client, student_id, course_id, month="2026-10"):
+    return check(client.post("/payments/", json={
+        "student_id": student_id, "course_id": course_id,
+        "amount": 100000, "month": month, "status": "paid",
+    }), 201)
+
+
+def test_deleting_course_hides_dependents(client, db, seed):
+    course_id, group_id = seed["course"]["id"], seed["group"]["id"]
+    student_id = seed["students"][0]["id"]
+    _pay(client, student_id, course_id)
+    check(client.post("/enrollments/", json={"student_id": student_id, "course_id": course_id}), 201)
+
+    check(client.delete(f"/courses/{course_id}"), 204)
+
+    assert client.get(f"/groups/{group_id}/detail").status_code == 404
+    assert client.get(f"/groups/{group_id}/payments-matrix").status_code == 404
+    assert check(client.get("/groups/", params={"expand": "course"})) == []
+    assert check(client.get("/group-students/")) == []
+    assert check(client.get("/payments/")) == []
+    assert check(client.get("/enrollments/")) == []
+    # o'quvchilar kursga bog'liq emas — qoladi
+    assert len(check(client.get("/students/"))) == 3
+    # o'chirish — faqat kurs qatori; bolalar purge'gacha o'zgarmaydi
+    assert db.execute(select(models.Group.__table__.c.deleted_at)).scalars().all() == [None]
+    assert len(db.execute(select(models.GroupStudent.__table__)).all()) == 3
+
+
+def test_deleting_teacher_hides_groups_and_members(client, seed):
+    check(client.delete(f"/teachers/{seed['teacher']['id']}"), 204)
+
+    assert client.get(f"/groups/{seed['group']['id']}").status_code == 404
+    assert check(client.get("/group-students/")) == []
+    student_id = seed["students"][0]["id"]
+    assert check(client.get(f"/students/{student_id}/overview"))["groups"] == []
+
+
+def test_child_delete_routes_hard_delete_with_tombstone(client, db, seed):
+    payment = _pay(client, seed["students"][0]["id"], seed["course"]["id"])
+    check(client.delete(f"/payments/{payment['id']}"), 204)
+
+    assert db.execute(select(models.Payment.__table__)).all() == []
+    since = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    tombstones = check(client.get("/sync/tombstones", params={"since": since, "entity": "payments"}))
+    assert [item["id"] for item in tombstones["items"]] == [payment["id"]]
+
+
+def test_bulk_delete_student_cascades(client, seed):
+    student_id = seed["students"][0]["id"]
+    _pay(client, student_id, seed["course"]["id"])
+
+    check(client.post("/students/bulk-delete", json={"ids": [student_id]}))
+
+    roster = check(client.get(f"/group-students/group/{seed['group']['id']}"))
+    assert student_id not in [row["student_id"] for row in roster]
+    assert check(client.get("/payments/", params={"student_id": student_id})) == []
+
+
+def test_group_with_deleted_course_returns_404_not_500(client, db, seed):
+    # Core UPDATE (ORM eventlarisiz) — guruhning o'z deleted_at'i NULL
+    db.execute(update(models.Course).values(deleted_at=datetime.utcnow()))
+    db.commit()
+    group_id = seed["group"]["id"]
+
+    response = client.get(f"/groups/{group_id}/detail")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Group not found"
+    assert client.get(f"/groups/{group_id}/payments-matrix").status_code == 404
+
+
+def test_deleted_student_phone_can_be_reused(client, seed):
+    old = seed["students"][0]
+    check(client.delete(f"/students/{old['id']}"), 204)
+
+    new = check(client.post("/students/", json={
+        "full_name": "New Student", "phone": old["phone"], "school": "2", "grade": "6",
+    }), 201)
+    assert new["id"] != old["id"]
+    assert client.get(f"/students/{new['id']}").status_code == 200
+
+
+def test_bulk_status_creates_student_over_deleted_phone(client, seed):
+    old = seed["students"][0]
+    check(client.delete(f"/students/{old['id']}"), 204)
+    application = check(client.post("/applications/", json={
+        "full_name": "Returning Student", "phone": old["phone"], "school": "1", "grade": "5",
+        "course_id": seed["course"]["id"],
+    }), 201)
+
+    result = check(client.post("/applications/bulk-status", json={
+        "ids": [application["id"]], "status": "active",
+    }))
+    assert result["students_created"] == 1
+    phones = [s["phone"] for s in check(client.get("/students/", params={"limit": 100}))]
+    assert old["phone"] in phones
+
+
+def test_purge_removes_old_rows_and_keeps_tombstones(client, db, seed):
+    course_id = seed["course"]["id"]
+    _pay(client, seed["students"][0]["id"], course_id)
+    check(client.delete(f"/courses/{course_id}"), 204)
+
+    assert purge.purge(db, retention_days=30)["courses"] == 0
+    result = purge.purge(db, retention_days=0)
+    assert result["courses"] == 1
+
+    # guruh, a'zoliklar va to'lov — ON DELETE CASCADE
+    for model in (models.Group, models.GroupStudent, models.Payment):
+        assert db.execute(select(model.__table__)).all() == []
+
+    since = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    tombstones = check(client.get("/sync/tombstones", params={"since": since}))
+    # bolalar uchun tombstone yo'q — mijoz kurs tombstone'i bo'yicha o'chiradi
+    deleted = {(item["entity"], item["id"]) for item in tombstones["items"]}
+    assert deleted == {("courses", course_id)}
@@ -0,0 +1,41 @@
+HEADER = "full_name,phone,email,school,grade,address\n"
+
+
+def _import(client, body):
+    response = client.post(
+        "/students/import",
+        files={"file": ("students.csv", (HEADER + body).encode(), "text/csv")},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_import_inserts_and_updates(client, seed):
+    report = _import(client, (
+        "Student 0 Updated,+998900000000,,School,9,\n"
+        "New Student,+998907777777,new@example.com,School,8,Tashkent\n"
+    ))
+    assert (report["inserted"], report["updated"], report["failed"]) == (1, 1, 0)
+    names = {s["full_name"] for s in client.get("/students/", params={"limit": 50}).json()}
+    assert {"Student 0 Updated", "New Student"} <= names
+
+
+def test_import_reports_conflicting_email(client, seed):
+    _import(client, "Owner,+998907777777,taken@example.com,School,8,\n")
+
+    report = _import(client, "Other,+998908888888,taken@example.com,School,8,\n")
+
+    assert report["failed"] == 1
+    assert report["errors"] == [{"row": 2, "errors": ["email: boshqa o'quvchida mavjud"]}]
+
+
+def test_import_over_deleted_student_creates_live_row(client, seed):
+    deleted = seed["students"][0]
+    assert client.delete(f"/students/{deleted['id']}").status_code == 204
+
+    report = _import(client, f"Returned,{deleted['phone']},,School,9,\n")
+
+    assert (report["inserted"], report["updated"]) == (1, 0)
+    phones = {s["phone"]: s for s in client.get("/students/", params={"limit": 50}).json()}
+    assert phones[deleted["phone"]]["full_name"] == "Returned"
+    assert phones[deleted["phone"]]["id"] != deleted["id"]
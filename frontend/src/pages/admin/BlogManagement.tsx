@@ -1,5 +1,5 @@
 // src/pages/admin/BlogManagement.tsx
-import { getBlogs, createBlog, updateBlog, deleteBlog } from '../../api/api';
+import { getBlogs, getBlog, createBlog, updateBlog, deleteBlog } from '../../api/api';
 import { Plus, Trash2, Calendar, X, Upload, Youtube, Edit3, Eye, EyeOff, Save, Send, ChevronLeft, ChevronRight } from 'lucide-react';
 import React, { useEffect, useState } from 'react';
 import { motion, AnimatePresence } from 'motion/react';
@@ -11,7 +11,7 @@ interface BlogPost {
   id: number;
   title: string;
   short_text: string;       // backend: short_text
-  content: string;
+  content?: string;         // ro'yxatda yo'q (BlogSummary) — faqat /blogs/{id}
   image?: string;
   youtube_link?: string;    // backend: youtube_link
   status: string;           // backend: str ("draft" | "published")
@@ -62,17 +62,23 @@ export const BlogManagement = () => {
     setEditingPost(null);
   };
 
-  const handleEdit = (post: BlogPost) => {
-    setEditingPost(post);
-    setFormData({
-      title: post.title,
-      short_text: post.short_text,
-      content: post.content,
-      image: post.image ?? '',
-      youtube_link: post.youtube_link ?? '',
-      status: post.status
-    });
-    setIsAdding(true);
+  const handleEdit = async (summary: BlogPost) => {
+    // ro'yxat faqat kartochka maydonlarini beradi — to'liq matn alohida
+    try {
+      const post: BlogPost = await getBlog(summary.id);
+      setEditingPost(post);
+      setFormData({
+        title: post.title,
+        short_text: post.short_text,
+        content: post.content ?? '',
+        image: post.image ?? '',
+        youtube_link: post.youtube_link ?? '',
+        status: post.status
+      });
+      setIsAdding(true);
+    } catch (err) {
+      console.error(err);
+    }
   };
 
   const handleSubmit = async (status: string) => {